@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Audio Encoders for Piper TTS output
+Streaming writers for the output formats: WAV (default), lossless FLAC and compact Opus (.ogg)
+
+An encoder is opened once per output file with its sample rate and fed 16-bit mono PCM as
+the audio arrives - line by line in combine mode, sentence by sentence in chunked single
+mode - so encoding runs as the write stage of the render instead of as a second pass over
+finished WAVs. Output keeps the usual layout; only the file extension changes.
+
+FLAC and Opus need the optional soundfile package (pip install soundfile); Opus also needs
+audioop to resample, which Python 3.13+ dropped (pip install audioop-lts).
+"""
+
+import io
+import os
+import warnings
+import wave
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Type
+
+try:
+    import soundfile
+except ImportError:
+    soundfile = None
+
+# Piper voices produce 16-bit mono audio
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+
+
+def _import_audioop():
+    """The audioop module, or None if it isn't installed (Python 3.13+ without audioop-lts)"""
+    with warnings.catch_warnings():
+        # Deprecated (but present) on Python 3.11 and 3.12
+        warnings.simplefilter("ignore", DeprecationWarning)
+        try:
+            import audioop
+        except ImportError:
+            return None
+    return audioop
+
+
+def _wav_params(wav_bytes: bytes):
+    """(PCM frames, sample rate) of a 16-bit mono WAV"""
+    with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+        return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate()
+
+
+class AudioEncoder(ABC):
+    """Streaming writer for one output file (use as a context manager or call close())"""
+
+    name = "wav"
+    extension = ".wav"
+
+    def __init__(self, path: str, sample_rate: int):
+        """Create the output file
+
+        Args:
+            path: File to write
+            sample_rate: Sample rate of the PCM passed to write()
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+
+    @classmethod
+    def check_available(cls):
+        """Raise RuntimeError if the encoder's dependencies are missing"""
+
+    @abstractmethod
+    def write(self, pcm: bytes):
+        """Append 16-bit mono PCM frames"""
+
+    def flush(self):
+        """Push buffered audio to disk, so the file can be read while it is still being written"""
+
+    @abstractmethod
+    def close(self):
+        """Finish the file (headers, codec buffers) and close it"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @classmethod
+    def write_wav(cls, path: str, wav_bytes: bytes):
+        """Encode a complete WAV (e.g. one synthesized line) to path"""
+        pcm, sample_rate = _wav_params(wav_bytes)
+        with cls(path, sample_rate) as encoder:
+            encoder.write(pcm)
+
+
+class WavEncoder(AudioEncoder):
+    """Uncompressed 16-bit WAV (the default; same files as Piper's own WAV output)"""
+
+    name = "wav"
+    extension = ".wav"
+
+    def __init__(self, path: str, sample_rate: int):
+        super().__init__(path, sample_rate)
+        self._file = open(path, 'wb')
+        self._wav = wave.open(self._file, 'wb')
+        self._wav.setnchannels(CHANNELS)
+        self._wav.setsampwidth(SAMPLE_WIDTH)
+        self._wav.setframerate(sample_rate)
+
+    def write(self, pcm: bytes):
+        self._wav.writeframes(pcm)
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        # Patches the header's length fields
+        self._wav.close()
+        self._file.close()
+
+    @classmethod
+    def write_wav(cls, path: str, wav_bytes: bytes):
+        # Already in the output format
+        with open(path, 'wb') as f:
+            f.write(wav_bytes)
+
+
+class SoundFileEncoder(AudioEncoder):
+    """Formats written through libsndfile (soundfile package)"""
+
+    format = None
+    subtype = None
+
+    def __init__(self, path: str, sample_rate: int):
+        super().__init__(path, sample_rate)
+        self.check_available()
+        self._file = soundfile.SoundFile(path, 'w', samplerate=self.output_rate(sample_rate),
+                                         channels=CHANNELS, format=self.format, subtype=self.subtype)
+
+    @classmethod
+    def check_available(cls):
+        if soundfile is None:
+            raise RuntimeError(f"{cls.name} output needs soundfile. Install with: pip install soundfile")
+
+    @classmethod
+    def output_rate(cls, sample_rate: int) -> int:
+        """Sample rate of the encoded file for PCM at sample_rate"""
+        return sample_rate
+
+    def write(self, pcm: bytes):
+        self._file.buffer_write(pcm, dtype='int16')
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+class FlacEncoder(SoundFileEncoder):
+    """Lossless FLAC (16-bit, at the voice's native rate)"""
+
+    name = "flac"
+    extension = ".flac"
+    format = "FLAC"
+    subtype = "PCM_16"
+
+
+# Sample rates the Opus codec supports
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+class OpusEncoder(SoundFileEncoder):
+    """Opus in an Ogg container (.ogg), the most compact option for review copies
+
+    Opus runs at 8/12/16/24/48 kHz only, so 22050 Hz voices are resampled to 24 kHz as they
+    stream in (the resampler state carries over between writes).
+    """
+
+    name = "opus"
+    extension = ".ogg"
+    format = "OGG"
+    subtype = "OPUS"
+
+    def __init__(self, path: str, sample_rate: int):
+        # check_available() runs before the file is created, so a missing audioop fails cleanly
+        super().__init__(path, sample_rate)
+        self._audioop = _import_audioop()
+        self._encoded_rate = self.output_rate(sample_rate)
+        self._ratecv_state = None
+
+    @classmethod
+    def check_available(cls):
+        super().check_available()
+        if _import_audioop() is None:
+            raise RuntimeError(f"{cls.name} output needs audioop to resample voices to Opus rates. "
+                               f"Install with: pip install audioop-lts")
+
+    @classmethod
+    def output_rate(cls, sample_rate: int) -> int:
+        return next((rate for rate in OPUS_SAMPLE_RATES if rate >= sample_rate), OPUS_SAMPLE_RATES[-1])
+
+    def write(self, pcm: bytes):
+        if self._encoded_rate != self.sample_rate:
+            pcm, self._ratecv_state = self._audioop.ratecv(pcm, SAMPLE_WIDTH, CHANNELS, self.sample_rate,
+                                                           self._encoded_rate, self._ratecv_state)
+        super().write(pcm)
+
+
+ENCODERS: Dict[str, Type[AudioEncoder]] = {
+    encoder.name: encoder for encoder in (WavEncoder, FlacEncoder, OpusEncoder)
+}
+
+# Values accepted by --format
+OUTPUT_FORMATS = tuple(ENCODERS)
+
+# Extensions of every output format (for recognizing output files, e.g. when pruning)
+OUTPUT_EXTENSIONS = tuple(encoder.extension for encoder in ENCODERS.values())
+
+
+def get_encoder(output_format: str) -> Type[AudioEncoder]:
+    """Encoder class for an output format name, checking its dependencies are installed"""
+    encoder = ENCODERS.get(output_format)
+    if encoder is None:
+        raise ValueError(f"Unknown output format '{output_format}' (choose from {', '.join(OUTPUT_FORMATS)})")
+    encoder.check_available()
+    return encoder
+
+
+def audio_duration(path: str) -> Optional[float]:
+    """Length in seconds of an output file in any of the output formats (None if unreadable)"""
+    try:
+        if os.path.splitext(path)[1].lower() == ".wav":
+            with wave.open(path, 'rb') as wav_file:
+                return wav_file.getnframes() / wav_file.getframerate()
+        if soundfile is not None:
+            return soundfile.info(path).duration
+    except (OSError, EOFError, wave.Error, RuntimeError):
+        pass
+    return None
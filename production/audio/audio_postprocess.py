@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Audio Post-Processing for combined (--combine) output
+Silence trimming, per-voice loudness matching and speaker-aware gaps over raw 16-bit PCM
+
+Each line's samples are processed as one NumPy array (no per-sample Python loops) between
+synthesis and writing:
+
+- trimming: leading/trailing audio below a threshold is cut, keeping a little padding
+- loudness: every voice is brought to the same RMS level, so quiet models such as
+  en_US-danny-low sit at the same level as the rest of the cast. The gain is per voice
+  (from all of that voice's lines so far), so a character's lines keep their relative
+  dynamics; it is lowered for a line where it would clip
+- gaps: the pause before a line depends on who spoke last - same speaker, another
+  character, or a switch between dialogue and ACTION
+- resampling: lines from voices at another native rate (-low models are 16 kHz, most others
+  22.05 kHz) are converted once to the scene's rate with a polyphase windowed-sinc filter
+
+With the default settings nothing is changed and every line is followed by the usual pause.
+"""
+
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from math import gcd
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+# Pause between lines (ms) unless configured otherwise
+DEFAULT_GAP_MS = 500
+
+# Speaker of scene descriptions (see DialogueLine)
+ACTION_SPEAKER = "ACTION"
+
+INT16_MAX = 32767
+
+# Resampling filter: taps on each side of the interpolated position, and Kaiser window shape
+RESAMPLE_HALF_WIDTH = 16
+RESAMPLE_KAISER_BETA = 8.6
+# Output samples computed per block (bounds the size of the tap index matrix)
+RESAMPLE_BLOCK = 16384
+
+
+def dbfs_to_amplitude(dbfs: float) -> float:
+    """Linear 16-bit sample amplitude for a level in dB relative to full scale"""
+    return INT16_MAX * 10.0 ** (dbfs / 20.0)
+
+
+def pcm_to_array(pcm: bytes) -> np.ndarray:
+    """16-bit mono PCM as an int16 array (read-only view, no copy)"""
+    return np.frombuffer(pcm, dtype=np.int16)
+
+
+def trim_silence(samples: np.ndarray, sample_rate: int, threshold_dbfs: float,
+                 padding_ms: int) -> np.ndarray:
+    """Cut leading and trailing samples quieter than threshold_dbfs, keeping padding_ms of each
+
+    A line that is silent throughout is returned empty.
+    """
+    loud = np.flatnonzero(np.abs(samples.astype(np.int32)) > dbfs_to_amplitude(threshold_dbfs))
+    if loud.size == 0:
+        return samples[:0]
+    padding = int(sample_rate * padding_ms / 1000)
+    return samples[max(loud[0] - padding, 0):loud[-1] + padding + 1]
+
+
+@lru_cache(maxsize=16)
+def _resample_filters(from_rate: int, to_rate: int) -> Tuple[int, int, np.ndarray]:
+    """(up, down, filter bank) for converting from_rate to to_rate
+
+    Output sample n sits at input position n * down / up; its fractional part is one of up
+    phases, each with its own row of 2 * RESAMPLE_HALF_WIDTH windowed-sinc taps. The cutoff
+    is the lower of the two Nyquist frequencies, so downsampling doesn't alias.
+    """
+    divisor = gcd(from_rate, to_rate)
+    up, down = to_rate // divisor, from_rate // divisor
+    cutoff = min(1.0, to_rate / from_rate)
+    taps = np.arange(-RESAMPLE_HALF_WIDTH + 1, RESAMPLE_HALF_WIDTH + 1)
+    # Distance of every tap from the output position, per phase
+    offsets = np.arange(up)[:, None] / up - taps[None, :]
+    # Kaiser window evaluated at each offset (zero from RESAMPLE_HALF_WIDTH taps out)
+    extent = np.clip(1.0 - (offsets / RESAMPLE_HALF_WIDTH) ** 2, 0.0, None)
+    window = np.i0(RESAMPLE_KAISER_BETA * np.sqrt(extent)) / np.i0(RESAMPLE_KAISER_BETA)
+    bank = cutoff * np.sinc(cutoff * offsets) * window
+    return up, down, bank.astype(np.float32)
+
+
+def resample(samples: np.ndarray, from_rate: int, to_rate: int) -> np.ndarray:
+    """Resample an int16 line to another rate (vectorized polyphase windowed-sinc)
+
+    The line is treated as silent beyond its ends, which holds for synthesized lines.
+    """
+    if from_rate == to_rate or samples.size == 0:
+        return samples
+    up, down, bank = _resample_filters(from_rate, to_rate)
+    num_out = samples.size * up // down
+    padded = np.concatenate([np.zeros(RESAMPLE_HALF_WIDTH, np.float32), samples.astype(np.float32),
+                             np.zeros(RESAMPLE_HALF_WIDTH + 1, np.float32)])
+    # Row i holds the taps of an output sample whose input position is just past sample i
+    windows = np.lib.stride_tricks.sliding_window_view(padded, 2 * RESAMPLE_HALF_WIDTH)
+    output = np.empty(num_out, dtype=np.int16)
+    for block_start in range(0, num_out, RESAMPLE_BLOCK):
+        positions = np.arange(block_start, min(block_start + RESAMPLE_BLOCK, num_out), dtype=np.int64) * down
+        base, phase = np.divmod(positions, up)
+        values = np.einsum('ij,ij->i', windows[base + 1], bank[phase])
+        output[block_start:block_start + len(values)] = np.clip(np.rint(values), -INT16_MAX - 1, INT16_MAX)
+    return output
+
+
+def silence(sample_rate: int, duration_ms: int) -> bytes:
+    """PCM for duration_ms of silence"""
+    return bytes(2 * int(sample_rate * duration_ms / 1000))
+
+
+@dataclass
+class PostProcessSettings:
+    """Combine-mode post-processing options (the defaults leave the audio untouched)"""
+    trim_silence: bool = False
+    silence_threshold_dbfs: float = -50.0
+    trim_padding_ms: int = 40
+    loudness_dbfs: Optional[float] = None  # Target RMS level per voice (None = no matching)
+    gap_ms: int = DEFAULT_GAP_MS  # Same speaker again, and after the last line
+    speaker_gap_ms: Optional[int] = None  # Between two characters (None = gap_ms)
+    action_gap_ms: Optional[int] = None  # Between dialogue and ACTION, either way (None = gap_ms)
+    sample_rate: Optional[int] = None  # Output rate (None = highest native rate of the cast)
+
+    @property
+    def changes_audio(self) -> bool:
+        """Whether line samples are modified (gaps and sample rate aside)"""
+        return self.trim_silence or self.loudness_dbfs is not None
+
+
+class ScenePostProcessor:
+    """Post-processes the lines of one combined scene, in script order"""
+
+    def __init__(self, settings: PostProcessSettings, sample_rate: int):
+        """Start a scene
+
+        Args:
+            settings: Post-processing options
+            sample_rate: Rate of the PCM passed to process() (the output rate)
+        """
+        self.settings = settings
+        self.sample_rate = sample_rate
+        self._previous_speaker: Optional[str] = None
+        # Per voice: sum of squared samples and sample count over its lines so far
+        self._energy: Dict[str, float] = {}
+        self._samples: Dict[str, int] = {}
+        # Gap buffers by length, built once per scene
+        self._silence: Dict[int, bytes] = {}
+        # Rate conversion: lines converted and time spent, reported as its own metric
+        self.resampled_lines = 0
+        self.resample_seconds = 0.0
+
+    def _gap(self, duration_ms: int) -> bytes:
+        gap = self._silence.get(duration_ms)
+        if gap is None:
+            gap = self._silence[duration_ms] = silence(self.sample_rate, duration_ms)
+        return gap
+
+    def gap_before(self, speaker: str) -> bytes:
+        """Pause to write before a line by speaker (nothing before the first line)"""
+        previous, self._previous_speaker = self._previous_speaker, speaker
+        if previous is None:
+            return b""
+        settings = self.settings
+        if (previous == ACTION_SPEAKER) != (speaker == ACTION_SPEAKER):
+            duration = settings.action_gap_ms
+        elif previous != speaker:
+            duration = settings.speaker_gap_ms
+        else:
+            duration = None
+        return self._gap(settings.gap_ms if duration is None else duration)
+
+    def tail(self) -> bytes:
+        """Pause after the last line"""
+        return self._gap(self.settings.gap_ms)
+
+    def _voice_gain(self, voice: str, samples: np.ndarray) -> float:
+        """Gain bringing the voice's running RMS level to the target, limited to avoid clipping"""
+        values = samples.astype(np.float64)
+        self._energy[voice] = self._energy.get(voice, 0.0) + float(np.dot(values, values))
+        self._samples[voice] = self._samples.get(voice, 0) + samples.size
+        rms = np.sqrt(self._energy[voice] / self._samples[voice])
+        if rms < 1.0:
+            return 1.0
+        gain = dbfs_to_amplitude(self.settings.loudness_dbfs) / rms
+        peak = int(np.max(np.abs(samples.astype(np.int32))))
+        return min(gain, INT16_MAX / peak) if peak else gain
+
+    def process(self, voice: str, pcm: bytes, sample_rate: Optional[int] = None) -> bytes:
+        """Resampled, trimmed and loudness-matched PCM of one line
+
+        Args:
+            voice: Voice model the line was synthesized with (loudness is matched per voice)
+            pcm: The line's 16-bit mono PCM
+            sample_rate: Rate of pcm (default: already at the scene's sample rate)
+        """
+        settings = self.settings
+        needs_resampling = sample_rate is not None and sample_rate != self.sample_rate
+        if not (settings.changes_audio or needs_resampling):
+            return pcm
+        samples = pcm_to_array(pcm)
+        if needs_resampling:
+            start = time.perf_counter()
+            samples = resample(samples, sample_rate, self.sample_rate)
+            self.resample_seconds += time.perf_counter() - start
+            self.resampled_lines += 1
+        if settings.trim_silence:
+            samples = trim_silence(samples, self.sample_rate, settings.silence_threshold_dbfs,
+                                   settings.trim_padding_ms)
+        if settings.loudness_dbfs is not None and samples.size:
+            gain = self._voice_gain(voice, samples)
+            if gain != 1.0:
+                samples = np.clip(np.rint(samples * gain), -INT16_MAX - 1, INT16_MAX).astype(np.int16)
+        return samples.tobytes()
+
+    def summary(self) -> str:
+        """One-line rate conversion report for the end of a scene"""
+        return (f"Rate conversion: {self.resampled_lines} line(s) resampled to {self.sample_rate} Hz "
+                f"in {self.resample_seconds:.3f}s")
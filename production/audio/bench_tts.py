@@ -0,0 +1,651 @@
+#!/usr/bin/env python3
+"""
+TTS Benchmark Suite
+Measures ScreenplayParser and PiperTTSConverter throughput on real scene files
+
+Reports:
+- parser throughput (input lines/sec and dialogue lines/sec), and its speedup over the
+  previous regex-by-regex parser (tests/reference_parser.py)
+- screenplay formatter throughput (input lines/sec)
+- synthesis real-time factor per voice (seconds of compute per second of audio; lower is faster)
+- combine-mode cost, cold (synthesizing) and warm (every line from the synthesis cache)
+- script-order vs voice-grouped batched synthesis, with per-line timings from the trace
+- output encoders (WAV, FLAC, Opus): encode time against bytes saved, per line file and streamed
+- peak RSS of the benchmark process
+
+By default synthesis runs on FakePiperVoice, a deterministic stand-in that needs no model
+files, so results are comparable between machines and runs. Use --real-voices to benchmark
+the actual Piper models.
+
+Usage:
+    python production/audio/bench_tts.py
+    python production/audio/bench_tts.py --output baseline.json
+    python production/audio/bench_tts.py --baseline baseline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import sys
+import tempfile
+import time
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from piper.config import PhonemeType
+
+from audio_encoders import ENCODERS
+from audio_postprocess import resample, pcm_to_array
+import format_screenplay_dialogue as formatter
+from character_registry import registry_for_path
+from screenplay_to_tts import ScreenplayParser, PiperTTSConverter, DialogueLine, PROJECT_ROOT
+from synthesis_cache import SynthesisCache
+from render_trace import LineTracer
+from voice_pool import VoicePool
+from tests.reference_parser import RegexScreenplayParser
+
+BENCH_VERSION = 1
+
+DEFAULT_INPUT = PROJECT_ROOT / "amazingtrash" / "writing" / "acts" / "Act 1 - Setup"
+DEFAULT_VOICE_CONFIG = PROJECT_ROOT / "amazingtrash" / "production" / "character_voices.json"
+
+# Fake voices speak at a fixed rate so audio length depends only on the text
+FAKE_SECONDS_PER_CHAR = 0.06
+FAKE_LEAD_SECONDS = 0.2
+FAKE_DEFAULT_SAMPLE_RATE = 22050
+# Piper's x_low/low quality voices are 16 kHz, medium/high are 22.05 kHz
+FAKE_LOW_SAMPLE_RATE = 16000
+
+# Relative change beyond which a metric is reported as a regression
+DEFAULT_THRESHOLD_PCT = 10.0
+
+DEFAULT_BATCH_SIZE = 32
+
+
+class FakeVoiceConfig:
+    """The parts of piper's PiperConfig the converter reads"""
+
+    def __init__(self, sample_rate: int, espeak_voice: str = "en-us"):
+        self.sample_rate = sample_rate
+        self.espeak_voice = espeak_voice
+        self.phoneme_type = PhonemeType.ESPEAK
+        self.vowel_clusters = None
+
+
+class FakePiperVoice:
+    """Deterministic PiperVoice stand-in: a tone whose pitch and length depend only on the text
+
+    "Phonemes" are the text's characters, so the converter's phoneme cache is exercised too.
+    """
+
+    def __init__(self, sample_rate: int):
+        self.config = FakeVoiceConfig(sample_rate)
+
+    def phonemize(self, text: str) -> List[List[str]]:
+        return [list(text)] if text else []
+
+    def phonemes_to_ids(self, phonemes: List[str]) -> List[int]:
+        return [ord(phoneme) for phoneme in phonemes]
+
+    def phoneme_ids_to_audio(self, phoneme_ids: List[int], syn_config=None) -> np.ndarray:
+        text = ''.join(map(chr, phoneme_ids))
+        duration = FAKE_LEAD_SECONDS + FAKE_SECONDS_PER_CHAR * len(text)
+        num_samples = int(duration * self.config.sample_rate)
+        frequency = 110.0 + sum(text.encode('utf-8')) % 330
+        t = np.arange(num_samples, dtype=np.float32) / self.config.sample_rate
+        return 0.5 * np.sin(2 * math.pi * frequency * t)
+
+
+class FakeVoicePool(VoicePool):
+    """Voice pool that hands out FakePiperVoice objects instead of loading ONNX models"""
+
+    def _load_voice(self, resolved_path: str) -> FakePiperVoice:
+        with open(f"{resolved_path}.json", 'r', encoding='utf-8') as f:
+            sample_rate = json.load(f)["audio"]["sample_rate"]
+        return FakePiperVoice(sample_rate)
+
+
+def _fake_sample_rate(voice_path: Path) -> int:
+    """Sample rate for a fake copy of a voice: the real one if its config exists, else by quality"""
+    config_path = Path(f"{voice_path}.json")
+    if config_path.exists():
+        with open(config_path, 'r', encoding='utf-8') as f:
+            return json.load(f)["audio"]["sample_rate"]
+    quality = voice_path.stem.rsplit('-', 1)[-1]
+    return FAKE_LOW_SAMPLE_RATE if quality in ("x_low", "low") else FAKE_DEFAULT_SAMPLE_RATE
+
+
+def make_fake_voice_config(voice_config_path: Path, fake_dir: Path) -> Path:
+    """Write a copy of a character_voices.json pointing at placeholder voice files in fake_dir
+
+    Every referenced voice gets a tiny placeholder .onnx and an .onnx.json with its sample rate,
+    so the converter's path checks pass without any real model files.
+    """
+    with open(voice_config_path, 'r', encoding='utf-8') as f:
+        raw_map = json.load(f)
+
+    fake_map = {}
+    for char, value in raw_map.items():
+        voice_path = value.get("voice", "") if isinstance(value, dict) else value
+        if not voice_path:
+            continue
+        real_path = voice_config_path.parent / voice_path
+        fake_path = fake_dir / Path(voice_path).name
+        if not fake_path.exists():
+            fake_path.write_bytes(b"FAKE")
+            with open(f"{fake_path}.json", 'w', encoding='utf-8') as f:
+                json.dump({"audio": {"sample_rate": _fake_sample_rate(real_path)}}, f)
+        fake_map[char] = str(fake_path)
+
+    fake_config_path = fake_dir / "character_voices.json"
+    with open(fake_config_path, 'w', encoding='utf-8') as f:
+        json.dump(fake_map, f, indent=2)
+    return fake_config_path
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _wav_duration(wav_bytes: bytes) -> float:
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+        return wav_file.getnframes() / wav_file.getframerate()
+
+
+@contextlib.contextmanager
+def _quiet(verbose: bool):
+    """Silence the converter's per-line logging while timing"""
+    if verbose:
+        yield
+        return
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+
+def _time_parser(parser: ScreenplayParser, screenplay_files: List[Path], repeat: int,
+                 verbose: bool = False) -> Tuple[float, int]:
+    """(best seconds to parse every file, dialogue lines found)"""
+    best = None
+    with _quiet(verbose):
+        for _ in range(repeat):
+            dialogue_lines = 0
+            start = time.perf_counter()
+            for screenplay_file in screenplay_files:
+                dialogue_lines += len(parser.parse_file(str(screenplay_file)))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best, dialogue_lines
+
+
+def bench_parser(screenplay_files: List[Path], repeat: int, verbose: bool = False) -> Dict:
+    """Parse every scene file, best of repeat passes (and the same with the reference parser)"""
+    input_lines = sum(len(f.read_text(encoding='utf-8').splitlines()) for f in screenplay_files)
+    best, dialogue_lines = _time_parser(ScreenplayParser(), screenplay_files, repeat, verbose)
+    reference_best, _ = _time_parser(RegexScreenplayParser(), screenplay_files, repeat, verbose)
+
+    return {
+        "files": len(screenplay_files),
+        "repeat": repeat,
+        "input_lines": input_lines,
+        "dialogue_lines": dialogue_lines,
+        "seconds": best,
+        "input_lines_per_sec": input_lines / best,
+        "dialogue_lines_per_sec": dialogue_lines / best,
+        "reference_seconds": reference_best,
+        "speedup": reference_best / best,
+    }
+
+
+def bench_formatter(screenplay_files: List[Path], repeat: int) -> Dict:
+    """Format every scene file in memory with its movie's character names, best of repeat passes"""
+    contents = [screenplay_file.read_text(encoding='utf-8') for screenplay_file in screenplay_files]
+    names = [registry.words if registry else frozenset()
+             for registry in (registry_for_path(screenplay_file) for screenplay_file in screenplay_files)]
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for content, character_names in zip(contents, names):
+            formatter.format_screenplay_dialogue(content, character_names)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    input_lines = sum(content.count('\n') + 1 for content in contents)
+    return {
+        "files": len(screenplay_files),
+        "repeat": repeat,
+        "input_lines": input_lines,
+        "seconds": best,
+        "input_lines_per_sec": input_lines / best,
+    }
+
+
+def print_formatter_results(formatter_results: Dict):
+    print(f"\nFormatter: {formatter_results['input_lines_per_sec']:,.0f} input lines/sec "
+          f"({formatter_results['files']} files, best of {formatter_results['repeat']})")
+
+
+def bench_synthesis(converter: PiperTTSConverter, texts: List[str], repeat: int,
+                    verbose: bool = False) -> Dict:
+    """Synthesize the same sample texts with every configured voice (no cache), best of repeat passes"""
+    results = {}
+    for voice_path in converter.available_voice_paths:
+        best = None
+        with _quiet(verbose):
+            # Model loading is not part of the real-time factor
+            converter.voice_pool.get(voice_path)
+            for _ in range(repeat):
+                audio_seconds = 0.0
+                start = time.perf_counter()
+                for text in texts:
+                    audio_seconds += _wav_duration(converter._synthesize(voice_path, text))
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+
+        results[os.path.basename(voice_path)] = {
+            "lines": len(texts),
+            "audio_seconds": audio_seconds,
+            "seconds": best,
+            "rtf": best / audio_seconds if audio_seconds else 0.0,
+        }
+    return results
+
+
+def bench_combine(converter: PiperTTSConverter, dialogue_lines: List[DialogueLine],
+                  work_dir: Path, repeat: int, verbose: bool = False) -> Dict:
+    """Render one scene in combine mode, cold (synthesizing) then warm (all lines cached)
+
+    The warm runs (best of repeat) isolate the cost of combining itself: decoding,
+    resampling and writing. Rate conversion is also timed on its own.
+    """
+    converter.cache = SynthesisCache(str(work_dir / "cache"))
+    output_path = str(work_dir / "combined.wav")
+
+    def render() -> Tuple[float, float]:
+        """(seconds, of which rate conversion)"""
+        resample_before = converter.resample_seconds
+        start = time.perf_counter()
+        with _quiet(verbose):
+            converter.convert_to_speech(dialogue_lines, output_path, multi_voice=True)
+        return time.perf_counter() - start, converter.resample_seconds - resample_before
+
+    try:
+        cold_seconds, _ = render()
+        warm_seconds, resample_seconds = min(render() for _ in range(repeat))
+    finally:
+        converter.cache = None
+
+    with wave.open(output_path, "rb") as wav_file:
+        audio_seconds = wav_file.getnframes() / wav_file.getframerate()
+
+    return {
+        "lines": len(dialogue_lines),
+        "audio_seconds": audio_seconds,
+        "cold_seconds": cold_seconds,
+        "warm_seconds": warm_seconds,
+        "resample_seconds": resample_seconds,
+        "output_bytes": os.path.getsize(output_path),
+    }
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def bench_batching(converter: PiperTTSConverter, dialogue_lines: List[DialogueLine],
+                   work_dir: Path, batch_size: int, verbose: bool = False) -> Dict:
+    """Render one scene in combine mode (no cache) in script order, then grouped by voice
+
+    Per-line synthesis timings come from the converter's JSONL trace.
+    """
+    output_path = str(work_dir / "batched.wav")
+    results = {"batch_size": batch_size}
+    for mode, mode_batch_size in (("script_order", 0), ("batched", batch_size)):
+        trace_path = work_dir / f"trace_{mode}.jsonl"
+        converter.tracer = LineTracer(str(trace_path))
+        converter.batch_size = mode_batch_size
+        try:
+            start = time.perf_counter()
+            with _quiet(verbose):
+                converter.convert_to_speech(dialogue_lines, output_path, multi_voice=True)
+            elapsed = time.perf_counter() - start
+        finally:
+            converter.tracer.close()
+            converter.tracer = None
+            converter.batch_size = 0
+
+        with open(trace_path, 'r', encoding='utf-8') as f:
+            events = [json.loads(line) for line in f]
+        synth_events = [event for event in events if event["stage"] == "synthesize"]
+        line_ms = [event["ms"] for event in synth_events]
+        voice_switches = sum(1 for previous, event in zip(synth_events, synth_events[1:])
+                             if previous["voice"] != event["voice"])
+
+        results[mode] = {
+            "lines": len(line_ms),
+            "seconds": elapsed,
+            "voice_switches": voice_switches,
+            "line_ms_mean": sum(line_ms) / len(line_ms) if line_ms else 0.0,
+            "line_ms_p50": _percentile(line_ms, 50) if line_ms else 0.0,
+            "line_ms_p95": _percentile(line_ms, 95) if line_ms else 0.0,
+        }
+    return results
+
+
+def bench_encoders(converter: PiperTTSConverter, dialogue_lines: List[DialogueLine],
+                   work_dir: Path, repeat: int, verbose: bool = False) -> Dict:
+    """Encode one scene's synthesized lines in every available output format (best of repeat)
+
+    "separate" writes one file per line like separate mode; "stream" feeds every line into
+    one encoder like combine mode. Bytes are compared to the WAV output.
+    """
+    with _quiet(verbose):
+        line_wavs = [converter.synthesize_text(converter._get_voice_path_for_character(line.speaker), line.text)
+                     for line in dialogue_lines]
+    audio_seconds = sum(_wav_duration(wav_bytes) for wav_bytes in line_wavs)
+    stream_rate = max(wave.open(io.BytesIO(wav_bytes), "rb").getframerate() for wav_bytes in line_wavs)
+    # Combine mode's input to the encoder: every line at the highest rate
+    stream_pcm = []
+    for wav_bytes in line_wavs:
+        with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+            frames = wav_file.readframes(wav_file.getnframes())
+            if wav_file.getframerate() != stream_rate:
+                frames = resample(pcm_to_array(frames), wav_file.getframerate(), stream_rate).tobytes()
+        stream_pcm.append(frames)
+
+    results = {"lines": len(line_wavs), "audio_seconds": audio_seconds}
+    for name, encoder in ENCODERS.items():
+        try:
+            encoder.check_available()
+        except RuntimeError as e:
+            results[name] = {"skipped": str(e)}
+            continue
+        format_dir = work_dir / f"encode_{name}"
+        format_dir.mkdir(exist_ok=True)
+
+        def encode_separate() -> float:
+            start = time.perf_counter()
+            for index, wav_bytes in enumerate(line_wavs):
+                encoder.write_wav(str(format_dir / f"{index:04d}{encoder.extension}"), wav_bytes)
+            return time.perf_counter() - start
+
+        stream_path = str(work_dir / f"stream{encoder.extension}")
+
+        def encode_stream() -> float:
+            start = time.perf_counter()
+            with encoder(stream_path, stream_rate) as output:
+                for pcm in stream_pcm:
+                    output.write(pcm)
+            return time.perf_counter() - start
+
+        separate_seconds = min(encode_separate() for _ in range(repeat))
+        stream_seconds = min(encode_stream() for _ in range(repeat))
+        results[name] = {
+            "separate_seconds": separate_seconds,
+            "separate_bytes": sum(f.stat().st_size for f in format_dir.iterdir()),
+            "encode_rtf": separate_seconds / audio_seconds if audio_seconds else 0.0,
+            "stream_seconds": stream_seconds,
+            "stream_bytes": os.path.getsize(stream_path),
+        }
+
+    wav_bytes_total = results["wav"]["separate_bytes"]
+    for name in ENCODERS:
+        if "separate_bytes" in results[name]:
+            results[name]["size_ratio"] = results[name]["separate_bytes"] / wav_bytes_total
+            results[name]["saved_mb"] = (wav_bytes_total - results[name]["separate_bytes"]) / (1024 * 1024)
+    return results
+
+
+def flatten_metrics(results: Dict) -> Dict[str, float]:
+    """Comparable metrics from a results dict, keyed by dotted name"""
+    metrics = {
+        "parser.input_lines_per_sec": results["parser"]["input_lines_per_sec"],
+        "parser.dialogue_lines_per_sec": results["parser"]["dialogue_lines_per_sec"],
+    }
+    if "formatter" in results:
+        metrics["formatter.input_lines_per_sec"] = results["formatter"]["input_lines_per_sec"]
+    for voice_name, voice_results in results.get("synthesis", {}).items():
+        metrics[f"synthesis.{voice_name}.rtf"] = voice_results["rtf"]
+    if "combine" in results:
+        metrics["combine.cold_seconds"] = results["combine"]["cold_seconds"]
+        metrics["combine.warm_seconds"] = results["combine"]["warm_seconds"]
+        metrics["combine.resample_seconds"] = results["combine"].get("resample_seconds", 0.0)
+    if "batching" in results:
+        for mode in ("script_order", "batched"):
+            metrics[f"batching.{mode}.seconds"] = results["batching"][mode]["seconds"]
+            metrics[f"batching.{mode}.line_ms_p95"] = results["batching"][mode]["line_ms_p95"]
+    for name, encoder_results in results.get("encoders", {}).items():
+        if isinstance(encoder_results, dict) and "separate_seconds" in encoder_results:
+            metrics[f"encoders.{name}.separate_seconds"] = encoder_results["separate_seconds"]
+            metrics[f"encoders.{name}.stream_seconds"] = encoder_results["stream_seconds"]
+            metrics[f"encoders.{name}.separate_bytes"] = encoder_results["separate_bytes"]
+    if results.get("peak_rss_mb") is not None:
+        metrics["peak_rss_mb"] = results["peak_rss_mb"]
+    return metrics
+
+
+def _higher_is_better(metric: str) -> bool:
+    return metric.endswith("_per_sec")
+
+
+def compare_to_baseline(results: Dict, baseline: Dict, threshold_pct: float) -> List[str]:
+    """Print each metric against the baseline; return the names of regressed metrics"""
+    current = flatten_metrics(results)
+    previous = flatten_metrics(baseline)
+    if baseline.get("fake_voices") != results.get("fake_voices"):
+        print("Warning: baseline and current run use different voice backends (fake vs real)")
+
+    regressions = []
+    print(f"\nComparison with baseline (threshold {threshold_pct:.0f}%):")
+    for metric, value in current.items():
+        if metric not in previous or not previous[metric]:
+            print(f"  {metric:45s} {value:12.4f}  (new)")
+            continue
+        change_pct = 100.0 * (value - previous[metric]) / previous[metric]
+        worse = -change_pct if _higher_is_better(metric) else change_pct
+        flag = ""
+        if worse > threshold_pct:
+            flag = "  REGRESSION"
+            regressions.append(metric)
+        elif worse < -threshold_pct:
+            flag = "  improved"
+        print(f"  {metric:45s} {value:12.4f}  vs {previous[metric]:12.4f}  ({change_pct:+6.1f}%){flag}")
+    return regressions
+
+
+def print_parser_results(parser_results: Dict):
+    print(f"\nParser: {parser_results['input_lines_per_sec']:,.0f} input lines/sec, "
+          f"{parser_results['dialogue_lines_per_sec']:,.0f} dialogue lines/sec "
+          f"({parser_results['files']} files, best of {parser_results['repeat']})")
+    if "speedup" in parser_results:
+        print(f"  {parser_results['speedup']:.2f}x faster than the reference parser "
+              f"({parser_results['reference_seconds'] * 1000:.1f} ms -> {parser_results['seconds'] * 1000:.1f} ms)")
+
+
+def print_results(results: Dict):
+    print_parser_results(results["parser"])
+    print_formatter_results(results["formatter"])
+
+    backend = "fake voices" if results["fake_voices"] else "real voices"
+    print(f"\nSynthesis real-time factor ({backend}, lower is faster):")
+    for voice_name, voice_results in results["synthesis"].items():
+        print(f"  {voice_name:40s} RTF {voice_results['rtf']:.4f} "
+              f"({voice_results['lines']} lines, {voice_results['audio_seconds']:.1f}s audio)")
+
+    combine_results = results["combine"]
+    print(f"\nCombine: {combine_results['lines']} lines, {combine_results['audio_seconds']:.1f}s audio, "
+          f"{combine_results['cold_seconds']:.2f}s cold, {combine_results['warm_seconds']:.2f}s warm (cached)")
+    print(f"  Rate conversion: {combine_results['resample_seconds'] * 1000:.1f} ms of the warm run")
+
+    batching_results = results["batching"]
+    print(f"\nBatching (combine mode, no cache, batch size {batching_results['batch_size']}, "
+          f"{batching_results['script_order']['lines']} lines):")
+    for mode in ("script_order", "batched"):
+        mode_results = batching_results[mode]
+        print(f"  {mode:12s} {mode_results['seconds']:.2f}s, {mode_results['voice_switches']} voice switches, "
+              f"per line {mode_results['line_ms_mean']:.1f} ms mean / {mode_results['line_ms_p50']:.1f} p50 / "
+              f"{mode_results['line_ms_p95']:.1f} p95")
+
+    encoder_results = results["encoders"]
+    print(f"\nEncoders ({encoder_results['lines']} lines, {encoder_results['audio_seconds']:.1f}s audio"
+          f"{'; fake voices, sizes not representative of speech' if results['fake_voices'] else ''}):")
+    for name in ENCODERS:
+        format_results = encoder_results[name]
+        if "skipped" in format_results:
+            print(f"  {name:6s} skipped ({format_results['skipped']})")
+            continue
+        print(f"  {name:6s} per line {format_results['separate_seconds']:.3f}s "
+              f"(encode RTF {format_results['encode_rtf']:.4f}), {format_results['separate_bytes'] / 1024:,.0f} KB "
+              f"= {100 * format_results['size_ratio']:.0f}% of WAV, {format_results['saved_mb']:.1f} MB saved; "
+              f"streamed {format_results['stream_seconds']:.3f}s, {format_results['stream_bytes'] / 1024:,.0f} KB")
+
+    if results["peak_rss_mb"] is not None:
+        print(f"\nPeak RSS: {results['peak_rss_mb']:.1f} MB")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark screenplay parsing and TTS synthesis throughput"
+    )
+    parser.add_argument(
+        "input_path",
+        nargs="?",
+        default=str(DEFAULT_INPUT),
+        help="Scene file or directory of .txt scenes (default: amazingtrash Act 1)"
+    )
+    parser.add_argument(
+        "--voice-config",
+        default=str(DEFAULT_VOICE_CONFIG),
+        help="Character voice config to benchmark (default: amazingtrash character_voices.json)"
+    )
+    parser.add_argument(
+        "--real-voices",
+        action="store_true",
+        help="Benchmark the real Piper models instead of the deterministic fake voices"
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=5,
+        help="Timed passes per benchmark; the fastest is reported (default: 5)"
+    )
+    parser.add_argument(
+        "--synthesis-lines",
+        type=int,
+        default=20,
+        help="Sample dialogue lines synthesized per voice (default: 20)"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Batch size for the voice-grouped synthesis benchmark (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--output",
+        help="Write JSON results to this file (e.g. to save a baseline)"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Compare against JSON results from an earlier run"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD_PCT,
+        help=f"Percent change counted as a regression (default: {DEFAULT_THRESHOLD_PCT:.0f})"
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Show the parser's and converter's per-line logging"
+    )
+
+    args = parser.parse_args()
+
+    input_path = Path(args.input_path)
+    if input_path.is_file():
+        screenplay_files = [input_path]
+    else:
+        screenplay_files = sorted(input_path.rglob("*.txt"))
+    if not screenplay_files:
+        print(f"Error: No .txt files found in {input_path}")
+        sys.exit(1)
+
+    print(f"Benchmarking {len(screenplay_files)} scene file(s) from {input_path}")
+    results = {
+        "version": BENCH_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "input": str(input_path),
+        "fake_voices": not args.real_voices,
+    }
+
+    results["parser"] = bench_parser(screenplay_files, args.repeat, verbose=args.verbose)
+    results["formatter"] = bench_formatter(screenplay_files, args.repeat)
+
+    with tempfile.TemporaryDirectory(prefix="bench_tts_") as work_dir:
+        work_dir = Path(work_dir)
+        voice_config = Path(args.voice_config)
+        voice_pool = None
+        if not args.real_voices:
+            voice_config = make_fake_voice_config(voice_config, work_dir)
+            voice_pool = FakeVoicePool()
+
+        with _quiet(args.verbose):
+            converter = PiperTTSConverter(voice_config_path=str(voice_config), voice_pool=voice_pool)
+
+        scene_parser = ScreenplayParser()
+        with _quiet(args.verbose):
+            parsed_scenes = [scene_parser.parse_file(str(f)) for f in screenplay_files]
+        parsed_scenes = [scene for scene in parsed_scenes if scene]
+        if not parsed_scenes:
+            print("Error: No dialogue found to synthesize")
+            sys.exit(1)
+        sample_texts = [line.text for scene in parsed_scenes for line in scene][:args.synthesis_lines]
+
+        results["synthesis"] = bench_synthesis(converter, sample_texts, args.repeat, verbose=args.verbose)
+        # Combine mode is measured on the first scene with dialogue
+        results["combine"] = bench_combine(converter, parsed_scenes[0], work_dir, args.repeat, verbose=args.verbose)
+        # Batching matters most where voices alternate: use the scene with the most speakers
+        busiest_scene = max(parsed_scenes, key=lambda scene: len({line.speaker for line in scene}))
+        results["batching"] = bench_batching(converter, busiest_scene, work_dir, args.batch_size,
+                                             verbose=args.verbose)
+        results["encoders"] = bench_encoders(converter, parsed_scenes[0], work_dir, args.repeat,
+                                             verbose=args.verbose)
+
+    results["peak_rss_mb"] = peak_rss_mb()
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults saved to: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed beyond {args.threshold:.0f}%")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Character Registry for screenplay tools
+Per-movie set of character names, built from the movie's character_voices.json and its
+writing/Characters directory instead of hard-coded name lists
+
+A movie is any folder directly under the project root, so a new movie only needs its own
+character_voices.json and/or character profiles. Names come from:
+- the speakers in character_voices.json (production/audio/ or production/), except
+  settings such as "_default" and the ACTION and NARRATOR voices
+- the character profiles in writing/Characters (Liam.txt -> LIAM), except README files
+- writing/Characters/extras.json, a list of minor characters that have neither a profile
+  nor a voice of their own (["BARTENDER", "FEMALE OFFICER"])
+
+Action lines are recased by their first word, so only single-word names (LIAM, BARTENDER)
+are used for that; the words of a longer name (NIGHT POLICE OFFICERS) are left alone.
+
+Registries are cached in memory and on disk (tts_cache/character_registry.json), together
+with the size and mtime of every source. A registry is only rebuilt when a source changes,
+appears or disappears; adding, removing or renaming a profile changes the Characters
+directory's mtime.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from synthesis_cache import DEFAULT_CACHE_DIR
+from voice_index import normalize_speaker
+
+# Repository root (untitled/), holding one folder per movie
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+DEFAULT_REGISTRY_FILE = DEFAULT_CACHE_DIR / "character_registry.json"
+REGISTRY_VERSION = 2
+
+# Where a movie keeps its voice config, in order of preference
+VOICE_CONFIG_LOCATIONS = (Path("production") / "audio" / "character_voices.json",
+                          Path("production") / "character_voices.json")
+CHARACTERS_DIR = Path("writing") / "Characters"
+PROFILE_SUFFIXES = (".txt", ".md")
+EXTRAS_FILE = CHARACTERS_DIR / "extras.json"
+
+# Voice config speakers that are not characters
+NON_CHARACTER_SPEAKERS = frozenset({"ACTION", "NARRATOR"})
+
+# (path, size, mtime_ns) of each source; size and mtime are None while it doesn't exist
+SourceSignature = Tuple[Tuple[str, Optional[int], Optional[int]], ...]
+
+
+class CharacterRegistry:
+    """Immutable set of a movie's character names with O(1) membership tests"""
+
+    def __init__(self, movie: str, names: Iterable[str]):
+        """Build the registry
+
+        Args:
+            movie: Movie folder name
+            names: Character names (normalized to canonical upper case)
+        """
+        self.movie = movie
+        self.names: FrozenSet[str] = frozenset(normalize_speaker(name) for name in names if name.strip())
+        # Single-word names, for matching the first word of an action line
+        self.words: FrozenSet[str] = frozenset(name for name in self.names if ' ' not in name)
+        self.fingerprint = hashlib.sha256(
+            json.dumps(sorted(self.names), ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, speaker: str) -> bool:
+        return speaker in self.names or normalize_speaker(speaker) in self.names
+
+    def __repr__(self) -> str:
+        return f"CharacterRegistry({self.movie!r}, {len(self.names)} names)"
+
+
+def movie_for_path(path) -> Optional[str]:
+    """Movie folder a file or directory belongs to (None if outside the project's movie folders)"""
+    try:
+        relative = Path(os.path.realpath(path)).relative_to(os.path.realpath(PROJECT_ROOT))
+    except ValueError:
+        return None
+    if len(relative.parts) < 2 or relative.parts[0].startswith('.'):
+        return None
+    movie = relative.parts[0]
+    return movie if (PROJECT_ROOT / movie).is_dir() else None
+
+
+def registry_sources(movie: str) -> List[Path]:
+    """Files and directories a movie's registry is built from"""
+    movie_dir = PROJECT_ROOT / movie
+    return ([movie_dir / location for location in VOICE_CONFIG_LOCATIONS] +
+            [movie_dir / CHARACTERS_DIR, movie_dir / EXTRAS_FILE])
+
+
+def _read_json(path: Path):
+    """Parsed JSON file, or None (with a warning) if it can't be read"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (ValueError, OSError) as e:
+        print(f"Warning: Could not read {path}: {e}")
+        return None
+
+
+def _signature(sources: List[Path]) -> SourceSignature:
+    signature = []
+    for source in sources:
+        try:
+            stat = os.stat(source)
+            signature.append((str(source), stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append((str(source), None, None))
+    return tuple(signature)
+
+
+def _read_names(movie: str) -> List[str]:
+    """Character names from a movie's voice config, character profiles and extras list"""
+    movie_dir = PROJECT_ROOT / movie
+    names = []
+    for location in VOICE_CONFIG_LOCATIONS:
+        config_path = movie_dir / location
+        if not config_path.exists():
+            continue
+        config = _read_json(config_path)
+        if isinstance(config, dict):
+            # Keys starting with "_" are settings ("_default"), not speakers
+            names.extend(name for name in config
+                         if not name.startswith('_') and normalize_speaker(name) not in NON_CHARACTER_SPEAKERS)
+        # Only the preferred config is used, as in screenplay_to_tts.py
+        break
+
+    characters_dir = movie_dir / CHARACTERS_DIR
+    if characters_dir.is_dir():
+        for profile in characters_dir.iterdir():
+            if profile.suffix.lower() in PROFILE_SUFFIXES and profile.stem.lower() != "readme":
+                names.append(profile.stem.replace('_', ' '))
+
+    extras_path = movie_dir / EXTRAS_FILE
+    if extras_path.exists():
+        extras = _read_json(extras_path)
+        if isinstance(extras, list):
+            names.extend(name for name in extras if isinstance(name, str))
+        elif extras is not None:
+            print(f"Warning: {extras_path} should be a list of names")
+    return names
+
+
+# Per process: movie -> (source signature, registry)
+_registries: Dict[str, Tuple[SourceSignature, CharacterRegistry]] = {}
+
+
+def _load_registry_file(registry_file: Path) -> Dict:
+    try:
+        with open(registry_file, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+    except (ValueError, OSError):
+        return {}
+    if not isinstance(stored, dict) or stored.get("version") != REGISTRY_VERSION:
+        return {}
+    return stored.get("movies", {})
+
+
+def _save_registry_file(registry_file: Path, movies: Dict):
+    """Write the on-disk cache through a temp file + rename"""
+    registry_file.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=str(registry_file.parent), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"version": REGISTRY_VERSION, "movies": movies}, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, registry_file)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def load_registry(movie: str, registry_file: Optional[Path] = DEFAULT_REGISTRY_FILE) -> CharacterRegistry:
+    """A movie's character registry, rebuilt only if its sources changed
+
+    Args:
+        movie: Movie folder name (e.g. "hunted")
+        registry_file: On-disk cache shared between runs (None: memory only)
+    """
+    signature = _signature(registry_sources(movie))
+    cached = _registries.get(movie)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    stored_movies = _load_registry_file(registry_file) if registry_file else {}
+    stored = stored_movies.get(movie)
+    if stored and tuple(tuple(source) for source in stored.get("sources", ())) == signature:
+        registry = CharacterRegistry(movie, stored["names"])
+    else:
+        registry = CharacterRegistry(movie, _read_names(movie))
+        if registry_file:
+            stored_movies[movie] = {"sources": signature, "names": sorted(registry.names)}
+            try:
+                _save_registry_file(registry_file, stored_movies)
+            except OSError as e:
+                print(f"Warning: Could not save {registry_file}: {e}")
+
+    _registries[movie] = (signature, registry)
+    return registry
+
+
+def registry_for_path(path, registry_file: Optional[Path] = DEFAULT_REGISTRY_FILE) -> Optional[CharacterRegistry]:
+    """Character registry of the movie a file belongs to (None if it isn't in a movie folder)"""
+    movie = movie_for_path(path)
+    return load_registry(movie, registry_file) if movie else None
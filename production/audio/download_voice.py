@@ -1,12 +1,48 @@
 #!/usr/bin/env python3
 """
 Download Piper voice models for TTS
+
+Files are fetched in parallel on a thread pool into production/audio/voices/ (shared by all
+movies). Interrupted downloads are kept as <file>.part and resumed with HTTP Range requests,
+and every file is checked against the size and MD5 listed in the voice repository's
+voices.json manifest, so a truncated or corrupt model is repaired instead of being skipped.
+Files the manifest doesn't list (or all of them, if it can't be loaded) are checked against
+the size the server reports, and downloaded again when that isn't known either.
+
+Usage:
+    python download_voice.py                                   # interactive selection
+    python download_voice.py --voices en_US-ryan-high en_US-amy-medium
+    python download_voice.py --all --jobs 8                    # provisioning, no prompts
 """
 
+import argparse
+import hashlib
+import http.client
+import json
 import os
 import sys
+import threading
+import time
+import urllib.error
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Voice repository the URLs below point into (its voices.json lists sizes and checksums)
+BASE_URL = "https://huggingface.co/rhasspy/piper-voices/resolve/v1.0.0/"
+MANIFEST_NAME = "voices.json"
+
+# Shared voices directory, where screenplay_to_tts.py looks for models
+DEFAULT_VOICES_DIR = Path(__file__).parent / "voices"
+DEFAULT_JOBS = 4
+
+PART_SUFFIX = ".part"
+CHUNK_SIZE = 1024 * 1024
+TIMEOUT_SECONDS = 60
+# Full re-downloads after a failed verification or connection error, per file
+MAX_ATTEMPTS = 3
 
 # Available voice models
 VOICES = {
@@ -90,74 +126,344 @@ VOICES = {
 }
 
 
-def download_file(url: str, output_path: str):
-    """Download a file with progress bar"""
-    print(f"  Downloading: {os.path.basename(output_path)}")
+@dataclass
+class DownloadTask:
+    """One file to fetch"""
+    voice: str
+    url: str
+    path: Path
+    size: Optional[int] = None  # Expected size in bytes, from the manifest
+    md5: Optional[str] = None  # Expected MD5 hex digest, from the manifest
 
-    def reporthook(count, block_size, total_size):
-        percent = int(count * block_size * 100 / total_size)
-        sys.stdout.write(f"\r  Progress: {percent}%")
-        sys.stdout.flush()
 
-    urllib.request.urlretrieve(url, output_path, reporthook)
-    print()  # New line after download
+def relative_path(url: str) -> str:
+    """Path of a voice file inside the voice repository"""
+    return url[len(BASE_URL):] if url.startswith(BASE_URL) else url.rsplit('/', 1)[-1]
 
 
-def main():
-    print("Piper Voice Model Downloader")
-    print("=" * 60)
-    print("\nAvailable voices:")
-    for i, (voice_name, voice_data) in enumerate(VOICES.items(), 1):
-        desc = voice_data.get("desc", "")
-        print(f"  {i:2d}. {voice_name:30s} - {desc}")
+def file_md5(path: Path) -> str:
+    """MD5 hex digest of a file (the checksum voices.json lists)"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
 
-    print("\nEnter voice number(s) to download (comma-separated, or 'all'):")
-    choice = input("> ").strip().lower()
 
-    # Create voices directory
-    voices_dir = Path("voices")
-    voices_dir.mkdir(exist_ok=True)
+def load_manifest(source: str) -> Dict[str, Tuple[Optional[int], Optional[str]]]:
+    """Expected (size, md5) per file, from a voices.json URL or local path
 
-    # Determine which voices to download
-    if choice == "all":
-        voices_to_download = list(VOICES.keys())
+    Args:
+        source: URL or path of the voice repository's voices.json
+    """
+    if "://" in source:
+        with urllib.request.urlopen(source, timeout=TIMEOUT_SECONDS) as response:
+            manifest = json.load(response)
     else:
+        with open(source, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    expected = {}
+    for voice in manifest.values():
+        for file_path, info in voice.get("files", {}).items():
+            expected[file_path] = (info.get("size_bytes"), info.get("md5_digest"))
+    return expected
+
+
+def response_total_size(response, offset: int) -> Optional[int]:
+    """Full size of the file being downloaded, from Content-Range or Content-Length"""
+    content_range = response.headers.get("Content-Range", "")
+    if '/' in content_range and not content_range.endswith('*'):
+        return int(content_range.rsplit('/', 1)[1])
+    content_length = response.headers.get("Content-Length")
+    return offset + int(content_length) if content_length else None
+
+
+def verify(task: DownloadTask, path: Path) -> Optional[str]:
+    """Why a downloaded file doesn't match the manifest (None if it does, or nothing is known)"""
+    size = path.stat().st_size
+    if task.size is not None and size != task.size:
+        return f"size {size:,} bytes, expected {task.size:,}"
+    if task.md5 and file_md5(path) != task.md5:
+        return "MD5 mismatch"
+    return None
+
+
+class Downloader:
+    """Fetches voice files in parallel, resuming partial downloads"""
+
+    def __init__(self, base_url: str = BASE_URL, jobs: int = DEFAULT_JOBS):
+        """Initialize the downloader
+
+        Args:
+            base_url: Voice repository to download from (URLs in VOICES are rebased onto it)
+            jobs: Number of files downloaded at once
+        """
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.jobs = max(1, jobs)
+        self._print_lock = threading.Lock()
+        self.downloaded_bytes = 0
+
+    def _log(self, message: str):
+        with self._print_lock:
+            print(message, flush=True)
+
+    def url_for(self, url: str) -> str:
+        return self.base_url + relative_path(url)
+
+    def server_size(self, url: str) -> Optional[int]:
+        """Size of a file on the server, or None if the server doesn't say
+
+        Asks for the first byte instead of sending HEAD: urllib turns a redirected HEAD
+        into a GET, and the voice repository redirects every file to its CDN.
+        """
+        request = urllib.request.Request(url, headers={"Range": "bytes=0-0"})
         try:
-            indices = [int(x.strip()) for x in choice.split(",")]
-            voices_to_download = [list(VOICES.keys())[i - 1] for i in indices]
-        except (ValueError, IndexError):
-            print("Invalid selection")
-            sys.exit(1)
+            with urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS) as response:
+                return response_total_size(response, 0)
+        except (urllib.error.URLError, http.client.HTTPException, OSError, ValueError):
+            return None
 
-    # Download selected voices
-    print(f"\nDownloading {len(voices_to_download)} voice(s)...\n")
+    def _fetch(self, task: DownloadTask, part_path: Path) -> int:
+        """Download into part_path, continuing from its current size; returns bytes received"""
+        offset = part_path.stat().st_size if part_path.exists() else 0
+        if task.size is not None and offset >= task.size:
+            # Complete already (or over-long; verification decides)
+            return 0
+
+        request = urllib.request.Request(task.url)
+        if offset:
+            request.add_header("Range", f"bytes={offset}-")
+        try:
+            response = urllib.request.urlopen(request, timeout=TIMEOUT_SECONDS)
+        except urllib.error.HTTPError as e:
+            if e.code == 416 and offset:
+                # Range not satisfiable: the partial file is no good, start over
+                part_path.unlink()
+                return self._fetch(task, part_path)
+            raise
+
+        with response:
+            if offset and response.status == 206:
+                self._log(f"  Resuming {task.path.name} at {offset / 1024 / 1024:.1f} MB")
+                mode = 'ab'
+            else:
+                # Server ignored the range (or nothing to resume): full download
+                mode = 'wb'
+                offset = 0
+            if task.size is None:
+                # Not in the manifest: at least check the size the server announced
+                task.size = response_total_size(response, offset)
+            received = 0
+            with open(part_path, mode) as f:
+                for block in iter(lambda: response.read(CHUNK_SIZE), b''):
+                    f.write(block)
+                    received += len(block)
+        return received
+
+    def download(self, task: DownloadTask) -> str:
+        """Fetch and verify one file; returns a one-line status (raises on failure)"""
+        if task.path.exists():
+            if task.size is None and task.md5 is None:
+                # Not in the manifest: compare with the size the server reports
+                task.size = self.server_size(task.url)
+            if task.size is None and task.md5 is None:
+                problem = "size unknown, can't be verified"
+            else:
+                problem = verify(task, task.path)
+            if problem is None:
+                return f"{task.path.name} already downloaded"
+            self._log(f"  {task.path.name} is damaged ({problem}), downloading again")
+            part_path = task.path.with_name(task.path.name + PART_SUFFIX)
+            if task.size is not None and task.path.stat().st_size < task.size:
+                # Truncated by an interrupted download: resume it
+                os.replace(task.path, part_path)
+            else:
+                task.path.unlink()
+
+        part_path = task.path.with_name(task.path.name + PART_SUFFIX)
+        start = time.perf_counter()
+        received = 0
+        for attempt in range(1, MAX_ATTEMPTS + 1):
+            try:
+                received += self._fetch(task, part_path)
+            except urllib.error.HTTPError as e:
+                if e.code < 500:
+                    # Missing file, no access, ...: retrying won't help
+                    raise RuntimeError(f"{task.path.name}: {e}") from e
+                if attempt == MAX_ATTEMPTS:
+                    raise RuntimeError(f"{task.path.name}: {e}") from e
+                self._log(f"  {task.path.name}: {e}, retrying")
+                continue
+            except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
+                # Keep the partial file, the next attempt resumes it
+                if attempt == MAX_ATTEMPTS:
+                    raise RuntimeError(f"{task.path.name}: {e}") from e
+                self._log(f"  {task.path.name}: {e}, retrying")
+                continue
+
+            problem = verify(task, part_path)
+            if problem is None:
+                break
+            if attempt == MAX_ATTEMPTS:
+                raise RuntimeError(f"{task.path.name}: download failed verification ({problem})")
+            if task.size is not None and part_path.stat().st_size < task.size:
+                # Connection ended early: the next attempt resumes where it stopped
+                self._log(f"  {task.path.name} download interrupted ({problem}), resuming")
+            else:
+                part_path.unlink()
+                self._log(f"  {task.path.name} failed verification ({problem}), retrying")
+
+        os.replace(part_path, task.path)
+        with self._print_lock:
+            self.downloaded_bytes += received
+        elapsed = time.perf_counter() - start
+        size_mb = task.path.stat().st_size / 1024 / 1024
+        return f"{task.path.name} ({size_mb:.1f} MB, {received / 1024 / 1024 / max(elapsed, 1e-6):.1f} MB/s)"
+
+    def run(self, tasks: List[DownloadTask]) -> List[str]:
+        """Download every task on the thread pool; returns error messages (empty on success)"""
+        errors = []
+        with ThreadPoolExecutor(max_workers=min(self.jobs, max(1, len(tasks)))) as executor:
+            futures = {executor.submit(self.download, task): task for task in tasks}
+            for future in as_completed(futures):
+                try:
+                    self._log(f"  ✓ {future.result()}")
+                except Exception as e:
+                    errors.append(str(e))
+                    self._log(f"  ✗ {e}")
+        return errors
 
-    for voice_name in voices_to_download:
-        print(f"Voice: {voice_name}")
 
+def build_tasks(voice_names: List[str], voices_dir: Path, downloader: Downloader,
+                manifest: Dict[str, Tuple[Optional[int], Optional[str]]]) -> List[DownloadTask]:
+    """The .onnx and .onnx.json files of each voice, with their expected sizes and checksums"""
+    tasks = []
+    for voice_name in voice_names:
         voice_data = VOICES[voice_name]
+        for url, file_name in ((voice_data["onnx"], f"{voice_name}.onnx"),
+                               (voice_data["config"], f"{voice_name}.onnx.json")):
+            size, md5 = manifest.get(relative_path(url), (None, None))
+            tasks.append(DownloadTask(voice_name, downloader.url_for(url), voices_dir / file_name, size, md5))
+    return tasks
 
-        # Download .onnx file
-        onnx_path = voices_dir / f"{voice_name}.onnx"
-        if not onnx_path.exists():
-            download_file(voice_data["onnx"], str(onnx_path))
-        else:
-            print(f"  {onnx_path.name} already exists, skipping")
 
-        # Download .onnx.json config file
-        config_path = voices_dir / f"{voice_name}.onnx.json"
-        if not config_path.exists():
-            download_file(voice_data["config"], str(config_path))
-        else:
-            print(f"  {config_path.name} already exists, skipping")
+def choose_voices() -> List[str]:
+    """Ask which voices to download"""
+    print("\nEnter voice number(s) to download (comma-separated, or 'all'):")
+    choice = input("> ").strip().lower()
+
+    if choice == "all":
+        return list(VOICES.keys())
+    try:
+        indices = [int(x.strip()) for x in choice.split(",")]
+        return [list(VOICES.keys())[i - 1] for i in indices]
+    except (ValueError, IndexError):
+        print("Invalid selection")
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Download Piper voice models (in parallel, resuming interrupted downloads)"
+    )
+    parser.add_argument(
+        "--voices",
+        nargs="+",
+        metavar="VOICE",
+        help="Voices to download without prompting (e.g. en_US-ryan-high en_US-amy-medium)"
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Download every available voice without prompting"
+    )
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="List the available voices and exit"
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=str(DEFAULT_VOICES_DIR),
+        help="Where to save the models (default: production/audio/voices, shared across movies)"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=DEFAULT_JOBS,
+        help=f"Files downloaded at once (default: {DEFAULT_JOBS})"
+    )
+    parser.add_argument(
+        "--base-url",
+        default=BASE_URL,
+        help="Voice repository to download from, e.g. a mirror (default: Hugging Face rhasspy/piper-voices v1.0.0)"
+    )
+    parser.add_argument(
+        "--manifest",
+        help=f"voices.json (URL or path) with file sizes and MD5 checksums (default: {MANIFEST_NAME} in the voice repository)"
+    )
 
-        print()
+    args = parser.parse_args()
+
+    print("Piper Voice Model Downloader")
+    print("=" * 60)
+    if args.list or not (args.voices or args.all):
+        print("\nAvailable voices:")
+        for i, (voice_name, voice_data) in enumerate(VOICES.items(), 1):
+            desc = voice_data.get("desc", "")
+            print(f"  {i:2d}. {voice_name:30s} - {desc}")
+        if args.list:
+            return
+
+    # Determine which voices to download
+    if args.all:
+        voices_to_download = list(VOICES.keys())
+    elif args.voices:
+        voices_to_download = [name for value in args.voices for name in value.split(',') if name]
+        unknown = [name for name in voices_to_download if name not in VOICES]
+        if unknown:
+            print(f"Error: Unknown voice(s): {', '.join(unknown)} (see --list)")
+            sys.exit(1)
+    else:
+        voices_to_download = choose_voices()
+
+    # Create voices directory
+    voices_dir = Path(args.output_dir)
+    voices_dir.mkdir(parents=True, exist_ok=True)
+
+    downloader = Downloader(args.base_url, args.jobs)
+    manifest_source = args.manifest or downloader.base_url + MANIFEST_NAME
+    try:
+        manifest = load_manifest(manifest_source)
+    except (urllib.error.URLError, OSError, ValueError) as e:
+        print(f"\nWarning: Could not load manifest {manifest_source} ({e}); "
+              f"files are only checked against the server's sizes")
+        manifest = {}
+
+    tasks = build_tasks(voices_to_download, voices_dir, downloader, manifest)
+    unverified = [task.path.name for task in tasks if task.md5 is None]
+    if manifest and unverified:
+        print(f"\nWarning: Not in the manifest, only checked against the server's sizes: "
+              f"{', '.join(unverified)}")
+
+    # Download selected voices
+    print(f"\nDownloading {len(voices_to_download)} voice(s) ({len(tasks)} files, "
+          f"{min(downloader.jobs, len(tasks))} at a time)...\n")
+    start = time.perf_counter()
+    errors = downloader.run(tasks)
+    elapsed = time.perf_counter() - start
 
+    print()
     print("=" * 60)
+    if errors:
+        print(f"{len(errors)} file(s) failed; re-run the same command to resume.")
+        sys.exit(1)
     print("Download complete!")
+    print(f"  {downloader.downloaded_bytes / 1024 / 1024:.1f} MB downloaded in {elapsed:.1f}s")
     print(f"\nVoice models saved to: {voices_dir.absolute()}")
     print("\nUsage example:")
-    print(f"  python screenplay_to_tts.py screenplay.txt --voice-model voices/{voices_to_download[0]}.onnx")
+    print(f"  python screenplay_to_tts.py screenplay.txt --voice-model {voices_dir / voices_to_download[0]}.onnx")
 
 
 if __name__ == "__main__":
@@ -4,7 +4,16 @@ Screenplay Dialogue Formatter
 Converts screenplay dialogue to proper TTS-friendly format following SCREENPLAY_FORMATTING.md
 
 Usage:
-    python format_screenplay_dialogue.py <screenplay_file.txt>
+    python format_screenplay_dialogue.py <screenplay_file.txt | directory> [...]
+    python format_screenplay_dialogue.py --check amazingtrash/writing cuberoot/writing hunted/writing
+
+Files are formatted in parallel. A file is only rewritten when formatting changes it, and
+files whose content still matches the hash stored after they were last formatted are skipped.
+--check reports which files would change without writing anything (exit code 1 if any would).
+
+Character names are taken from the character registry of the movie each file belongs to
+(its character_voices.json, writing/Characters profiles and extras list, see
+character_registry.py).
 
 This script formats dialogue in a screenplay file to follow proper formatting:
 - Character names centered with 20 spaces indent
@@ -29,36 +38,100 @@ Example output format:
               We need to leave now.
 """
 
+import argparse
+import difflib
+import hashlib
+import json
 import re
+import stat
 import sys
+import tempfile
 import textwrap
 import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Optional
+
+from character_registry import registry_for_path
+from synthesis_cache import DEFAULT_CACHE_DIR, hash_file
+
+# Post-format content hashes of every formatted file, so unchanged files are skipped
+DEFAULT_STATE_FILE = DEFAULT_CACHE_DIR / "format_hashes.json"
+
+# process_file outcomes
+SKIPPED = "skipped"
+UNCHANGED = "unchanged"
+CHANGED = "changed"
+ERROR = "error"
+
+# Maximum line width after wrapping
+MAX_LINE_WIDTH = 121
+
+# Speaker annotations allowed in a character header (ignored by the all-letters test)
+HEADER_ANNOTATIONS = ("(CONT'D)", '(O.S.)', '(V.O.)')
+# V.O./O.S. annotations, ignored by the punctuation test
+VO_OS_ANNOTATION = re.compile(r'\s*\((V\.O\.|O\.S\.)\)')
+# ALL CAPS lines that are never character headers
+NON_HEADER_PREFIXES = ('INT.', 'EXT.', 'FADE', 'CUT', 'SCENE')
+
+# classify_line results
+OTHER_LINE = 0
+NAME_LINE = 1  # ALL CAPS name-like line: ends a dialogue block, but isn't a header
+CHARACTER_HEADER = 2  # Starts a dialogue block
+
 
-# Common character names in the screenplay (add more as needed)
-# Cube^(0.333) characters
-CUBE_CHARACTERS = [
-    'MARCUS', 'ALEX', 'LEA', 'EDGAR', 'MORRIS', 'DARIUS', 'SOFIA',
-    'CHEN', 'NINA', 'YUKI', 'RASHID', 'JOSH', 'BARRY'
-]
-
-# Amazingtrash characters
-AMAZINGTRASH_CHARACTERS = [
-    'ADAM', 'GEOFF', 'MOOSK', 'GAL', 'TYSON', 'JOE',
-    'VICTIM', 'BODY', 'NIGHT', 'POLICE', 'OFFICERS', 'STANDARD', 'CLASS', 'PASSENGER'
-]
-
-# Hunted characters
-HUNTED_CHARACTERS = [
-    'LIAM', 'HANK', 'BOBBY', 'SARAH', 'ELI', 'EMMA', 'OLIVIA', 'GIRLY',
-    'REGULAR CUSTOMER', 'ATTRACTIVE WOMAN', 'MAN WITH GLASSES',
-    'EMPLOYEE', 'BARTENDER', 'OFFICER', 'FEMALE OFFICER', 'DETECTIVE'
-]
-
-# Combine all character names
-CHARACTER_NAMES = CUBE_CHARACTERS + AMAZINGTRASH_CHARACTERS + HUNTED_CHARACTERS
-
-def wrap_line(line, max_width=121):
+def classify_line(line):
+    """
+    Classify a line for the formatter (computed once per line).
+
+    Character headers are: ALL CAPS, alphabetic only (no commas/periods), on their
+    own line, and not a scene heading or transition. Note: (V.O.) and (O.S.)
+    annotations contain periods but are valid character headers.
+
+    Args:
+        line (str): Line of the screenplay
+
+    Returns:
+        int: CHARACTER_HEADER, NAME_LINE or OTHER_LINE
+    """
+    # Strip leading whitespace to check the actual content
+    stripped = line.lstrip()
+    if not stripped or len(stripped) >= 40 or stripped != stripped.upper():
+        return OTHER_LINE
+
+    # Strip (CONT'D), (O.S.), (V.O.) etc. for alpha check
+    has_annotation = '(' in stripped
+    check = stripped
+    if has_annotation:
+        for annotation in HEADER_ANNOTATIONS:
+            check = check.replace(annotation, '')
+    if not check.strip().replace(' ', '').isalpha():
+        return OTHER_LINE
+
+    if stripped.startswith(NON_HEADER_PREFIXES):
+        return NAME_LINE
+    # Not an action line (action lines have punctuation like commas/periods)
+    punct_check = VO_OS_ANNOTATION.sub('', stripped) if has_annotation else stripped
+    if ',' in punct_check or '.' in punct_check:
+        return NAME_LINE
+    return CHARACTER_HEADER
+
+
+@lru_cache(maxsize=None)
+def _wrapper(indent, max_width):
+    """TextWrapper for lines with the given indentation (built once, then reused)"""
+    return textwrap.TextWrapper(
+        width=max_width,
+        initial_indent=indent,
+        subsequent_indent=indent,
+        break_long_words=False,
+        break_on_hyphens=False
+    )
+
+
+def wrap_line(line, max_width=MAX_LINE_WIDTH):
     """
     Wrap a line to max_width without chopping words.
     Preserves leading indentation.
@@ -78,17 +151,10 @@ def wrap_line(line, max_width=121):
     indent = line[:len(line) - len(stripped)]
 
     # Wrap the text (pass stripped text, wrapper adds indent)
-    wrapper = textwrap.TextWrapper(
-        width=max_width,
-        initial_indent=indent,
-        subsequent_indent=indent,
-        break_long_words=False,
-        break_on_hyphens=False
-    )
+    return _wrapper(indent, max_width).wrap(stripped)
 
-    return wrapper.wrap(stripped)
 
-def fix_action_line_caps(line):
+def fix_action_line_caps(line, character_names=frozenset()):
     """
     Convert ALL CAPS character names in action lines to proper case.
 
@@ -98,129 +164,123 @@ def fix_action_line_caps(line):
 
     Args:
         line (str): Action line that may have ALL CAPS character names
+        character_names (frozenset): ALL CAPS names (single words) to convert
 
     Returns:
         str: Action line with proper case character names
     """
     # Check if line starts with an ALL CAPS character name
-    words = line.split()
+    words = line.split(None, 1)
     if not words:
         return line
 
     first_word = words[0].rstrip(',.')
 
     # If first word is an ALL CAPS character name, convert to proper case
-    if first_word in CHARACTER_NAMES:
+    if first_word in character_names:
         # Replace first word with proper case version
         proper_case_name = first_word.capitalize()
         return line.replace(first_word, proper_case_name, 1)
 
     return line
 
-def format_screenplay_dialogue(content):
+
+def format_screenplay_dialogue(content, character_names=frozenset()):
     """
     Format dialogue in screenplay to follow proper formatting standards.
 
     Args:
         content (str): The screenplay content to format
+        character_names (frozenset): The movie's single-word character names, converted
+                                     to proper case at the start of action lines
+                                     (CharacterRegistry.words)
 
     Returns:
         str: Formatted screenplay content
     """
-    lines = content.split('\n')
-    new_lines = []
-    i = 0
+    return '\n'.join(format_screenplay_lines(content.split('\n'), character_names))
 
-    while i < len(lines):
-        line = lines[i]
 
-        # Check if this is a character name (formatted or unformatted)
-        # Strip leading whitespace to check the actual content
-        line_stripped = line.lstrip()
-
-        # Strip (CONT'D), (O.S.), (V.O.) etc. for alpha check
-        line_check = line_stripped.replace('(CONT\'D)', '').replace('(O.S.)', '').replace('(V.O.)', '').strip()
-
-        # Check if this is a character dialogue header (not an action line)
-        # Character headers are: ALL CAPS, alphabetic only (no commas/periods), on their own line
-        # Note: (V.O.) and (O.S.) annotations contain periods but are valid character headers
-        line_for_punct_check = re.sub(r'\s*\((V\.O\.|O\.S\.)\)', '', line_stripped)
-        is_character_header = (line_stripped and
-            line_stripped == line_stripped.upper() and
-            len(line_stripped) < 40 and
-            line_check.replace(' ', '').isalpha() and
-            not line_stripped.startswith('INT.') and
-            not line_stripped.startswith('EXT.') and
-            not line_stripped.startswith('FADE') and
-            not line_stripped.startswith('CUT') and
-            not line_stripped.startswith('SCENE') and
-            # Not an action line (action lines have punctuation like commas/periods)
-            # Exclude V.O./O.S. from punctuation check
-            ',' not in line_for_punct_check and
-            '.' not in line_for_punct_check)
-
-        if is_character_header:
-
-            # This is a character name that needs formatting
-            char_name = line_stripped
-
-            # Check if next line is a parenthetical (action note)
-            if i + 1 < len(lines) and lines[i + 1].strip().startswith('(') and lines[i + 1].strip().endswith(')'):
-                # Convert parenthetical to action line BEFORE character name
-                paren = lines[i + 1].strip()[1:-1]  # Remove parentheses
-
-                # Create proper action line from parenthetical
-                if paren:
-                    action_line = format_parenthetical_to_action(char_name, paren)
-                    new_lines.append(action_line)
-                    new_lines.append('')  # Blank line after action
-
-                i += 2  # Skip the parenthetical line
-            else:
-                i += 1
+def format_screenplay_lines(lines, character_names=frozenset()):
+    """
+    Format screenplay lines (without line endings), returning the formatted lines.
 
-            # Add properly formatted character name
-            new_lines.append(' ' * 20 + char_name)
-
-            # Get dialogue lines until we hit a blank line or another character
-            while i < len(lines):
-                if not lines[i].strip():
-                    new_lines.append('')
-                    i += 1
-                    break
-
-                # Check if this is a character name (including CONT'D)
-                next_line_stripped = lines[i].lstrip()
-                next_line_check = next_line_stripped.replace('(CONT\'D)', '').replace('(O.S.)', '').replace('(V.O.)', '').strip()
-                if (next_line_stripped and
-                    next_line_stripped == next_line_stripped.upper() and
-                    len(next_line_stripped) < 40 and
-                    next_line_check.replace(' ', '').isalpha()):
-                    # Hit next character name
-                    break
-
-                # This is dialogue - indent it properly
-                dialogue = lines[i]
-                if not dialogue.startswith(' '):
-                    # No indentation - add proper dialogue indent
-                    new_lines.append(' ' * 10 + dialogue)
-                else:
-                    # Has some indentation - strip and re-indent to 10 spaces
-                    new_lines.append(' ' * 10 + dialogue.lstrip())
-                i += 1
+    Single pass over the lines: each line is classified once, and formatted lines are
+    wrapped as they are produced. screenplay_to_tts.py --preformat parses the result
+    directly instead of a formatted file.
+
+    Args:
+        lines (list): The screenplay's lines (content.split('\n'))
+        character_names (frozenset): See format_screenplay_dialogue
+
+    Returns:
+        list: Formatted lines
+    """
+    kinds = [classify_line(line) for line in lines]
+    line_count = len(lines)
+    output = []
+
+    def emit(line):
+        # Apply word wrap to all lines (max 121 characters)
+        if len(line) <= MAX_LINE_WIDTH:
+            output.append(line)
         else:
+            output.extend(wrap_line(line, max_width=MAX_LINE_WIDTH))
+
+    i = 0
+    while i < line_count:
+        line = lines[i]
+
+        if kinds[i] != CHARACTER_HEADER:
             # Not a character name - could be action line or other content
             # Fix ALL CAPS character names in action lines
-            fixed_line = fix_action_line_caps(line)
-            new_lines.append(fixed_line)
+            emit(fix_action_line_caps(line, character_names))
+            i += 1
+            continue
+
+        # This is a character name that needs formatting
+        char_name = line.lstrip()
+
+        # Check if next line is a parenthetical (action note)
+        next_stripped = lines[i + 1].strip() if i + 1 < line_count else ''
+        if next_stripped.startswith('(') and next_stripped.endswith(')'):
+            # Convert parenthetical to action line BEFORE character name
+            paren = next_stripped[1:-1]  # Remove parentheses
+
+            # Create proper action line from parenthetical
+            if paren:
+                emit(format_parenthetical_to_action(char_name, paren))
+                output.append('')  # Blank line after action
+
+            i += 2  # Skip the parenthetical line
+        else:
             i += 1
 
-    # Apply word wrap to all lines (max 121 characters)
-    wrapped_lines = []
-    for line in new_lines:
-        wrapped_lines.extend(wrap_line(line, max_width=121))
+        # Add properly formatted character name
+        emit(' ' * 20 + char_name)
+
+        # Get dialogue lines until we hit a blank line or another character
+        while i < line_count:
+            dialogue = lines[i]
+            if not dialogue.strip():
+                output.append('')
+                i += 1
+                break
 
-    return '\n'.join(wrapped_lines)
+            # Hit next character name (including CONT'D)
+            if kinds[i] != OTHER_LINE:
+                break
+
+            # This is dialogue - indent it properly
+            if not dialogue.startswith(' '):
+                # No indentation - add proper dialogue indent
+                emit(' ' * 10 + dialogue)
+            else:
+                # Has some indentation - strip and re-indent to 10 spaces
+                emit(' ' * 10 + dialogue.lstrip())
+            i += 1
+
+    return output
 
 
 def format_parenthetical_to_action(character, parenthetical):
@@ -273,100 +333,346 @@ def format_parenthetical_to_action(character, parenthetical):
     return f"{char_name}, {parenthetical.strip()}"
 
 
-def process_file(filename):
+def formatter_fingerprint():
     """
-    Process a single screenplay file.
+    Fingerprint of the formatting rules (this script's source).
+
+    Stored hashes are only trusted while it is unchanged, so editing the rules
+    reformats everything on the next run.
+
+    Returns:
+        str: SHA-256 hex digest
+    """
+    return hash_file(__file__)
+
+
+def load_format_hashes(state_file, fingerprint):
+    """
+    Load the post-format content hashes saved by previous runs.
 
     Args:
-        filename (str): Path to the screenplay file
+        state_file (Path): JSON file written by save_format_hashes
+        fingerprint (str): Current formatter_fingerprint()
 
     Returns:
-        bool: True if successful, False otherwise
+        dict: Resolved file path -> {"hash": SHA-256 of its formatted content,
+              "characters": fingerprint of the character registry it was formatted with}
+              (empty if the file is missing, unreadable or from other formatting rules)
     """
     try:
-        with open(filename, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (ValueError, OSError):
+        return {}
+    if not isinstance(state, dict) or state.get("formatter") != fingerprint:
+        return {}
+    return dict(state.get("files", {}))
 
-        formatted = format_screenplay_dialogue(content)
 
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(formatted)
+def save_format_hashes(state_file, fingerprint, hashes):
+    """
+    Save post-format content hashes (atomically).
 
-        return True
+    Args:
+        state_file (Path): JSON file to write
+        fingerprint (str): Current formatter_fingerprint()
+        hashes (dict): Resolved file path -> entry (see load_format_hashes)
+    """
+    state = {"formatter": fingerprint, "files": dict(sorted(hashes.items()))}
+    write_atomic(state_file, json.dumps(state, indent=2).encode('utf-8'))
 
-    except Exception as e:
-        print(f"  Error processing {filename}: {e}")
-        return False
 
+def decode_screenplay(data):
+    """
+    Screenplay text from file contents, with the same newline handling as reading in text mode.
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python format_screenplay_dialogue.py <screenplay_file.txt | directory>")
-        print()
-        print("This script formats dialogue in a screenplay to follow proper TTS-friendly format:")
-        print("- Character names centered (20 space indent)")
-        print("- Dialogue indented (10 space indent)")
-        print("- Parentheticals converted to action lines")
-        print()
-        print("Accepts either a single file or a directory (processes all .txt files recursively)")
-        sys.exit(1)
+    Args:
+        data (bytes): Raw file contents (UTF-8)
 
-    path = sys.argv[1]
+    Returns:
+        str: Text with '\n' line endings
+    """
+    return data.decode('utf-8').replace('\r\n', '\n').replace('\r', '\n')
 
-    # Check if path is a file or directory
-    path_obj = Path(path)
 
-    if not path_obj.exists():
-        print(f"Error: Path '{path}' not found")
-        sys.exit(1)
+def encode_screenplay(content):
+    """
+    File contents for screenplay text, as writing it in text mode would produce.
+
+    Args:
+        content (str): Text with '\n' line endings
+
+    Returns:
+        bytes: UTF-8 encoded contents with the platform's line endings
+    """
+    return content.replace('\n', os.linesep).encode('utf-8')
+
+
+def write_atomic(path, data):
+    """
+    Write data to path through a temp file + rename, keeping the file's permissions.
+
+    Args:
+        path (Path): File to write
+        data (bytes): New contents
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=str(path.parent), prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        if path.exists():
+            os.chmod(temp_path, stat.S_IMODE(os.stat(path).st_mode))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+@dataclass
+class FormatResult:
+    """Outcome of formatting one file"""
+    path: str
+    status: str  # SKIPPED (hash matched), UNCHANGED, CHANGED (or would change with check) or ERROR
+    content_hash: Optional[str] = None  # Hash of the formatted content (None on error)
+    diff: str = ''  # Unified diff of the change (check mode with diffs only)
+    error: str = ''
+
+
+def process_file(filename, known_hash=None, check=False, diff=False, character_names=frozenset()):
+    """
+    Process a single screenplay file.
+
+    The file is only rewritten when formatting changes it, through a temp file and
+    rename, so untouched scenes keep their modification time.
+
+    Args:
+        filename (str): Path to the screenplay file
+        known_hash (str): SHA-256 of this file's content after it was last formatted;
+                          if it still matches, formatting is skipped
+        check (bool): Only report whether the file would change, never write it
+        diff (bool): In check mode, include a unified diff of the change
+        character_names (frozenset): See format_screenplay_dialogue
+
+    Returns:
+        FormatResult: What happened (or would happen) to the file
+    """
+    try:
+        with open(filename, 'rb') as f:
+            data = f.read()
+        content_hash = hashlib.sha256(data).hexdigest()
+        if content_hash == known_hash:
+            return FormatResult(filename, SKIPPED, content_hash)
+
+        content = decode_screenplay(data)
+        formatted = format_screenplay_dialogue(content, character_names)
+        if formatted == content:
+            return FormatResult(filename, UNCHANGED, content_hash)
+
+        formatted_data = encode_screenplay(formatted)
+        formatted_hash = hashlib.sha256(formatted_data).hexdigest()
+        if check:
+            changes = ''
+            if diff:
+                changes = ''.join(difflib.unified_diff(
+                    content.splitlines(keepends=True), formatted.splitlines(keepends=True),
+                    fromfile=filename, tofile=f"{filename} (formatted)"))
+            return FormatResult(filename, CHANGED, None, changes)
+
+        write_atomic(filename, formatted_data)
+        return FormatResult(filename, CHANGED, formatted_hash)
+
+    except Exception as e:
+        return FormatResult(filename, ERROR, error=str(e))
+
 
+def collect_files(paths):
+    """
+    Find the screenplay files to format.
+
+    Args:
+        paths (list): Files and/or directories (searched recursively for .txt files)
+
+    Returns:
+        list: Path of each .txt file, in order, without duplicates
+    """
     files_to_process = []
+    for path in paths:
+        # Check if path is a file or directory
+        path_obj = Path(path)
 
-    if path_obj.is_file():
-        # Single file
-        if path_obj.suffix.lower() == '.txt':
-            files_to_process.append(path_obj)
+        if not path_obj.exists():
+            print(f"Error: Path '{path}' not found")
+            sys.exit(1)
+
+        if path_obj.is_file():
+            # Single file
+            if path_obj.suffix.lower() == '.txt':
+                files_to_process.append(path_obj)
+            else:
+                print(f"Error: File must be a .txt file: {path}")
+                sys.exit(1)
+        elif path_obj.is_dir():
+            # Directory - find all .txt files recursively
+            found = sorted(path_obj.rglob('*.txt'))
+            if not found:
+                print(f"No .txt files found in directory: {path}")
+            files_to_process.extend(found)
         else:
-            print(f"Error: File must be a .txt file")
+            print(f"Error: '{path}' is neither a file nor directory")
             sys.exit(1)
-    elif path_obj.is_dir():
-        # Directory - find all .txt files recursively
-        files_to_process = list(path_obj.rglob('*.txt'))
 
-        if not files_to_process:
-            print(f"No .txt files found in directory: {path}")
-            sys.exit(0)
-    else:
-        print(f"Error: '{path}' is neither a file nor directory")
-        sys.exit(1)
+    unique = {}
+    for file_path in files_to_process:
+        unique.setdefault(os.path.realpath(file_path), file_path)
+    return list(unique.values())
 
-    # Process all files
-    success_count = 0
-    fail_count = 0
 
-    print(f"Processing {len(files_to_process)} file(s)...\n")
+def format_files(files, known_hashes, jobs, check=False, diff=False):
+    """
+    Format files on a pool of worker processes.
 
-    for file_path in files_to_process:
-        print(f"Processing: {file_path}")
-        if process_file(str(file_path)):
-            success_count += 1
-            print(f"  ✓ Successfully formatted")
-        else:
-            fail_count += 1
+    Each file is formatted with the character registry of its movie. Character
+    registries are loaded here, once per movie, and sent to the workers with the files.
+
+    Args:
+        files (list): Paths of the files to format
+        known_hashes (dict): Resolved path -> entry from earlier runs (see load_format_hashes)
+        jobs (int): Number of worker processes (1 = format in this process)
+        check (bool): Only report which files would change
+        diff (bool): In check mode, include unified diffs
+
+    Yields:
+        tuple: (FormatResult, fingerprint of the character registry used), one per file,
+               sorted by path
+    """
+    tasks = []
+    for file_path in files:
+        registry = registry_for_path(file_path)
+        characters = registry.fingerprint if registry else None
+        entry = known_hashes.get(os.path.realpath(file_path))
+        # A stored hash only counts if the file was formatted with the same cast
+        known_hash = entry["hash"] if entry and entry.get("characters") == characters else None
+        tasks.append((str(file_path), known_hash, registry.words if registry else frozenset(), characters))
+    tasks.sort(key=lambda task: task[0])
+
+    if jobs <= 1 or len(tasks) <= 1:
+        for filename, known_hash, character_names, characters in tasks:
+            yield process_file(filename, known_hash, check, diff, character_names), characters
+        return
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(tasks))) as executor:
+        # Results come back in task order, so output doesn't depend on which worker finishes first
+        futures = [(executor.submit(process_file, filename, known_hash, check, diff, character_names), characters)
+                   for filename, known_hash, character_names, characters in tasks]
+        for future, characters in futures:
+            yield future.result(), characters
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Format screenplay dialogue to the TTS-friendly format: character names "
+                    "centered (20 space indent), dialogue indented (10 space indent), "
+                    "parentheticals converted to action lines"
+    )
+    parser.add_argument(
+        "paths",
+        nargs="+",
+        metavar="PATH",
+        help="Screenplay .txt file or directory (all .txt files, recursively); several can be given"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report which files would change, without writing them (exit code 1 if any would)"
+    )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="With --check, also print a unified diff of each change"
+    )
+    parser.add_argument(
+        "-j", "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes to format files on (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--state-file",
+        default=str(DEFAULT_STATE_FILE),
+        help="Where hashes of formatted files are kept, so they are skipped next time "
+             "(default: production/audio/tts_cache/format_hashes.json)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Format every file, ignoring the stored hashes"
+    )
+
+    args = parser.parse_args()
+    if args.diff and not args.check:
+        parser.error("--diff requires --check")
+
+    files_to_process = collect_files(args.paths)
+    if not files_to_process:
+        sys.exit(0)
+
+    state_file = Path(args.state_file)
+    fingerprint = formatter_fingerprint()
+    stored_hashes = load_format_hashes(state_file, fingerprint)
+    known_hashes = {} if args.force else stored_hashes
+    jobs = args.jobs or os.cpu_count() or 1
+
+    action = "Checking" if args.check else "Processing"
+    print(f"{action} {len(files_to_process)} file(s) with {min(jobs, len(files_to_process))} worker(s)...\n")
+
+    counts = {SKIPPED: 0, UNCHANGED: 0, CHANGED: 0, ERROR: 0}
+    new_hashes = dict(stored_hashes)
+    for result, characters in format_files(files_to_process, known_hashes, jobs, args.check, args.diff):
+        counts[result.status] += 1
+        if result.status == ERROR:
+            print(f"  Error processing {result.path}: {result.error}")
+        elif result.status == CHANGED:
+            print(f"  {'Would reformat' if args.check else '✓ Formatted'}: {result.path}")
+            if result.diff:
+                print(result.diff)
+        if result.content_hash:
+            new_hashes[os.path.realpath(result.path)] = {"hash": result.content_hash, "characters": characters}
+
+    # Checking leaves everything as it was, the state file included
+    if not args.check and new_hashes != stored_hashes:
+        try:
+            save_format_hashes(state_file, fingerprint, new_hashes)
+        except OSError as e:
+            print(f"  Warning: could not save {state_file}: {e}")
 
     # Summary
     print(f"\n{'='*60}")
-    print(f"Formatting complete!")
-    print(f"  - {success_count} file(s) successfully formatted")
-    if fail_count > 0:
-        print(f"  - {fail_count} file(s) failed")
-    print(f"\nFormatting applied:")
-    print(f"  - Character names centered (20 space indent)")
-    print(f"  - Dialogue properly indented (10 space indent)")
-    print(f"  - Parentheticals converted to action lines")
-    print(f"  - Lines wrapped to 121 characters (no word chopping)")
+    up_to_date = counts[SKIPPED] + counts[UNCHANGED]
+    if args.check:
+        print(f"Check complete!")
+        print(f"  - {counts[CHANGED]} file(s) would be reformatted")
+        print(f"  - {up_to_date} file(s) already formatted")
+    else:
+        print(f"Formatting complete!")
+        print(f"  - {counts[CHANGED]} file(s) reformatted")
+        print(f"  - {up_to_date} file(s) already formatted "
+              f"({counts[SKIPPED]} skipped by stored hash)")
+    if counts[ERROR] > 0:
+        print(f"  - {counts[ERROR]} file(s) failed")
+    if not args.check:
+        print(f"\nFormatting applied:")
+        print(f"  - Character names centered (20 space indent)")
+        print(f"  - Dialogue properly indented (10 space indent)")
+        print(f"  - Parentheticals converted to action lines")
+        print(f"  - Lines wrapped to 121 characters (no word chopping)")
     print(f"{'='*60}")
 
+    if args.check and (counts[CHANGED] or counts[ERROR]):
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Phoneme Cache for Piper TTS
+Caches espeak phonemization per (text, espeak voice), so it is shared by every voice of a language
+
+Piper turns text into phonemes with espeak-ng before running the voice model. The phonemes
+depend only on the text and the espeak voice (en-us, en-gb-x-rp, ...), not on the model, so
+re-casting a character or re-rendering ACTION lines with another en_US voice reuses them and
+only costs inference.
+
+Entries persist across runs in one append-only JSONL file per espeak voice under
+<cache_dir>/phonemes/piper-<version>/. Files are loaded lazily the first time a voice of that
+language is used; a new entry is a single appended line, so parallel workers can share a file.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from synthesis_cache import normalize_text
+
+try:
+    from piper.config import PhonemeType
+except ImportError:
+    PhonemeType = None
+
+PHONEME_CACHE_SUBDIR = "phonemes"
+
+
+def phonemizer_id(voice) -> Optional[str]:
+    """Name of the phonemizer a Piper voice uses (None if its phonemes are not cacheable)
+
+    Voices share cached phonemes exactly when their ids match.
+    """
+    config = voice.config
+    if PhonemeType is None or config.phoneme_type != PhonemeType.ESPEAK:
+        # Codepoint, pinyin, etc. phonemizers are cheap or voice-specific
+        return None
+    if config.espeak_voice == "ar" and getattr(voice, "use_tashkeel", False):
+        # Diacritization settings live on the voice, not in the espeak voice name
+        return None
+    name = config.espeak_voice
+    if config.vowel_clusters:
+        clusters = json.dumps(sorted(config.vowel_clusters), ensure_ascii=False)
+        name += "-" + hashlib.sha256(clusters.encode('utf-8')).hexdigest()[:8]
+    return name
+
+
+class PhonemeCache:
+    """Phonemes per sentence, keyed by espeak voice and normalized text (memory + optional disk)"""
+
+    def __init__(self, cache_dir: Optional[str] = None, piper_version: str = "unknown"):
+        """Initialize the phoneme cache
+
+        Args:
+            cache_dir: Synthesis cache directory to persist phonemes under (None keeps them
+                       in memory for this process only)
+            piper_version: Installed piper-tts version; each version gets its own files
+        """
+        self.directory = (Path(cache_dir) / PHONEME_CACHE_SUBDIR / f"piper-{piper_version}"
+                          if cache_dir else None)
+        self._entries: Dict[str, Dict[str, List[List[str]]]] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __getstate__(self):
+        # Sent to synthesis workers: they reload entries from disk themselves
+        state = self.__dict__.copy()
+        state["_entries"] = {}
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, phonemizer: str) -> Path:
+        return self.directory / f"{phonemizer}.jsonl"
+
+    def _load(self, phonemizer: str) -> Dict[str, List[List[str]]]:
+        """Entries for one espeak voice, read from disk the first time"""
+        entries = self._entries.get(phonemizer)
+        if entries is not None:
+            return entries
+
+        entries = {}
+        if self.directory:
+            try:
+                with open(self._path(phonemizer), 'r', encoding='utf-8') as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                            entries[entry["text"]] = entry["phonemes"]
+                        except (ValueError, KeyError, TypeError):
+                            # Torn line from an interrupted write
+                            continue
+            except FileNotFoundError:
+                pass
+        self._entries[phonemizer] = entries
+        return entries
+
+    def _append(self, phonemizer: str, text: str, phonemes: List[List[str]]):
+        """Persist one entry (a single write, so concurrent appenders don't interleave)"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        line = json.dumps({"text": text, "phonemes": phonemes}, ensure_ascii=False) + "\n"
+        fd = os.open(self._path(phonemizer), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line.encode('utf-8'))
+        finally:
+            os.close(fd)
+
+    def phonemize(self, voice, text: str) -> List[List[str]]:
+        """Phonemes for each sentence of text, as voice.phonemize(text) returns them
+
+        Args:
+            voice: Loaded PiperVoice (phonemizes on a miss)
+            text: Text to phonemize
+        """
+        phonemizer = phonemizer_id(voice)
+        if phonemizer is None:
+            return voice.phonemize(text)
+
+        key = normalize_text(text)
+        with self._lock:
+            entries = self._load(phonemizer)
+            phonemes = entries.get(key)
+            if phonemes is not None:
+                self.hits += 1
+                return phonemes
+            self.misses += 1
+
+        phonemes = voice.phonemize(text)
+        with self._lock:
+            if key not in entries:
+                entries[key] = phonemes
+                if self.directory:
+                    self._append(phonemizer, key, phonemes)
+        return phonemes
+
+    def summary(self) -> str:
+        """One-line summary of cache activity for end-of-run reporting"""
+        lookups = self.hits + self.misses
+        hit_rate = (100.0 * self.hits / lookups) if lookups else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({hit_rate:.1f}% hit rate)"
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+Render Orchestrator for Piper TTS
+Batch renders of several movies (e.g. the nightly render) sharing one pool of worker processes
+
+Instead of running screenplay_to_tts.py once per movie, the orchestrator plans every scene of
+every requested movie up front, then hands whole scenes to a shared process pool:
+- each movie's character_voices.json is resolved the same way screenplay_to_tts.py does it
+- each target's scenes are parsed in order by one ScreenplayParser, as screenplay_to_tts.py
+  parses a run, and workers render the parsed lines
+- scenes are planned against their manifest (see scene_manifest.py); changed scenes are
+  scheduled first, largest first, and scenes already up to date are skipped
+- Ctrl+C stops handing out scenes and lets the running ones finish (a second Ctrl+C kills
+  the workers); re-running the same command resumes, since finished lines are up to date
+- progress events report scenes and lines done, the measured real-time factor (worker
+  seconds per second of audio) and an ETA for the remaining lines
+
+Output is the same as screenplay_to_tts.py's separate mode (one WAV per line per scene).
+
+Usage:
+    python production/audio/render_orchestrator.py amazingtrash cuberoot hunted --jobs 4
+    python production/audio/render_orchestrator.py "hunted:Act 1" amazingtrash --voice-config hunted=/path/to/character_voices.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from audio_encoders import OUTPUT_FORMATS, audio_duration, get_encoder
+from character_registry import load_registry
+from scene_manifest import SceneManifest, OUTPUT_FILE_PATTERN
+from screenplay_to_tts import (
+    DialogueLine, PiperTTSConverter, ScreenplayParser, find_screenplay_files,
+    movie_acts_dir, movie_audio_dir, movie_voice_config,
+)
+from synthesis_cache import SynthesisCache, DEFAULT_CACHE_SIZE_MB
+from voice_pool import DEFAULT_VOICE_MEMORY_MB
+
+
+@dataclass
+class SceneJob:
+    """One scene to render, with what its manifest says is left to do"""
+    movie: str
+    screenplay_file: Path
+    output_dir: str
+    voice_config: str
+    dialogue_lines: List[DialogueLine]
+    pending_lines: int  # Lines that need synthesizing
+    pending_chars: int  # Characters of text in those lines
+    changed: bool  # Anything to synthesize, rename or prune
+
+    @property
+    def name(self) -> str:
+        return f"{self.movie}/{self.screenplay_file.stem}"
+
+    @property
+    def lines(self) -> int:
+        return len(self.dialogue_lines)
+
+    @property
+    def priority(self) -> Tuple:
+        """Sort key: changed scenes first, then the most text to synthesize"""
+        return (not self.changed, -self.pending_chars)
+
+
+# Converters built in each worker process, by voice config path
+_worker_converters: Dict[str, PiperTTSConverter] = {}
+_worker_settings: Dict = {}
+
+
+def _init_worker(converter_settings: Dict, worker_pids):
+    """Pool initializer: Ctrl+C is handled by the orchestrator, not mid-scene in the workers
+
+    Args:
+        converter_settings: PiperTTSConverter keyword arguments besides the voice config
+        worker_pids: Queue the worker reports its pid on, so an abort can kill it
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _worker_settings.update(converter_settings)
+    worker_pids.put(os.getpid())
+
+
+def _render_scene(voice_config: str, dialogue_lines: List[DialogueLine], output_dir: str,
+                  force: bool) -> Dict:
+    """Render one scene's parsed lines in a worker process
+
+    Returns:
+        Worker pid, seconds spent, the lines, characters and seconds of audio synthesized,
+        and synthesis cache hits/misses
+    """
+    start = time.perf_counter()
+    cache = _worker_settings.get("cache")
+    hits_before, misses_before = (cache.hits, cache.misses) if cache else (0, 0)
+    # The converter's per-scene output would interleave across workers; keep it for errors
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            converter = _worker_converters.get(voice_config)
+            if converter is None:
+                converter = PiperTTSConverter(voice_config_path=voice_config, **_worker_settings)
+                _worker_converters[voice_config] = converter
+
+            rendered = []
+            if dialogue_lines:
+                requests, plan = converter.convert_to_separate_files(dialogue_lines, output_dir, force=force)
+                rendered = [(planned, text) for planned, (_, text) in zip(plan, requests)
+                            if planned.action == "render"]
+    except Exception as e:
+        raise RuntimeError(f"{e}\n{output.getvalue()}") from e
+
+    audio_seconds = sum(audio_duration(os.path.join(output_dir, planned.filename)) or 0.0
+                        for planned, _ in rendered)
+
+    return {
+        "pid": os.getpid(),
+        "seconds": time.perf_counter() - start,
+        "lines": len(rendered),
+        "chars": sum(len(text) for _, text in rendered),
+        "audio_seconds": audio_seconds,
+        "cache_hits": cache.hits - hits_before if cache else 0,
+        "cache_misses": cache.misses - misses_before if cache else 0,
+    }
+
+
+class RenderProgress:
+    """Scene/line counts and an ETA from the real-time factor measured so far"""
+
+    def __init__(self, scenes: List[SceneJob], jobs: int):
+        self.jobs = jobs
+        self.total_scenes = len(scenes)
+        self.total_lines = sum(scene.pending_lines for scene in scenes)
+        self.remaining_chars = sum(scene.pending_chars for scene in scenes)
+        self.done_scenes = 0
+        self.failed_scenes = 0
+        self.done_lines = 0
+        self.done_chars = 0
+        # Summed over workers
+        self.busy_seconds = 0.0
+        self.audio_seconds = 0.0
+        self.start_time = time.perf_counter()
+
+    def scene_finished(self, scene: SceneJob, result: Optional[Dict]):
+        self.remaining_chars -= scene.pending_chars
+        if result is None:
+            self.failed_scenes += 1
+            return
+        self.done_scenes += 1
+        self.done_lines += result["lines"]
+        self.done_chars += result["chars"]
+        self.busy_seconds += result["seconds"]
+        self.audio_seconds += result["audio_seconds"]
+
+    @property
+    def rtf(self) -> Optional[float]:
+        """Worker seconds per second of synthesized audio"""
+        if self.audio_seconds <= 0:
+            return None
+        return self.busy_seconds / self.audio_seconds
+
+    def eta_seconds(self) -> Optional[float]:
+        """Estimated seconds until the remaining lines are rendered (None until measured)"""
+        if self.remaining_chars <= 0:
+            return 0.0
+        if self.rtf is None or self.done_chars <= 0:
+            return None
+        # Remaining text -> seconds of audio, at the audio-per-character rate seen so far
+        remaining_audio = self.remaining_chars * self.audio_seconds / self.done_chars
+        return remaining_audio * self.rtf / self.jobs
+
+    def snapshot(self) -> Dict:
+        eta = self.eta_seconds()
+        rtf = self.rtf
+        return {
+            "scenes_done": self.done_scenes,
+            "scenes_failed": self.failed_scenes,
+            "scenes_total": self.total_scenes,
+            "lines_done": self.done_lines,
+            "lines_total": self.total_lines,
+            "elapsed_seconds": round(time.perf_counter() - self.start_time, 1),
+            "rtf": round(rtf, 4) if rtf is not None else None,
+            "eta_seconds": round(eta, 1) if eta is not None else None,
+        }
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "?"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m"
+    return f"{minutes}m{seconds:02d}s" if minutes else f"{seconds}s"
+
+
+def print_event(event: Dict):
+    """Default progress output: one line per event"""
+    kind = event["event"]
+    if kind == "planned":
+        print(f"Planned {event['scenes_total']} scene(s) to render ({event['lines_total']} lines), "
+              f"{event['up_to_date']} already up to date")
+    elif kind in ("scene_done", "scene_failed"):
+        status = "✓" if kind == "scene_done" else "✗"
+        rtf = f"RTF {event['rtf']:.3f}" if event["rtf"] is not None else "RTF ?"
+        print(f"  {status} {event['scene']} "
+              f"[{event['scenes_done'] + event['scenes_failed']}/{event['scenes_total']} scenes, "
+              f"{event['lines_done']}/{event['lines_total']} lines, {rtf}, "
+              f"ETA {format_duration(event['eta_seconds'])}]")
+        if kind == "scene_failed":
+            print(f"    Error: {event['error']}")
+    elif kind == "cancelling":
+        print(f"\nCancelling: finishing {event['running']} running scene(s); "
+              f"Ctrl+C again to abort (re-run the same command to resume)")
+
+
+class RenderOrchestrator:
+    """Plans scenes across movies and renders them on a shared process pool"""
+
+    def __init__(self, jobs: int, converter_settings: Dict, force: bool = False,
+                 line_by_line: bool = False, on_event: Optional[Callable[[Dict], None]] = None):
+        """Initialize the orchestrator
+
+        Args:
+            jobs: Worker processes (each renders one scene at a time)
+            converter_settings: PiperTTSConverter keyword arguments besides the voice config
+                                (use_cuda, cache, voice_memory_mb, chunk_sentences, output_format)
+            force: Re-synthesize every line, ignoring the scene manifests
+            line_by_line: Parse dialogue blocks line by line (see ScreenplayParser)
+            on_event: Called with each progress event (dicts with an "event" field)
+        """
+        self.jobs = max(1, jobs)
+        self.converter_settings = converter_settings
+        self.force = force
+        self.line_by_line = line_by_line
+        self.on_event = on_event or print_event
+        self.cancelled = False
+        self.aborted = False
+        self.progress: Optional[RenderProgress] = None
+        self._running = 0
+
+    def _emit(self, event: str, **fields):
+        self.on_event({"event": event, **fields})
+
+    def plan_scene(self, converter: PiperTTSConverter, parser: ScreenplayParser, movie: str,
+                   voice_config: str, screenplay_file: Path, output_dir: str) -> SceneJob:
+        """Parse a scene and check it against its manifest
+
+        Args:
+            parser: The target's parser; speaker state carries over from its previous scene,
+                    as in screenplay_to_tts.py
+        """
+        dialogue_lines = parser.parse_file(str(screenplay_file), line_by_line=self.line_by_line)
+        requests, plan = converter.plan_separate_files(dialogue_lines, output_dir, force=self.force)
+        pending = [text for planned, (_, text) in zip(plan, requests) if planned.action == "render"]
+
+        # Renames and orphaned files also need a pass, even with nothing to synthesize
+        changed = bool(pending) or any(planned.action == "rename" for planned in plan)
+        if not changed and dialogue_lines:
+            manifest = SceneManifest(output_dir)
+            wanted = {planned.filename for planned in plan}
+            changed = not manifest.path.exists() or any(
+                OUTPUT_FILE_PATTERN.match(entry.name) and entry.name not in wanted
+                for entry in Path(output_dir).iterdir()
+            )
+
+        return SceneJob(
+            movie=movie,
+            screenplay_file=screenplay_file,
+            output_dir=output_dir,
+            voice_config=voice_config,
+            dialogue_lines=dialogue_lines,
+            pending_lines=len(pending),
+            pending_chars=sum(len(text) for text in pending),
+            changed=changed,
+        )
+
+    def plan(self, targets: List[Tuple[str, Path, str, str]]) -> List[SceneJob]:
+        """Plan every scene of the given (movie, input path, voice config, output dir) targets"""
+        scenes = []
+        for movie, input_path, voice_config, output_root in targets:
+            with contextlib.redirect_stdout(io.StringIO()):
+                converter = PiperTTSConverter(voice_config_path=voice_config,
+                                              output_format=self.converter_settings.get("output_format", "wav"))
+            # One parser per target, like one screenplay_to_tts.py run
+            characters = load_registry(movie)
+            parser = ScreenplayParser(characters=characters if len(characters) else None)
+            for screenplay_file in find_screenplay_files(input_path):
+                output_dir = os.path.join(output_root, screenplay_file.stem)
+                scenes.append(self.plan_scene(converter, parser, movie, voice_config, screenplay_file, output_dir))
+            if parser.unknown_speakers:
+                print(f"Speakers not in the {movie} character registry (default voice): "
+                      f"{', '.join(sorted(parser.unknown_speakers))}")
+        return scenes
+
+    def cancel(self):
+        """Stop handing out scenes; running scenes finish and keep their output"""
+        if not self.cancelled:
+            self.cancelled = True
+            self._emit("cancelling", running=self._running)
+
+    def abort(self):
+        """Kill the workers when the run ends, instead of letting running scenes finish"""
+        self.aborted = True
+
+    async def run(self, scenes: List[SceneJob]) -> RenderProgress:
+        """Render the changed scenes, highest priority first"""
+        pending = sorted((scene for scene in scenes if scene.changed), key=lambda scene: scene.priority)
+        self.progress = RenderProgress(pending, self.jobs)
+        self._emit("planned", up_to_date=len(scenes) - len(pending), **self.progress.snapshot())
+
+        queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        for order, scene in enumerate(pending):
+            queue.put_nowait((scene.priority, order, scene))
+
+        loop = asyncio.get_running_loop()
+        worker_pids = multiprocessing.SimpleQueue()
+        executor = ProcessPoolExecutor(
+            max_workers=min(self.jobs, max(1, len(pending))),
+            initializer=_init_worker,
+            initargs=(self.converter_settings, worker_pids)
+        )
+
+        async def dispatch():
+            while not self.cancelled:
+                try:
+                    _, _, scene = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                self._running += 1
+                self._emit("scene_started", scene=scene.name)
+                try:
+                    result = await loop.run_in_executor(
+                        executor, _render_scene, scene.voice_config, scene.dialogue_lines,
+                        scene.output_dir, self.force
+                    )
+                except Exception as e:
+                    self.progress.scene_finished(scene, None)
+                    self._emit("scene_failed", scene=scene.name, error=str(e).strip(),
+                               **self.progress.snapshot())
+                else:
+                    cache = self.converter_settings.get("cache")
+                    if cache:
+                        # Workers use their own copy of the cache object
+                        cache.count_lookups(result["cache_hits"], result["cache_misses"])
+                    self.progress.scene_finished(scene, result)
+                    self._emit("scene_done", scene=scene.name, lines=result["lines"],
+                               seconds=round(result["seconds"], 3), **self.progress.snapshot())
+                finally:
+                    self._running -= 1
+
+        try:
+            await asyncio.gather(*(dispatch() for _ in range(self.jobs)))
+        finally:
+            if self.aborted:
+                # Workers ignore SIGINT, so they would otherwise finish their scenes first;
+                # lines they already wrote are in their scene manifests
+                executor.shutdown(wait=False, cancel_futures=True)
+                while not worker_pids.empty():
+                    with contextlib.suppress(ProcessLookupError):
+                        os.kill(worker_pids.get(), signal.SIGTERM)
+            else:
+                executor.shutdown(wait=not self.cancelled)
+
+        self._emit("cancelled" if self.cancelled else "done", **self.progress.snapshot())
+        return self.progress
+
+
+def resolve_targets(target_specs: List[str], voice_configs: Dict[str, str],
+                    output_dir: Optional[str]) -> List[Tuple[str, Path, str, str]]:
+    """Turn "movie" / "movie:act path" arguments into (movie, input path, voice config, output dir)
+
+    Input paths and voice configs are resolved the way screenplay_to_tts.py resolves them.
+    """
+    targets = []
+    for spec in target_specs:
+        movie, _, act = spec.partition(":")
+        if act:
+            input_path = Path(act)
+            if not input_path.exists():
+                input_path = movie_acts_dir(movie) / input_path.name
+        else:
+            input_path = movie_acts_dir(movie)
+        if not input_path.exists():
+            raise ValueError(f"Path not found for {spec}: {input_path}")
+
+        voice_config = voice_configs.get(movie)
+        if voice_config is None:
+            voice_config = str(movie_voice_config(movie))
+        if not os.path.exists(voice_config):
+            raise ValueError(f"{movie} voice config not found: {voice_config} "
+                             f"(pass --voice-config {movie}=PATH)")
+
+        if output_dir:
+            output_root = os.path.join(output_dir, movie)
+        else:
+            output_root = str(movie_audio_dir(movie) / "audio_output")
+        targets.append((movie, input_path, os.path.abspath(voice_config), output_root))
+    return targets
+
+
+async def run_orchestrator(orchestrator: RenderOrchestrator,
+                           targets: List[Tuple[str, Path, str, str]]) -> RenderProgress:
+    loop = asyncio.get_running_loop()
+    # Parsing every scene is blocking work; keep the event loop free for signals meanwhile
+    scenes = await loop.run_in_executor(None, orchestrator.plan, targets)
+
+    def on_interrupt():
+        if orchestrator.cancelled:
+            # Second Ctrl+C: abort right away
+            orchestrator.abort()
+            for task in asyncio.all_tasks(loop):
+                task.cancel()
+        else:
+            orchestrator.cancel()
+
+    try:
+        loop.add_signal_handler(signal.SIGINT, on_interrupt)
+    except (NotImplementedError, RuntimeError):
+        pass  # Windows: Ctrl+C aborts immediately
+    return await orchestrator.run(scenes)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render several movies' screenplays to TTS audio on a shared worker pool"
+    )
+    parser.add_argument(
+        "targets",
+        nargs="+",
+        help="Movies to render, as MOVIE or MOVIE:ACT_PATH (e.g. 'hunted', 'amazingtrash:Act 1 - Setup')"
+    )
+    parser.add_argument(
+        "--voice-config",
+        action="append",
+        default=[],
+        metavar="MOVIE=PATH",
+        help="Voice config for a movie (default: found in the movie folder as by screenplay_to_tts.py)"
+    )
+    parser.add_argument(
+        "--output-dir",
+        help="Output root; each movie renders into OUTPUT_DIR/MOVIE (default: each movie's production/audio/audio_output)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=0,
+        help="Worker processes shared by all movies (default: 0 = one per CPU core)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-synthesize every line, ignoring each scene's manifest.json"
+    )
+    parser.add_argument(
+        "--line-by-line",
+        action="store_true",
+        help="Preserve line breaks in dialogue (each line becomes separate audio)"
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Synthesize sentence by sentence (a failing sentence is skipped instead of failing the line)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="wav",
+        help="Output file format: 'wav' (default), lossless 'flac' or compact 'opus' (.ogg)"
+    )
+    parser.add_argument(
+        "--cuda",
+        action="store_true",
+        help="Use CUDA for GPU acceleration (requires onnxruntime-gpu)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Synthesis cache directory (default: production/audio/tts_cache, shared across movies)"
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=float,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f"Synthesis cache size cap in MB (default: {DEFAULT_CACHE_SIZE_MB})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the synthesis cache"
+    )
+    parser.add_argument(
+        "--voice-memory-mb",
+        type=float,
+        default=DEFAULT_VOICE_MEMORY_MB,
+        help=f"Approximate memory budget for loaded voice models, per worker (default: {DEFAULT_VOICE_MEMORY_MB})"
+    )
+    parser.add_argument(
+        "--events",
+        help="Append progress events as JSON lines to this file"
+    )
+
+    args = parser.parse_args()
+
+    voice_configs = {}
+    for entry in args.voice_config:
+        movie, separator, path = entry.partition("=")
+        if not separator:
+            parser.error(f"--voice-config expects MOVIE=PATH, got: {entry}")
+        voice_configs[movie] = path
+
+    try:
+        targets = resolve_targets(args.targets, voice_configs, args.output_dir)
+        get_encoder(args.format)
+    except (ValueError, RuntimeError) as e:
+        parser.error(str(e))
+
+    cache = None
+    if not args.no_cache:
+        cache = SynthesisCache(args.cache_dir, max_size_mb=args.cache_size_mb)
+        print(f"Synthesis cache: {cache.cache_dir}")
+
+    events_file = open(args.events, 'a', encoding='utf-8') if args.events else None
+
+    def on_event(event: Dict):
+        print_event(event)
+        if events_file:
+            events_file.write(json.dumps({"time": round(time.time(), 3), **event}, ensure_ascii=False) + "\n")
+            events_file.flush()
+
+    orchestrator = RenderOrchestrator(
+        args.jobs or os.cpu_count() or 1,
+        dict(use_cuda=args.cuda, cache=cache, voice_memory_mb=args.voice_memory_mb,
+             chunk_sentences=args.chunked, output_format=args.format),
+        force=args.force,
+        line_by_line=args.line_by_line,
+        on_event=on_event,
+    )
+    print(f"Rendering {', '.join(args.targets)} with {orchestrator.jobs} worker(s)...")
+
+    try:
+        progress = asyncio.run(run_orchestrator(orchestrator, targets))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nAborted. Re-run the same command to resume.")
+        sys.exit(130)
+    finally:
+        if events_file:
+            events_file.close()
+
+    print(f"\n{'='*60}")
+    print("Cancelled (re-run the same command to resume)" if orchestrator.cancelled else "Render complete!")
+    print(f"{progress.done_scenes} scene(s) rendered, {progress.failed_scenes} failed, "
+          f"{progress.done_lines} lines synthesized in {format_duration(time.perf_counter() - progress.start_time)}")
+    if progress.rtf is not None:
+        print(f"Real-time factor: {progress.rtf:.3f} (worker seconds per second of audio)")
+    if cache:
+        cache.refresh_size()
+        print(f"Synthesis cache: {cache.summary()}")
+    print(f"{'='*60}")
+    if progress.failed_scenes:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Render Pipeline for Piper TTS
+Runs parse -> synthesize -> post-process -> write as concurrent stages joined by bounded queues
+
+Each stage is a thread pulling items from its input queue, so disk writes and audio
+post-processing overlap with ONNX inference (which releases the GIL) instead of stalling it.
+Queues are bounded, so a slow stage applies backpressure to the stages before it rather than
+letting work pile up in memory. Every stage records its busy time and input queue depth; the
+stage with the highest utilization (and a full queue in front of it) is the bottleneck.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+DEFAULT_QUEUE_SIZE = 8
+
+# Marks the end of the item stream in a queue
+_END = object()
+
+
+class PipelineStage:
+    """One pipeline stage and its statistics"""
+
+    def __init__(self, name: str, fn: Optional[Callable]):
+        self.name = name
+        self.fn = fn
+        self.items = 0
+        self.busy_seconds = 0.0
+        # Input queue depth, sampled every time the stage takes an item
+        self.depth_total = 0
+        self.depth_max = 0
+
+    def record_depth(self, depth: int):
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def process(self, item):
+        start = time.perf_counter()
+        result = self.fn(item)
+        self.busy_seconds += time.perf_counter() - start
+        self.items += 1
+        return result
+
+
+class RenderPipeline:
+    """Threaded stage pipeline with bounded queues between stages
+
+    Items keep their order: every stage is a single thread reading a FIFO queue.
+    Statistics accumulate across runs, so one pipeline can be reused for every scene.
+    """
+
+    def __init__(self, queue_size: int = DEFAULT_QUEUE_SIZE):
+        """Initialize the pipeline
+
+        Args:
+            queue_size: Maximum items waiting in front of each stage (backpressure beyond that)
+        """
+        self.queue_size = queue_size
+        # Stage name -> PipelineStage, in first-seen order
+        self.stages = {}
+        self.wall_seconds = 0.0
+
+    def _stage(self, name: str, fn: Optional[Callable]) -> PipelineStage:
+        stage = self.stages.get(name)
+        if stage is None:
+            stage = PipelineStage(name, fn)
+            self.stages[name] = stage
+        stage.fn = fn
+        return stage
+
+    def run(self, source: Iterable, stages: List[Tuple[str, Callable]], source_name: str = "parse"):
+        """Push every item of source through the stages; returns once the last stage is done
+
+        Args:
+            source: Items to process (pulled in its own thread, e.g. a parser generator)
+            stages: (name, function) pairs; each function maps an item to the next stage's input
+            source_name: Stage name reported for pulling items out of source
+        """
+        source_stage = self._stage(source_name, None)
+        pipeline_stages = [self._stage(name, fn) for name, fn in stages]
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in pipeline_stages]
+
+        stop = threading.Event()
+        errors = []
+
+        def put(target: queue.Queue, item) -> bool:
+            # Blocks while the next stage is behind (backpressure), but gives up if the pipeline failed
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def run_source():
+            try:
+                iterator = iter(source)
+                while True:
+                    start = time.perf_counter()
+                    try:
+                        item = next(iterator)
+                    except StopIteration:
+                        break
+                    source_stage.busy_seconds += time.perf_counter() - start
+                    source_stage.items += 1
+                    if not put(queues[0], item):
+                        return
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+            put(queues[0], _END)
+
+        def run_stage(index: int):
+            stage = pipeline_stages[index]
+            input_queue = queues[index]
+            output_queue = queues[index + 1] if index + 1 < len(queues) else None
+            while True:
+                depth = input_queue.qsize()
+                try:
+                    item = input_queue.get(timeout=0.1)
+                except queue.Empty:
+                    if stop.is_set():
+                        return
+                    continue
+                if item is _END:
+                    if output_queue is not None:
+                        put(output_queue, _END)
+                    return
+                stage.record_depth(depth)
+                try:
+                    result = stage.process(item)
+                except BaseException as e:
+                    errors.append(e)
+                    stop.set()
+                    return
+                if output_queue is not None and not put(output_queue, result):
+                    return
+
+        threads = [threading.Thread(target=run_source, name=f"pipeline-{source_name}", daemon=True)]
+        threads += [
+            threading.Thread(target=run_stage, args=(index,), name=f"pipeline-{stage.name}", daemon=True)
+            for index, stage in enumerate(pipeline_stages)
+        ]
+
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.wall_seconds += time.perf_counter() - start
+
+        if errors:
+            raise errors[0]
+
+    def report(self):
+        """Print per-stage busy time, utilization and queue depth"""
+        print(f"Pipeline stages (queue size {self.queue_size}, {self.wall_seconds:.1f}s wall):")
+        for stage in self.stages.values():
+            utilization = 100.0 * stage.busy_seconds / self.wall_seconds if self.wall_seconds > 0 else 0.0
+            line = (f"  {stage.name:12s} {stage.items:6d} items, {stage.busy_seconds:7.1f}s busy "
+                    f"({utilization:5.1f}%)")
+            if stage.fn is not None and stage.items:
+                line += f", queue depth avg {stage.depth_total / stage.items:.1f} / max {stage.depth_max}"
+            print(line)
+
+
+def run_serially(source: Iterable, stages: List[Tuple[str, Callable]]):
+    """Push every item of source through the stages one at a time on the calling thread"""
+    for item in source:
+        for _, fn in stages:
+            item = fn(item)
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Logging and Tracing for Piper TTS
+Leveled logging for per-line output, plus an optional JSONL trace of per-line timings
+
+Per-line messages (parser decisions, voice lookups, progress) go through the
+"screenplay_tts" logger and are off by default. Call sites check the level once before
+building their f-strings, so disabled levels cost nothing but a flag test:
+- default: per-file headers and summaries only
+- -v (INFO): one progress line per rendered line
+- -vv (DEBUG): parser and voice lookup details
+
+The trace (--trace PATH) appends one JSON object per event to a file, for profiling
+production renders:
+    {"scene": "...", "stage": "synthesize", "ms": 812.4, "line": 57, "speaker": "ADAM", ...}
+Stages are parse, voice_lookup, synthesize and write.
+"""
+
+import json
+import logging
+import sys
+import threading
+import time
+from typing import Iterable, Iterator, Optional
+
+logger = logging.getLogger("screenplay_tts")
+
+# Number of -v flags -> logging level
+VERBOSITY_LEVELS = [logging.WARNING, logging.INFO, logging.DEBUG]
+
+
+def configure_logging(verbosity: int = 0):
+    """Send screenplay_tts log messages to stdout, as plain lines like the rest of the output
+
+    Args:
+        verbosity: 0 = per-line output off, 1 = progress lines, 2 = debug details
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers = [handler]
+    logger.propagate = False
+    logger.setLevel(VERBOSITY_LEVELS[max(0, min(verbosity, len(VERBOSITY_LEVELS) - 1))])
+
+
+class LineTracer:
+    """Appends per-line timing events to a JSONL file (safe to call from pipeline threads)"""
+
+    def __init__(self, path: str):
+        """Open the trace file
+
+        Args:
+            path: JSONL file to append events to
+        """
+        self.path = path
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        # Scene (screenplay file stem) that events are attributed to
+        self.scene: Optional[str] = None
+        self.events = 0
+
+    def event(self, stage: str, seconds: float, **fields):
+        """Record one timed event
+
+        Args:
+            stage: parse, voice_lookup, synthesize or write
+            seconds: Time the stage spent on this line
+            **fields: Extra JSON-serializable fields (line, speaker, voice, ...)
+        """
+        record = {"scene": fields.pop("scene", self.scene), "stage": stage,
+                  "ms": round(seconds * 1000, 3), **fields}
+        line = json.dumps(record, ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.events += 1
+
+    def trace_parse(self, dialogue_lines: Iterable, scene: Optional[str] = None) -> Iterator:
+        """Wrap a parser generator, recording how long each line took to come out of it
+
+        Args:
+            dialogue_lines: Lines from ScreenplayParser.iter_file / iter_lines
+            scene: Scene the lines belong to (default: the tracer's current scene)
+        """
+        iterator = iter(dialogue_lines)
+        while True:
+            start = time.perf_counter()
+            try:
+                line = next(iterator)
+            except StopIteration:
+                return
+            self.event("parse", time.perf_counter() - start,
+                       scene=scene or self.scene, line=line.line_number, speaker=line.speaker)
+            yield line
+
+    def close(self):
+        with self._lock:
+            self._file.close()
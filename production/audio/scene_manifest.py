@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Scene Manifest for incremental TTS rendering
+Tracks which NNNN_SPEAKER.wav in a scene's output folder holds which line, so re-runs only
+synthesize lines that were added, edited or re-voiced
+
+Each output subdirectory (one per screenplay) gets a manifest.json mapping line index to a
+fingerprint of the line's text and voice. On the next run:
+- lines whose file already holds the same fingerprint are kept as-is
+- lines whose fingerprint exists under another file name (e.g. shifted by an inserted line)
+  are renamed instead of re-rendered
+- everything else is synthesized
+- orphaned NNNN_*.wav files no longer in the script are pruned
+"""
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from synthesis_cache import normalize_text
+
+MANIFEST_FILENAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+# Only files matching the converter's naming scheme (in any output format) are ever renamed or pruned
+OUTPUT_FILE_PATTERN = re.compile(r'^\d{4}_.+\.(wav|flac|ogg)$')
+RENAME_SUFFIX = ".renaming"
+
+
+def line_fingerprint(text: str, voice_path: str, settings: Dict, model_hash: Optional[str]) -> str:
+    """Fingerprint of everything that determines a line's audio
+
+    Args:
+        text: Text to synthesize
+        voice_path: Path to the Piper .onnx voice model
+        settings: Synthesis settings that affect the output audio
+        model_hash: Content hash of the voice model, as the synthesis cache keys it
+                    (None if the model is missing)
+    """
+    fingerprint_data = {
+        "text": normalize_text(text),
+        "voice": os.path.realpath(voice_path),
+        "model_hash": model_hash,
+        "settings": settings,
+    }
+    fingerprint_json = json.dumps(fingerprint_data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(fingerprint_json.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class PlannedFile:
+    """What to do for one output line file"""
+    index: int  # 1-based line index
+    filename: str
+    fingerprint: str
+    action: str  # "keep", "rename" or "render"
+    source: Optional[str] = None  # Existing file to rename from (action == "rename")
+
+
+class SceneManifest:
+    """Manifest of line files in one scene's output directory"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = Path(output_dir)
+        self.path = self.output_dir / MANIFEST_FILENAME
+
+    def load(self) -> Dict[str, str]:
+        """Return {filename: fingerprint} for manifest entries whose file still exists"""
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (ValueError, OSError):
+            print(f"Warning: Unreadable manifest {self.path}, re-rendering scene")
+            return {}
+        if manifest.get("version") != MANIFEST_VERSION:
+            return {}
+
+        return {
+            entry["file"]: entry["fingerprint"]
+            for entry in manifest.get("lines", [])
+            if (self.output_dir / entry["file"]).exists()
+        }
+
+    def plan(self, targets: List[Tuple[str, str]], force: bool = False) -> List[PlannedFile]:
+        """Decide which line files to keep, rename or render
+
+        Args:
+            targets: (filename, fingerprint) for each line, in script order
+            force: If True, ignore the manifest and render every line
+        """
+        existing = {} if force else self.load()
+
+        plan = [
+            PlannedFile(index, filename, fingerprint, "render")
+            for index, (filename, fingerprint) in enumerate(targets, 1)
+        ]
+
+        # Files already holding the right audio stay where they are
+        for planned in plan:
+            if existing.get(planned.filename) == planned.fingerprint:
+                planned.action = "keep"
+                del existing[planned.filename]
+
+        # Remaining existing files can be reused under a new name (shifted lines)
+        sources_by_fingerprint: Dict[str, List[str]] = {}
+        for filename, fingerprint in sorted(existing.items()):
+            sources_by_fingerprint.setdefault(fingerprint, []).append(filename)
+
+        for planned in plan:
+            if planned.action != "render":
+                continue
+            sources = sources_by_fingerprint.get(planned.fingerprint)
+            if sources:
+                planned.action = "rename"
+                planned.source = sources.pop(0)
+
+        return plan
+
+    def apply_renames(self, plan: List[PlannedFile]):
+        """Move reused files to their new names (two phases, so names can swap safely)"""
+        renames = [planned for planned in plan if planned.action == "rename"]
+        for planned in renames:
+            os.replace(self.output_dir / planned.source,
+                       self.output_dir / (planned.source + RENAME_SUFFIX))
+        for planned in renames:
+            os.replace(self.output_dir / (planned.source + RENAME_SUFFIX),
+                       self.output_dir / planned.filename)
+
+    def prune(self, plan: List[PlannedFile]) -> List[str]:
+        """Delete line files (and leftover temp files) that are no longer part of the scene"""
+        wanted = {planned.filename for planned in plan}
+        removed = []
+        for entry in sorted(self.output_dir.iterdir()):
+            if not entry.is_file() or entry.name in wanted:
+                continue
+            if OUTPUT_FILE_PATTERN.match(entry.name) or entry.name.endswith(RENAME_SUFFIX):
+                entry.unlink()
+                removed.append(entry.name)
+        return removed
+
+    def save(self, plan: List[PlannedFile], line_info: List[Dict]):
+        """Write the manifest for the files now on disk
+
+        Called before files move (with only the lines that stay put) and again as lines finish,
+        so an interrupted run never trusts a stale entry and keeps every line it completed.
+
+        Args:
+            plan: Planned files already in place, in script order
+            line_info: Extra per-line fields to record (e.g. speaker, voice), same order as plan
+        """
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "lines": [
+                dict(index=planned.index, file=planned.filename, **info, fingerprint=planned.fingerprint)
+                for planned, info in zip(plan, line_info)
+            ],
+        }
+        fd, temp_path = tempfile.mkstemp(dir=str(self.output_dir), suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self.path)
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Scene Pack: single-file audio container for a scene's lines
+One PCM blob per scene plus an offset index, instead of one NNNN_SPEAKER.wav per line
+
+Layout of a .pack file:
+    header   "SCNPACK1", index offset (u64), index length (u64), little-endian
+    PCM      every line's 16-bit mono samples, back to back in script order
+    index    UTF-8 JSON: per line its file name, speaker, voice, sample rate, start/end
+             sample (relative to the start of the PCM blob) and manifest fingerprint
+
+Readers mmap the file and slice any line without copying (ScenePack.pcm / .samples). Lines
+keep their voice's own sample rate, so exporting a line gives back the exact WAV that
+separate mode would have written.
+
+Usage:
+    python production/audio/scene_pack.py list Scene_00_The_Railyard.pack
+    python production/audio/scene_pack.py export Scene_00_The_Railyard.pack Scene_00_The_Railyard/
+"""
+
+import argparse
+import io
+import json
+import mmap
+import os
+import struct
+import tempfile
+import wave
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+PACK_EXTENSION = ".pack"
+PACK_MAGIC = b"SCNPACK1"
+PACK_VERSION = 1
+HEADER = struct.Struct("<8sQQ")
+
+# Piper voices produce 16-bit mono audio
+SAMPLE_WIDTH = 2
+CHANNELS = 1
+
+
+@dataclass(frozen=True)
+class PackedLine:
+    """Index entry for one line in a scene pack"""
+    index: int  # 1-based line index
+    file: str  # File name in separate mode (e.g. 0001_ACTION.wav)
+    speaker: str
+    voice: str  # Voice model file name
+    sample_rate: int
+    start: int  # First sample, relative to the start of the PCM blob
+    end: int  # One past the last sample
+    fingerprint: str  # Line fingerprint (see scene_manifest.line_fingerprint)
+
+    @property
+    def duration(self) -> float:
+        return (self.end - self.start) / self.sample_rate
+
+
+def wav_to_pcm(wav_bytes: bytes) -> Tuple[bytes, int]:
+    """(PCM frames, sample rate) of a 16-bit mono WAV"""
+    with wave.open(io.BytesIO(wav_bytes), 'rb') as wav_file:
+        if wav_file.getsampwidth() != SAMPLE_WIDTH or wav_file.getnchannels() != CHANNELS:
+            raise ValueError("Scene packs hold 16-bit mono audio only")
+        return wav_file.readframes(wav_file.getnframes()), wav_file.getframerate()
+
+
+def pcm_to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    """WAV file bytes for 16-bit mono PCM (same header as Piper's WAV output)"""
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(CHANNELS)
+        wav_file.setsampwidth(SAMPLE_WIDTH)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+class ScenePackWriter:
+    """Streams lines into a new scene pack; the file appears atomically on close()"""
+
+    def __init__(self, path: str):
+        """Start writing a pack
+
+        Args:
+            path: Pack file to create (replaced on close(), left untouched if aborted)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, self._temp_path = tempfile.mkstemp(dir=str(self.path.parent), suffix='.tmp')
+        self._file = os.fdopen(fd, 'wb')
+        self._file.write(HEADER.pack(PACK_MAGIC, 0, 0))
+        self._samples = 0
+        self.lines: List[PackedLine] = []
+
+    def add(self, index: int, file: str, speaker: str, voice: str, fingerprint: str,
+            pcm: bytes, sample_rate: int) -> PackedLine:
+        """Append one line's PCM (lines must be added in script order)"""
+        num_samples = len(pcm) // SAMPLE_WIDTH
+        line = PackedLine(index, file, speaker, voice, sample_rate,
+                          self._samples, self._samples + num_samples, fingerprint)
+        self._file.write(pcm)
+        self._samples += num_samples
+        self.lines.append(line)
+        return line
+
+    def add_wav(self, index: int, file: str, speaker: str, voice: str, fingerprint: str,
+                wav_bytes: bytes) -> PackedLine:
+        """Append one line given as WAV bytes"""
+        pcm, sample_rate = wav_to_pcm(wav_bytes)
+        return self.add(index, file, speaker, voice, fingerprint, pcm, sample_rate)
+
+    def close(self):
+        """Write the index and header, then move the pack into place"""
+        index_json = json.dumps({
+            "version": PACK_VERSION,
+            "sample_width": SAMPLE_WIDTH,
+            "channels": CHANNELS,
+            "lines": [asdict(line) for line in self.lines],
+        }, ensure_ascii=False).encode('utf-8')
+        index_offset = self._file.tell()
+        self._file.write(index_json)
+        self._file.seek(0)
+        self._file.write(HEADER.pack(PACK_MAGIC, index_offset, len(index_json)))
+        self._file.close()
+        os.replace(self._temp_path, self.path)
+
+    def abort(self):
+        """Discard the partially written pack"""
+        self._file.close()
+        os.unlink(self._temp_path)
+
+
+class ScenePack:
+    """Read-only, memory-mapped view of a scene pack"""
+
+    def __init__(self, path: str):
+        """Open and map a pack
+
+        Args:
+            path: Pack file written by ScenePackWriter
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, index_offset, index_length = HEADER.unpack_from(self._mmap, 0)
+        if magic != PACK_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a scene pack: {self.path}")
+        index = json.loads(self._mmap[index_offset:index_offset + index_length].decode('utf-8'))
+        if index.get("version") != PACK_VERSION:
+            self._mmap.close()
+            raise ValueError(f"Unsupported scene pack version {index.get('version')}: {self.path}")
+
+        self.lines: List[PackedLine] = [PackedLine(**entry) for entry in index["lines"]]
+        self._view = memoryview(self._mmap)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+    def by_fingerprint(self) -> Dict[str, PackedLine]:
+        """Lines keyed by fingerprint (the first line wins for repeated fingerprints)"""
+        lines = {}
+        for line in self.lines:
+            lines.setdefault(line.fingerprint, line)
+        return lines
+
+    def pcm(self, line: PackedLine) -> memoryview:
+        """A line's raw PCM bytes, sliced from the mapping without copying"""
+        return self._view[HEADER.size + line.start * SAMPLE_WIDTH:HEADER.size + line.end * SAMPLE_WIDTH]
+
+    def samples(self, line: PackedLine) -> memoryview:
+        """A line's samples as a zero-copy int16 view (numpy.frombuffer works on it too)"""
+        return self.pcm(line).cast('h')
+
+    def wav_bytes(self, line: PackedLine) -> bytes:
+        """A line as a standalone WAV file"""
+        return pcm_to_wav(self.pcm(line), line.sample_rate)
+
+    def export(self, output_dir: str, lines: Optional[List[PackedLine]] = None) -> List[str]:
+        """Write lines (default: all) as the individual WAVs separate mode would have written"""
+        os.makedirs(output_dir, exist_ok=True)
+        written = []
+        for line in self.lines if lines is None else lines:
+            output_path = os.path.join(output_dir, line.file)
+            with open(output_path, 'wb') as f:
+                f.write(self.wav_bytes(line))
+            written.append(output_path)
+        return written
+
+    def close(self):
+        """Unmap the file (views returned by pcm()/samples() must be released first)"""
+        self._view.release()
+        self._mmap.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect scene packs or export them to WAV files")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="Print a pack's line index")
+    list_parser.add_argument("pack", help="Scene pack file")
+
+    export_parser = subparsers.add_parser("export", help="Write a pack's lines as NNNN_SPEAKER.wav files")
+    export_parser.add_argument("pack", help="Scene pack file")
+    export_parser.add_argument("output_dir", nargs="?",
+                               help="Directory for the WAV files (default: next to the pack, named after it)")
+    export_parser.add_argument("--line", type=int, action="append",
+                               help="Only export this line index (repeatable)")
+
+    args = parser.parse_args()
+
+    with ScenePack(args.pack) as pack:
+        if args.command == "list":
+            total = 0.0
+            for line in pack.lines:
+                total += line.duration
+                print(f"  {line.index:4d}  {line.file:<40} {line.voice:<32} "
+                      f"{line.sample_rate:>6} Hz  {line.duration:6.2f}s")
+            print(f"{len(pack)} line(s), {total:.1f}s of audio")
+        else:
+            output_dir = args.output_dir or str(Path(args.pack).with_suffix(""))
+            lines = None
+            if args.line:
+                wanted = set(args.line)
+                lines = [line for line in pack.lines if line.index in wanted]
+            written = pack.export(output_dir, lines)
+            print(f"✓ Exported {len(written)} line(s) to: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,22 +5,80 @@ Converts screenplay text files to audio using Piper TTS with character voice map
 """
 
 import argparse
+import io
+import itertools
 import os
 import sys
 import re
 import wave
 import json
+import logging
+import time
 from pathlib import Path
-from typing import List, Dict, Tuple, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Tuple, Optional, Iterator, Iterable, Callable
+from dataclasses import dataclass, asdict
+
+import numpy as np
 
 try:
-    from piper import PiperVoice
+    from piper import PiperVoice, SynthesisConfig
     from piper.voice import PiperVoice
 except ImportError:
     print("Error: piper-tts not installed. Run: pip install piper-tts")
     sys.exit(1)
 
+from synthesis_cache import SynthesisCache, DEFAULT_CACHE_SIZE_MB, hash_file
+from phoneme_cache import PhonemeCache
+from synthesis_engine import ParallelSynthesisEngine
+from scene_manifest import SceneManifest, PlannedFile, line_fingerprint
+from scene_pack import ScenePack, ScenePackWriter, PACK_EXTENSION
+from audio_encoders import AudioEncoder, WavEncoder, get_encoder, OUTPUT_FORMATS
+from audio_postprocess import PostProcessSettings, ScenePostProcessor, DEFAULT_GAP_MS
+from voice_pool import VoicePool, get_shared_pool, DEFAULT_VOICE_MEMORY_MB
+from render_pipeline import RenderPipeline, run_serially, DEFAULT_QUEUE_SIZE
+from render_trace import logger, configure_logging, LineTracer
+from voice_index import CharacterVoiceIndex, CharacterVoice, normalize_speaker
+from character_registry import (
+    CharacterRegistry, load_registry, NON_CHARACTER_SPEAKERS, PROJECT_ROOT, VOICE_CONFIG_LOCATIONS,
+)
+from format_screenplay_dialogue import (format_screenplay_lines, decode_screenplay, encode_screenplay,
+                                        write_atomic)
+
+
+# Full scale of Piper's float audio in 16-bit PCM (as in piper.voice)
+MAX_WAV_VALUE = 32767.0
+
+# Pause between lines in combined (--combine) and chunked single-voice output
+LINE_PAUSE_MS = DEFAULT_GAP_MS
+
+# Seconds between scene manifest writes while line files are rendered (so an interrupted
+# run loses at most this much finished work)
+MANIFEST_SAVE_SECONDS = 1.0
+
+# Sentence ends (with any closing quote/bracket) followed by whitespace; like espeak, an
+# ellipsis ("just... fun") does not end a sentence
+SENTENCE_BOUNDARY_PATTERN = re.compile(
+    r'(?:(?<=[!?])|(?<=[^.]\.)|(?<=[!?]["\'\)\]])|(?<=[^.]\.["\'\)\]]))\s+'
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentence chunks for chunked synthesis
+
+    Piper already synthesizes (and normalizes) one sentence at a time, so synthesizing the
+    chunks separately and concatenating them gives the same audio as one call.
+    """
+    return [chunk for chunk in (part.strip() for part in SENTENCE_BOUNDARY_PATTERN.split(text)) if chunk]
+
+
+def _piper_version() -> str:
+    """Installed piper-tts version (part of the synthesis cache key)"""
+    try:
+        from importlib.metadata import version
+        return version("piper-tts")
+    except Exception:
+        return "unknown"
+
 
 @dataclass
 class DialogueLine:
@@ -33,19 +91,51 @@ class DialogueLine:
 class ScreenplayParser:
     """Parses screenplay format and extracts dialogue and action lines"""
 
-    # Patterns to identify different screenplay elements
-    # Character headers: ALL CAPS, alphabetic only (no commas/periods), centered with indentation
-    CHARACTER_PATTERN = re.compile(r'^\s*([A-Z][A-Z\s]+?)(?:\s*\([^)]*\))?\s*$')
-    # V.O./O.S. character headers at left margin (not indented)
-    VO_CHARACTER_PATTERN = re.compile(r'^([A-Z][A-Z\s]+?)\s*\((V\.O\.|O\.S\.)\)\s*$')
-    DIALOGUE_PATTERN = re.compile(r'^["\']')
-    SCENE_HEADER_PATTERN = re.compile(r'^(INT\.|EXT\.|SCENE|LOCATION:|FADE)')
-    # Action lines: Start with capital, has lowercase, ends with period OR has comma (character actions)
-    ACTION_PATTERN = re.compile(r'^[A-Z][a-z].*[.,]')
-
-    def __init__(self):
+    # Classifies a stripped line in one match. Alternatives are tried in this order, and the
+    # outer group that matched (lastgroup) names the kind of line:
+    #   vo             V.O./O.S. character header at the left margin, like "LIAM (V.O.)"
+    #   character      character header: ALL CAPS name, optionally one parenthetical without
+    #                  commas/periods (with them, the line is action)
+    #   scene_header   INT./EXT./FADE/etc. - these are ACTION, not NARRATOR
+    #   parenthetical  (stage direction)
+    #   quoted         dialogue starting with a quote
+    #   header_like    character header with commas/periods in its parenthetical ("JOHN (CONT.)");
+    #                  ends V.O. mode rather than being read as V.O. dialogue
+    LINE_PATTERN = re.compile(r'''
+        (?P<vo>(?P<vo_name>[A-Z][A-Z\s]+?)\s*\((?:V\.O\.|O\.S\.)\)\s*$)
+      | (?P<character>(?P<character_name>[A-Z][A-Z\s]+?)(?:\s*\([^),.]*\))?\s*$)
+      | (?P<scene_header>INT\.|EXT\.|SCENE|LOCATION:|FADE)
+      | (?P<parenthetical>\(.*\)$)
+      | (?P<quoted>["'])
+      | (?P<header_like>[A-Z][A-Z\s]+?\s*\([^)]*\)\s*$)
+    ''', re.VERBOSE)
+    # Script start (FULL SCRIPT or SCREENPLAY anywhere in the upper-cased line, so markdown
+    # headers like "## SCREENPLAY" count) and end-of-screenplay markers (upper-cased line)
+    SCRIPT_MARKER_PATTERN = re.compile(r'FULL SCRIPT|SCREENPLAY')
+    END_MARKER_PATTERN = re.compile(r'##? PRODUCTION|PRODUCTION NOTES\Z|## NOTES|## END')
+
+    def __init__(self, characters: Optional[CharacterRegistry] = None):
+        """Initialize the parser
+
+        Args:
+            characters: The movie's character registry; speakers missing from it are
+                        collected in unknown_speakers (parsing itself is unaffected)
+        """
         self.current_speaker = None
         self.in_vo_mode = False  # Track when we're reading V.O. dialogue (left-aligned)
+        self.characters = characters
+        # Speaker -> line number where it was first seen, for speakers not in the registry
+        self.unknown_speakers: Dict[str, int] = {}
+
+    def _check_speaker(self, speaker: str, line_number: int):
+        """Note a speaker missing from the character registry (once per name)"""
+        if speaker in self.characters or speaker in self.unknown_speakers:
+            return
+        if normalize_speaker(speaker) in NON_CHARACTER_SPEAKERS:
+            # The narrator voice speaks as NARRATOR; it isn't a character
+            return
+        self.unknown_speakers[speaker] = line_number
+        logger.debug(f"[DEBUG] Line {line_number}: '{speaker}' is not in the {self.characters.movie} character registry")
 
     def parse_file(self, filepath: str, line_by_line: bool = False) -> List[DialogueLine]:
         """Parse a screenplay file and extract dialogue/action lines
@@ -56,6 +146,31 @@ class ScreenplayParser:
                          If False (default), combine consecutive dialogue lines
                          from same character into single block
         """
+        return list(self.iter_file(filepath, line_by_line=line_by_line))
+
+    def iter_file(self, filepath: str, line_by_line: bool = False) -> Iterator[DialogueLine]:
+        """Parse a screenplay file incrementally, yielding dialogue/action lines as they are found
+
+        The file is read line by line, so memory use stays constant regardless of script length.
+        See parse_file for arguments.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            yield from self.iter_lines(f, line_by_line=line_by_line)
+
+    def iter_lines(self, content: Iterable[str], line_by_line: bool = False) -> Iterator[DialogueLine]:
+        """Parse screenplay text lines (e.g. an open file or sys.stdin), yielding dialogue/action lines
+
+        Each DialogueLine is yielded as soon as its block is complete, so synthesis can start
+        while the rest of the script is still being read. See parse_file for arguments.
+        """
+        # Checked once, so disabled debug logging costs nothing per line
+        debug = logger.isEnabledFor(logging.DEBUG)
+        # Compiled matchers, bound once for the per-line loop
+        classify = self.LINE_PATTERN.match
+        script_marker = self.SCRIPT_MARKER_PATTERN.search
+        end_marker = self.END_MARKER_PATTERN.match
+
+        # Finished lines waiting to be yielded
         lines = []
         script_started = False
 
@@ -71,22 +186,26 @@ class ScreenplayParser:
                 combined_text = ' '.join(pending_dialogue_lines)
                 # Normalize whitespace: collapse multiple spaces into one
                 combined_text = ' '.join(combined_text.split())
-                print(f"[DEBUG] Line {pending_dialogue_start_line}: Combined dialogue for '{self.current_speaker}': {combined_text[:50]}...")
+                if debug:
+                    logger.debug(f"[DEBUG] Line {pending_dialogue_start_line}: Combined dialogue for '{self.current_speaker}': {combined_text[:50]}...")
                 lines.append(DialogueLine(self.current_speaker, combined_text, pending_dialogue_start_line))
                 pending_dialogue_lines = []
                 pending_dialogue_start_line = None
 
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.readlines()
-
         for i, line in enumerate(content, 1):
+            # Hand out lines finished while processing the previous input line
+            if lines:
+                yield from lines
+                lines.clear()
+
             stripped = line.strip()
+            upper = stripped.upper()
 
             # Check if we've reached the script marker (FULL SCRIPT or SCREENPLAY)
-            # Handle markdown headers like "## SCREENPLAY" or plain "SCREENPLAY"
-            if "FULL SCRIPT" in stripped.upper() or "SCREENPLAY" in stripped.upper():
+            if script_marker(upper):
                 script_started = True
-                print(f"[DEBUG] Found script marker at line {i}: {stripped[:50]}")
+                if debug:
+                    logger.debug(f"[DEBUG] Found script marker at line {i}: {stripped[:50]}")
                 continue
 
             # Skip everything before script marker
@@ -94,72 +213,71 @@ class ScreenplayParser:
                 continue
 
             # Stop parsing at end-of-screenplay markers
-            if stripped.upper().startswith("## PRODUCTION") or \
-               stripped.upper().startswith("# PRODUCTION") or \
-               stripped.upper() == "PRODUCTION NOTES" or \
-               stripped.upper().startswith("## NOTES") or \
-               stripped.upper().startswith("## END"):
-                print(f"[DEBUG] Found end marker at line {i}: {stripped[:50]}, stopping parse")
+            if end_marker(upper):
+                if debug:
+                    logger.debug(f"[DEBUG] Found end marker at line {i}: {stripped[:50]}, stopping parse")
                 break
 
             # Skip empty lines and separators
-            if not stripped or stripped.startswith('===') or stripped.startswith('---'):
+            if not stripped or stripped.startswith(('===', '---')):
                 continue
 
-            # Check for V.O./O.S. character (left-aligned, like "LIAM (V.O.)")
-            vo_match = self.VO_CHARACTER_PATTERN.match(stripped)
-            if vo_match:
+            # One match classifies the line (see LINE_PATTERN)
+            match = classify(stripped)
+            kind = match.lastgroup if match else None
+
+            if kind == 'vo':
                 # Flush any pending dialogue before switching speakers
                 if not line_by_line:
                     flush_pending_dialogue()
 
-                self.current_speaker = vo_match.group(1).strip()
+                self.current_speaker = match.group('vo_name').strip()
                 self.in_vo_mode = True  # Next lines are V.O. dialogue (not indented)
-                print(f"[DEBUG] Line {i}: Found V.O. character: '{self.current_speaker}'")
+                if self.characters is not None:
+                    self._check_speaker(self.current_speaker, i)
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Found V.O. character: '{self.current_speaker}'")
                 continue
 
-            # Check for regular character name (centered/indented)
-            # Character headers have NO punctuation (commas, periods) - those are action lines
-            char_match = self.CHARACTER_PATTERN.match(stripped)
-            # Remove V.O./O.S. annotations before checking for punctuation
-            stripped_for_punct_check = re.sub(r'\s*\((V\.O\.|O\.S\.)\)\s*$', '', stripped)
-            if char_match and ',' not in stripped_for_punct_check and '.' not in stripped_for_punct_check:
+            if kind == 'character':
                 # Flush any pending dialogue before switching speakers
                 if not line_by_line:
                     flush_pending_dialogue()
 
-                self.current_speaker = char_match.group(1).strip()
+                self.current_speaker = match.group('character_name').strip()
                 self.in_vo_mode = False  # Regular dialogue is indented
-                print(f"[DEBUG] Line {i}: Found character: '{self.current_speaker}'")
+                if self.characters is not None:
+                    self._check_speaker(self.current_speaker, i)
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Found character: '{self.current_speaker}'")
                 continue
 
-            # Check for scene headers (INT./EXT./FADE/etc) - these are ACTION, not NARRATOR
-            if self.SCENE_HEADER_PATTERN.match(stripped):
+            if kind == 'scene_header':
                 # Flush any pending dialogue before action line
                 if not line_by_line:
                     flush_pending_dialogue()
 
-                print(f"[DEBUG] Line {i}: Scene header (ACTION): {stripped[:50]}...")
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Scene header (ACTION): {stripped[:50]}...")
                 lines.append(DialogueLine("ACTION", stripped, i))
                 self.current_speaker = None  # Reset after scene header
                 continue
 
-            # Check for parentheticals (character actions in dialogue)
-            if stripped.startswith('(') and stripped.endswith(')'):
+            if kind == 'parenthetical':
                 continue  # Skip stage directions
 
             # Check if line is indented (dialogue in screenplay format)
-            is_indented = line.startswith(' ') or line.startswith('\t')
+            is_indented = line.startswith((' ', '\t'))
 
-            # Check for dialogue (lines starting with quotes)
-            if self.DIALOGUE_PATTERN.match(stripped):
+            if kind == 'quoted':
                 speaker = self.current_speaker or "ACTION"
                 # Remove quotes
                 text = stripped.strip('"\'')
 
                 if line_by_line:
                     # Old behavior: separate line for each
-                    print(f"[DEBUG] Line {i}: Quoted dialogue for '{speaker}': {text[:50]}...")
+                    if debug:
+                        logger.debug(f"[DEBUG] Line {i}: Quoted dialogue for '{speaker}': {text[:50]}...")
                     lines.append(DialogueLine(speaker, text, i))
                 else:
                     # New behavior: accumulate
@@ -169,10 +287,11 @@ class ScreenplayParser:
                 continue
 
             # If line is indented and we have a current speaker, it's dialogue continuation
-            if is_indented and self.current_speaker and len(stripped) > 0:
+            if is_indented and self.current_speaker:
                 if line_by_line:
                     # Old behavior: separate line for each
-                    print(f"[DEBUG] Line {i}: Dialogue for '{self.current_speaker}': {stripped[:50]}...")
+                    if debug:
+                        logger.debug(f"[DEBUG] Line {i}: Dialogue for '{self.current_speaker}': {stripped[:50]}...")
                     lines.append(DialogueLine(self.current_speaker, stripped, i))
                 else:
                     # New behavior: accumulate
@@ -183,11 +302,12 @@ class ScreenplayParser:
 
             # V.O. dialogue: non-indented lines after a V.O. character header
             # These look like action but are actually dialogue (e.g., "After Zaroff, I knew...")
-            if self.in_vo_mode and self.current_speaker and not is_indented and len(stripped) > 0:
-                # Check if this looks like a new character or scene header
-                if not self.VO_CHARACTER_PATTERN.match(stripped) and not self.CHARACTER_PATTERN.match(stripped):
+            if self.in_vo_mode and self.current_speaker and not is_indented:
+                # Check if this looks like a new character
+                if kind != 'header_like':
                     if line_by_line:
-                        print(f"[DEBUG] Line {i}: V.O. dialogue for '{self.current_speaker}': {stripped[:50]}...")
+                        if debug:
+                            logger.debug(f"[DEBUG] Line {i}: V.O. dialogue for '{self.current_speaker}': {stripped[:50]}...")
                         lines.append(DialogueLine(self.current_speaker, stripped, i))
                     else:
                         if not pending_dialogue_lines:
@@ -199,26 +319,25 @@ class ScreenplayParser:
                     self.in_vo_mode = False
 
             # Check for action lines (scene descriptions) - non-indented only
-            # Action lines: start with capital, contain lowercase OR all caps with punctuation
+            # Action lines: start with a capital and have punctuation
             # Examples: "Marcus turns, annoyed." or "MARCUS turns, annoyed." or "Josh, suddenly lucid, sharp."
-            if not is_indented and stripped and stripped[0].isupper():
-                # Check if it matches action pattern OR has punctuation (likely an action line)
-                if self.ACTION_PATTERN.match(stripped) or (',' in stripped or '.' in stripped):
-                    # Flush any pending dialogue before action line
-                    if not line_by_line:
-                        flush_pending_dialogue()
-
-                    print(f"[DEBUG] Line {i}: Action description: {stripped[:50]}...")
-                    lines.append(DialogueLine("ACTION", stripped, i))
-                    self.current_speaker = None  # Reset after action line
-                    self.in_vo_mode = False  # Exit V.O. mode on action line
-                    continue
+            if not is_indented and stripped[0].isupper() and (',' in stripped or '.' in stripped):
+                # Flush any pending dialogue before action line
+                if not line_by_line:
+                    flush_pending_dialogue()
+
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Action description: {stripped[:50]}...")
+                lines.append(DialogueLine("ACTION", stripped, i))
+                self.current_speaker = None  # Reset after action line
+                self.in_vo_mode = False  # Exit V.O. mode on action line
+                continue
 
         # Flush any remaining dialogue at end of file
         if not line_by_line:
             flush_pending_dialogue()
 
-        return lines
+        yield from lines
 
 
 class PiperTTSConverter:
@@ -226,17 +345,70 @@ class PiperTTSConverter:
 
     def __init__(self, voice_model_path: Optional[str] = None,
                  voice_config_path: Optional[str] = None,
-                 use_cuda: bool = False):
+                 use_cuda: bool = False,
+                 cache: Optional[SynthesisCache] = None,
+                 voice_pool: Optional[VoicePool] = None,
+                 voice_memory_mb: Optional[float] = None,
+                 chunk_sentences: bool = False,
+                 output_format: str = "wav",
+                 phoneme_cache: Optional[PhonemeCache] = None,
+                 syn_config: Optional[SynthesisConfig] = None):
         """Initialize the TTS converter
 
+        Voice models are not loaded here; each one is loaded from the voice pool the first
+        time a line needs it.
+
         Args:
             voice_model_path: Path to single Piper .onnx voice model (for single-voice mode)
             voice_config_path: Path to JSON config mapping characters to voice models
             use_cuda: Enable GPU acceleration (requires onnxruntime-gpu)
+            cache: Synthesis cache to reuse audio for unchanged lines (None disables caching)
+            voice_pool: Pool to load voices from (default: the process-wide shared pool)
+            voice_memory_mb: Memory budget to set on the shared pool (None keeps its current budget)
+            chunk_sentences: Synthesize text sentence by sentence (bounded memory, per-sentence
+                             caching, and a failing sentence is skipped instead of failing the line)
+            output_format: Output file format: 'wav', 'flac' or 'opus' (see audio_encoders.py)
+            phoneme_cache: Phonemes shared across voices (default: one stored with the synthesis
+                           cache, or kept in memory without one)
+            syn_config: Piper synthesis config (speaker, length/noise scales, volume,
+                        normalization; default: piper's defaults)
         """
         self.use_cuda = use_cuda
-        self.voices: Dict[str, PiperVoice] = {}
+        self.voice_pool = voice_pool or get_shared_pool(use_cuda, max_memory_mb=voice_memory_mb)
+        # Voice model paths that exist on disk (loaded lazily through the pool)
+        self.available_voice_paths: List[str] = []
         self.character_voice_map: Dict[str, str] = {}
+        # Model names from the config ("model" field), by character
+        self.character_models: Dict[str, Optional[str]] = {}
+        self.cache = cache
+        # Voice model content hashes without a cache: {path: (size, mtime_ns, sha256)}
+        self._model_hashes: Dict[str, Tuple[int, int, str]] = {}
+        self.chunk_sentences = chunk_sentences
+        # Writes output files; synthesis and the cache always work in WAV
+        self.encoder: type = get_encoder(output_format)
+        # Parallel synthesis engine (None = synthesize serially in this process)
+        self.engine = None
+        # Staged render pipeline (None = run parse/synthesize/post-process/write one line at a time)
+        self.pipeline: Optional[RenderPipeline] = None
+        # Lines per voice-grouped synthesis batch (0 = synthesize in script order)
+        self.batch_size = 0
+        # JSONL trace of per-line timings (None = tracing off)
+        self.tracer: Optional[LineTracer] = None
+        # Trimming, loudness matching, gaps and sample rate of combined output
+        self.postprocess_settings = PostProcessSettings()
+        # Combined output: lines resampled to the scene's rate, and the time it took (all scenes)
+        self.resampled_lines = 0
+        self.resample_seconds = 0.0
+        # Everything besides text and voice model that affects the synthesized audio
+        self.syn_config = syn_config or SynthesisConfig()
+        self.synthesis_settings = {
+            "piper_version": _piper_version(),
+            "syn_config": asdict(self.syn_config),
+        }
+        # Text -> phonemes is done once per espeak voice; only inference runs per voice model
+        self.phoneme_cache = phoneme_cache or PhonemeCache(
+            str(cache.cache_dir) if cache else None, self.synthesis_settings["piper_version"]
+        )
 
         if voice_config_path:
             # Multi-voice mode: load character-to-voice mapping
@@ -245,12 +417,24 @@ class PiperTTSConverter:
             # Single-voice mode: use one voice for all characters
             if not os.path.exists(voice_model_path):
                 raise FileNotFoundError(f"Voice model not found: {voice_model_path}")
-            print(f"Loading voice model: {voice_model_path}")
-            self.default_voice = PiperVoice.load(voice_model_path, use_cuda=use_cuda)
-            self.voices["_default"] = self.default_voice
+            print(f"Using voice model: {voice_model_path}")
+            self.default_voice_path = voice_model_path
+            self.available_voice_paths = [voice_model_path]
         else:
             raise ValueError("Must provide either voice_model_path or voice_config_path")
 
+        # Speaker -> voice lookups for every line go through this index
+        self._reported_speakers = set()
+        self.voice_index = CharacterVoiceIndex(
+            self.character_voice_map, self.character_models,
+            self.available_voice_paths, self.default_voice_path
+        )
+
+    @property
+    def default_voice(self) -> PiperVoice:
+        """Default voice (loaded on first use)"""
+        return self.voice_pool.get(self.default_voice_path)
+
     def _load_voice_config(self, config_path: str):
         """Load character-to-voice mapping from JSON config"""
         if not os.path.exists(config_path):
@@ -270,6 +454,7 @@ class PiperTTSConverter:
             # Handle both formats: plain string or dict with "voice" key
             if isinstance(value, dict):
                 voice_path = value.get("voice", "")
+                self.character_models[char] = value.get("model")
             else:
                 voice_path = value
 
@@ -292,77 +477,346 @@ class PiperTTSConverter:
                 resolved_path = voice_path
             self.character_voice_map[char] = resolved_path
 
-        print(f"Loading voice models from config: {config_path}")
-        print(f"[DEBUG] Character mappings in config (resolved paths):")
-        for char, voice_path in self.character_voice_map.items():
-            exists = os.path.exists(voice_path)
-            status = "EXISTS" if exists else "NOT FOUND"
-            print(f"[DEBUG]   '{char}' -> {voice_path} [{status}]")
+        print(f"Loading voice config: {config_path}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"[DEBUG] Character mappings in config (resolved paths):")
+            for char, voice_path in self.character_voice_map.items():
+                exists = os.path.exists(voice_path)
+                status = "EXISTS" if exists else "NOT FOUND"
+                logger.debug(f"[DEBUG]   '{char}' -> {voice_path} [{status}]")
 
-        # Get unique voice model paths
-        unique_voices = set(self.character_voice_map.values())
-
-        # Load each unique voice model
-        for voice_path in unique_voices:
+        # Unique voice model paths that exist (models are loaded on first use)
+        for voice_path in dict.fromkeys(self.character_voice_map.values()):
             if not os.path.exists(voice_path):
                 print(f"Warning: Voice model not found: {voice_path}, skipping...")
                 continue
-
-            print(f"  Loading: {os.path.basename(voice_path)}")
-            self.voices[voice_path] = PiperVoice.load(voice_path, use_cuda=self.use_cuda)
+            self.available_voice_paths.append(voice_path)
 
         # Set default voice
         if "_default" in self.character_voice_map:
             default_path = self.character_voice_map["_default"]
-            if default_path in self.voices:
-                self.default_voice = self.voices[default_path]
+            if default_path in self.available_voice_paths:
+                self.default_voice_path = default_path
             else:
                 # Default voice file doesn't exist, fallback to first available
-                if self.voices:
-                    self.default_voice = next(iter(self.voices.values()))
-                    print(f"Warning: Default voice not found, using {list(self.voices.keys())[0]}")
+                if self.available_voice_paths:
+                    self.default_voice_path = self.available_voice_paths[0]
+                    print(f"Warning: Default voice not found, using {self.default_voice_path}")
                 else:
-                    raise ValueError("No valid voice models loaded. Check voice paths in character_voices.json")
+                    raise ValueError("No valid voice models found. Check voice paths in character_voices.json")
         else:
-            # Use first loaded voice as default
-            if self.voices:
-                self.default_voice = next(iter(self.voices.values()))
+            # Use first available voice as default
+            if self.available_voice_paths:
+                self.default_voice_path = self.available_voice_paths[0]
+            else:
+                raise ValueError("No valid voice models found. Check voice paths in character_voices.json")
+
+    def _get_voice_path_for_character(self, character: str) -> str:
+        """Get the voice model path for a character (without loading the model)"""
+        return self._lookup_voice(character).voice_path
+
+    def _lookup_voice(self, character: str) -> CharacterVoice:
+        """Resolve a speaker through the voice index (a single dictionary access for known speakers)"""
+        entry = self.voice_index.lookup(character)
+        if not entry.configured and character not in self._reported_speakers:
+            # Logged once per speaker rather than on every line
+            self._reported_speakers.add(character)
+            if self.character_voice_map:
+                logger.debug(f"[VOICE] '{character}' -> NOT IN CONFIG, using default {entry.voice_name}")
             else:
-                raise ValueError("No valid voice models loaded. Check voice paths in character_voices.json")
+                logger.debug(f"[VOICE] '{character}' -> default (single-voice mode)")
+        return entry
 
     def _get_voice_for_character(self, character: str) -> PiperVoice:
-        """Get the appropriate voice model for a character"""
-        if not self.character_voice_map:
-            # Single-voice mode
-            print(f"[VOICE] '{character}' -> default (single-voice mode)")
-            return self.default_voice
-
-        # Multi-voice mode: lookup character
-        voice_path = self.character_voice_map.get(character)
-        if voice_path:
-            if voice_path in self.voices:
-                print(f"[VOICE] '{character}' -> {os.path.basename(voice_path)}")
-                return self.voices[voice_path]
-            else:
-                # Path in map but not in loaded voices - check why
-                print(f"[VOICE] '{character}' -> path '{voice_path}' NOT in self.voices keys!")
-                print(f"[VOICE]   Available keys: {list(self.voices.keys())}")
-                return self.default_voice
+        """Get the appropriate voice model for a character (loaded on first use)"""
+        return self.voice_pool.get(self._get_voice_path_for_character(character))
+
+    def _model_hash(self, voice_path: str) -> Optional[str]:
+        """Content hash of a voice model, the same one the synthesis cache keys lines by
+
+        Args:
+            voice_path: Path to the Piper .onnx voice model
+
+        Returns:
+            SHA-256 of the model file, or None if it doesn't exist
+        """
+        resolved_path = os.path.realpath(voice_path)
+        try:
+            if self.cache:
+                return self.cache.model_hash(resolved_path)
+            stat = os.stat(resolved_path)
+        except OSError:
+            return None
+
+        cached = self._model_hashes.get(resolved_path)
+        if not cached or cached[:2] != (stat.st_size, stat.st_mtime_ns):
+            cached = (stat.st_size, stat.st_mtime_ns, hash_file(resolved_path))
+            self._model_hashes[resolved_path] = cached
+        return cached[2]
+
+    def _synthesize(self, voice_path: str, text: str) -> bytes:
+        """Synthesize text to WAV bytes, reusing cached audio when the line is unchanged
+
+        Args:
+            voice_path: Path to the Piper .onnx voice model (loaded from the pool on a cache miss)
+            text: Text to synthesize
+        """
+        key = None
+        if self.cache:
+            key = self.cache.make_key(text, voice_path, self.synthesis_settings)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        wav_bytes = self._infer_wav(self.voice_pool.get(voice_path), text)
+        if key:
+            self.cache.put(key, wav_bytes)
+        return wav_bytes
+
+    def _infer_wav(self, voice: PiperVoice, text: str) -> bytes:
+        """Run a voice model on the (cached) phonemes of text, giving the WAV synthesize_wav writes
+
+        Mirrors PiperVoice.synthesize with the converter's synthesis config: each sentence is
+        inferred on its own, normalized and scaled by volume if configured, and converted to
+        16-bit PCM.
+        """
+        syn_config = self.syn_config
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav_file:
+            params_set = False
+            for phonemes in self.phoneme_cache.phonemize(voice, text):
+                if not phonemes:
+                    continue
+                audio = voice.phoneme_ids_to_audio(voice.phonemes_to_ids(phonemes), syn_config)
+                if syn_config.normalize_audio:
+                    max_val = np.max(np.abs(audio))
+                    audio = np.zeros_like(audio) if max_val < 1e-8 else audio / max_val
+                if syn_config.volume != 1.0:
+                    audio = audio * syn_config.volume
+                audio = np.clip(audio, -1.0, 1.0).astype(np.float32)
+                if not params_set:
+                    wav_file.setframerate(voice.config.sample_rate)
+                    wav_file.setsampwidth(2)
+                    wav_file.setnchannels(1)
+                    params_set = True
+                wav_file.writeframes(
+                    np.clip(audio * MAX_WAV_VALUE, -MAX_WAV_VALUE, MAX_WAV_VALUE).astype(np.int16).tobytes()
+                )
+        return buffer.getvalue()
+
+    def _build_requests(self, dialogue_lines: List[DialogueLine], output_kind: str,
+                        narrator_prefix: bool = False) -> List[Tuple[str, str]]:
+        """Turn dialogue lines into (voice_path, text) synthesis requests
+
+        Args:
+            dialogue_lines: List of dialogue lines
+            output_kind: 'separate' (one request per line, raw text), 'multi' (one request
+                         per line, optionally prefixed) or 'single' (one request, all text
+                         joined for the default voice)
+            narrator_prefix: If True, prefix dialogue with speaker name
+        """
+        if output_kind == "single":
+            # Join all text with pauses
+            texts = [self._line_text(line, narrator_prefix) for line in dialogue_lines]
+            return [(self.default_voice_path, ". ... ".join(texts))]
+
+        return [self._build_request(line, output_kind, narrator_prefix) for line in dialogue_lines]
+
+    def _line_text(self, line: DialogueLine, narrator_prefix: bool = False) -> str:
+        """Text to speak for a line, optionally prefixed with the speaker name"""
+        if narrator_prefix and line.speaker != "ACTION":
+            return f"{line.speaker} says: {line.text}"
+        return line.text
+
+    def _build_request(self, line: DialogueLine, output_kind: str,
+                       narrator_prefix: bool = False) -> Tuple[str, str]:
+        """(voice_path, text) synthesis request for one line ('separate' or 'multi')"""
+        text = line.text if output_kind == "separate" else self._line_text(line, narrator_prefix)
+        if not self.tracer:
+            return self._lookup_voice(line.speaker).voice_path, text
+
+        start = time.perf_counter()
+        entry = self._lookup_voice(line.speaker)
+        self.tracer.event("voice_lookup", time.perf_counter() - start,
+                          line=line.line_number, speaker=line.speaker, voice=entry.voice_name)
+        return entry.voice_path, text
+
+    def _synthesize_line(self, line: DialogueLine, voice_path: str, text: str) -> bytes:
+        """_synthesize for one dialogue line, recording a trace event when tracing"""
+        if not self.tracer:
+            return self.synthesize_text(voice_path, text)
+
+        hits_before = self.cache.hits if self.cache else 0
+        start = time.perf_counter()
+        wav_bytes = self.synthesize_text(voice_path, text)
+        self.tracer.event("synthesize", time.perf_counter() - start,
+                          line=line.line_number, speaker=line.speaker, voice=os.path.basename(voice_path),
+                          chars=len(text), cache_hit=(self.cache.hits > hits_before) if self.cache else None)
+        return wav_bytes
+
+    def _trace_write(self, line: DialogueLine, start: float, num_bytes: int):
+        """Record a write event for a line whose output write began at start (perf_counter)"""
+        self.tracer.event("write", time.perf_counter() - start,
+                          line=line.line_number, speaker=line.speaker, bytes=num_bytes)
+
+    def _synthesize_lines(self, dialogue_lines: Iterable[DialogueLine], output_kind: str,
+                          narrator_prefix: bool = False) -> Iterator[Tuple[DialogueLine, str, bytes]]:
+        """Synthesize lines on the parallel engine, yielding (line, voice_path, WAV bytes) in script order
+
+        The engine needs the whole batch up front, so the lines are collected first.
+        """
+        dialogue_lines = list(dialogue_lines)
+        requests = self._build_requests(dialogue_lines, output_kind, narrator_prefix)
+        audio = self.engine.map(requests)
+        for line, (voice_path, _), wav_bytes in zip(dialogue_lines, requests, audio):
+            yield line, voice_path, wav_bytes
+
+    def _run_stages(self, source: Iterable, stages: List[Tuple[str, Callable]]):
+        """Push items through per-line stages, concurrently when a render pipeline is attached"""
+        if self.pipeline:
+            self.pipeline.run(source, stages)
+        else:
+            run_serially(source, stages)
+
+    def _render_lines(self, dialogue_lines: Iterable[DialogueLine], output_kind: str,
+                      narrator_prefix: bool, stages: List[Tuple[str, Callable]]):
+        """Synthesize lines in script order and pass each (line, voice_path, WAV bytes) through stages
+
+        Serially, each line is synthesized as soon as the parser yields it. With the parallel
+        engine, synthesis happens in the worker pool and the stages consume its results.
+        """
+        if self.engine:
+            self._run_stages(self._synthesize_lines(dialogue_lines, output_kind, narrator_prefix), stages)
+            return
+        if self.batch_size:
+            self._run_stages(self._synthesize_batched(dialogue_lines, output_kind, narrator_prefix), stages)
+            return
+
+        def synthesize(line: DialogueLine) -> Tuple[DialogueLine, str, bytes]:
+            voice_path, text = self._build_request(line, output_kind, narrator_prefix)
+            return line, voice_path, self._synthesize_line(line, voice_path, text)
+
+        self._run_stages(dialogue_lines, [("synthesize", synthesize)] + stages)
+
+    def _synthesize_grouped(self, lines: List[DialogueLine],
+                            requests: List[Tuple[str, str]]) -> List[bytes]:
+        """Synthesize a batch of lines grouped by voice, returning WAV bytes in the original order
+
+        Each voice's lines run back to back on one warm ONNX session instead of alternating
+        sessions line by line. Voices already loaded in the pool go first, so a batch never
+        unloads a model it is about to need again.
+        """
+        indices_by_voice: Dict[str, List[int]] = {}
+        for index, (voice_path, _) in enumerate(requests):
+            indices_by_voice.setdefault(voice_path, []).append(index)
+
+        audio: List[Optional[bytes]] = [None] * len(requests)
+        for voice_path in sorted(indices_by_voice, key=lambda path: not self.voice_pool.is_loaded(path)):
+            for index in indices_by_voice[voice_path]:
+                audio[index] = self._synthesize_line(lines[index], voice_path, requests[index][1])
+        return audio
+
+    def _synthesize_batched(self, dialogue_lines: Iterable[DialogueLine], output_kind: str,
+                            narrator_prefix: bool = False) -> Iterator[Tuple[DialogueLine, str, bytes]]:
+        """Synthesize lines batch_size at a time grouped by voice, yielding (line, voice_path, WAV bytes)
+        in script order
+
+        Only one batch of audio is held in memory at a time.
+        """
+        dialogue_lines = iter(dialogue_lines)
+        while True:
+            batch = list(itertools.islice(dialogue_lines, self.batch_size))
+            if not batch:
+                return
+            requests = [self._build_request(line, output_kind, narrator_prefix) for line in batch]
+            audio = self._synthesize_grouped(batch, requests)
+            for line, (voice_path, _), wav_bytes in zip(batch, requests, audio):
+                yield line, voice_path, wav_bytes
+
+    def _synthesize_requests(self, requests: List[Tuple[str, str]]) -> Iterator[bytes]:
+        """Synthesize requests in order, through the parallel engine when one is attached"""
+        if self.engine:
+            return self.engine.map(requests)
+        return (self.synthesize_text(voice_path, text) for voice_path, text in requests)
+
+    def synthesize_text(self, voice_path: str, text: str) -> bytes:
+        """Synthesize one piece of text with the voice loaded from voice_path (WAV bytes)"""
+        if self.chunk_sentences:
+            return self._synthesize_chunked(voice_path, text)
+        return self._synthesize(voice_path, text)
+
+    def _synthesize_chunk(self, voice_path: str, text: str) -> Optional[bytes]:
+        """Synthesize one sentence chunk; a failure is reported and skipped (None)"""
+        try:
+            return self._synthesize(voice_path, text)
+        except Exception as e:
+            print(f"Warning: Skipping sentence that failed to synthesize ({e}): {text[:50]}...")
+            return None
+
+    def _synthesize_chunked(self, voice_path: str, text: str) -> bytes:
+        """Synthesize text sentence by sentence (each cached on its own) and join the audio"""
+        chunks = split_sentences(text)
+        if len(chunks) <= 1:
+            return self._synthesize(voice_path, text)
+
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as output_wav:
+            params_set = False
+            for chunk in chunks:
+                wav_bytes = self._synthesize_chunk(voice_path, chunk)
+                if wav_bytes is None:
+                    continue
+                with wave.open(io.BytesIO(wav_bytes), "rb") as chunk_wav:
+                    if not params_set:
+                        output_wav.setparams(chunk_wav.getparams())
+                        params_set = True
+                    output_wav.writeframes(chunk_wav.readframes(chunk_wav.getnframes()))
+            if not params_set:
+                raise RuntimeError(f"Every sentence failed to synthesize: {text[:50]}...")
+        return buffer.getvalue()
+
+    def prefetch(self, dialogue_lines: List[DialogueLine], output_kind: str,
+                 narrator_prefix: bool = False, output_dir: Optional[str] = None,
+                 force: bool = False, pack: bool = False):
+        """Queue synthesis of upcoming dialogue lines on the parallel engine
+
+        Lets workers start on the next screenplay while the current one is still being written.
+        Does nothing without an engine attached.
+
+        Args:
+            dialogue_lines: Lines of the upcoming screenplay
+            output_kind: 'separate', 'multi' or 'single' (see _build_requests)
+            narrator_prefix: If True, prefix dialogue with speaker name
+            output_dir: Output directory of the upcoming screenplay ('separate' only)
+            force: Same as convert_to_separate_files(force=...)
+            pack: The screenplay is written as a scene pack (output_dir + PACK_EXTENSION)
+        """
+        if not self.engine or not dialogue_lines:
+            return
+        if output_kind == "separate" and pack:
+            # Only lines missing from the existing scene pack
+            requests, plan = self._plan_scene_pack(dialogue_lines, output_dir + PACK_EXTENSION, force=force)
+            self.engine.prefetch([request for request, planned in zip(requests, plan)
+                                  if planned.action == "render"])
+        elif output_kind == "separate":
+            # Only lines the scene manifest says need synthesizing
+            requests, plan = self.plan_separate_files(dialogue_lines, output_dir, force=force)
+            self.engine.prefetch([request for request, planned in zip(requests, plan)
+                                  if planned.action == "render"])
         else:
-            # Character not in config at all
-            print(f"[VOICE] '{character}' -> NOT IN CONFIG, using default")
-            return self.default_voice
+            self.engine.prefetch(self._build_requests(dialogue_lines, output_kind, narrator_prefix))
 
-    def convert_to_speech(self, dialogue_lines: List[DialogueLine],
+    def convert_to_speech(self, dialogue_lines: Iterable[DialogueLine],
                          output_path: str, narrator_prefix: bool = False,
                          multi_voice: bool = None):
         """Convert dialogue lines to a single WAV file
 
         Args:
-            dialogue_lines: List of dialogue lines to convert
+            dialogue_lines: Dialogue lines to convert (a list, or a parser generator to stream
+                            multi-voice output while the script is still being parsed)
             output_path: Output WAV file path
             narrator_prefix: If True, prefix dialogue with speaker name
-            multi_voice: If True, use different voices per character (requires pydub)
+            multi_voice: If True, use different voices per character
                         If None (default), auto-detect based on whether voice config was loaded
         """
         # Auto-detect: use multi-voice if we have a character voice map
@@ -374,122 +828,334 @@ class PiperTTSConverter:
         else:
             self._convert_single_voice(dialogue_lines, output_path, narrator_prefix)
 
-    def _convert_single_voice(self, dialogue_lines: List[DialogueLine],
+    def _convert_single_voice(self, dialogue_lines: Iterable[DialogueLine],
                              output_path: str, narrator_prefix: bool = False):
         """Convert dialogue to single file using one voice"""
-        print(f"\n[CONVERT] Using SINGLE VOICE mode (all characters same voice)")
-        full_text = []
-
-        for line in dialogue_lines:
-            if narrator_prefix and line.speaker != "ACTION":
-                text = f"{line.speaker} says: {line.text}"
-            else:
-                text = line.text
-            full_text.append(text)
+        logger.debug(f"\n[CONVERT] Using SINGLE VOICE mode (all characters same voice)")
+        if self.chunk_sentences:
+            self._convert_single_voice_chunked(dialogue_lines, output_path, narrator_prefix)
+            return
 
-        # Join all text with pauses
-        complete_text = ". ... ".join(full_text)
+        # All text is joined into one synthesis request, so the whole script is needed
+        dialogue_lines = list(dialogue_lines)
+        requests = self._build_requests(dialogue_lines, "single", narrator_prefix)
 
         print(f"Generating audio for {len(dialogue_lines)} lines (single voice)...")
 
-        with wave.open(output_path, "wb") as wav_file:
-            self.default_voice.synthesize_wav(complete_text, wav_file)
+        wav_bytes = next(iter(self._synthesize_requests(requests)))
+        self.encoder.write_wav(output_path, wav_bytes)
 
         print(f"Audio saved to: {output_path}")
 
-    def _convert_multi_voice(self, dialogue_lines: List[DialogueLine],
-                            output_path: str, narrator_prefix: bool = False):
-        """Convert dialogue to single file using multiple voices per character"""
-        try:
-            from pydub import AudioSegment
-        except ImportError:
-            print("Error: pydub not installed. Install with: pip install pydub")
-            print("Falling back to single voice mode...")
-            self._convert_single_voice(dialogue_lines, output_path, narrator_prefix)
-            return
-
-        import tempfile
-
-        print(f"\n[CONVERT] Starting multi-voice conversion")
-        print(f"[CONVERT] Processing {len(dialogue_lines)} lines with character_voice_map: {bool(self.character_voice_map)}")
-        print(f"Generating audio for {len(dialogue_lines)} lines (multiple voices)...")
+    def _convert_single_voice_chunked(self, dialogue_lines: Iterable[DialogueLine],
+                                      output_path: str, narrator_prefix: bool = False):
+        """Stream single-voice output to disk one sentence at a time
 
-        combined_audio = AudioSegment.empty()
-
-        for i, line in enumerate(dialogue_lines, 1):
-            # Get voice for this character
-            voice = self._get_voice_for_character(line.speaker)
-
-            # Find the voice name for debug output
-            voice_name = "unknown"
-            for path, v in self.voices.items():
-                if v is voice:
-                    voice_name = os.path.basename(path)
-                    break
-
-            # Prepare text
-            if narrator_prefix and line.speaker != "ACTION":
-                text = f"{line.speaker} says: {line.text}"
-            else:
-                text = line.text
+        Frames are appended (and flushed) as each sentence is synthesized, so memory stays
+        bounded and the file can be played while the rest of the scene renders; the WAV
+        header's length fields are patched when the file is closed. Lines are separated by
+        LINE_PAUSE_MS of silence, and a sentence that fails is skipped with a warning.
+        """
+        # (line index, sentence) for every chunk, lazily unless the engine needs the batch
+        chunks = (
+            (index, chunk)
+            for index, line in enumerate(dialogue_lines)
+            for chunk in split_sentences(self._line_text(line, narrator_prefix))
+        )
+        if self.engine:
+            chunks = list(chunks)
+            audio = self.engine.map([(self.default_voice_path, chunk) for _, chunk in chunks],
+                                    skip_errors=True)
+            chunk_audio = zip((index for index, _ in chunks), audio)
+        else:
+            chunk_audio = ((index, self._synthesize_chunk(self.default_voice_path, chunk))
+                           for index, chunk in chunks)
+
+        print(f"Generating audio sentence by sentence (single voice)...")
+
+        start = time.perf_counter()
+        sentence_count = 0
+        failed_count = 0
+        previous_index = None
+        silence = b""
+        # Opened at the first sentence, once the voice's sample rate is known
+        output: Optional[AudioEncoder] = None
+        try:
+            for index, wav_bytes in chunk_audio:
+                if wav_bytes is None:
+                    failed_count += 1
+                    continue
+                with wave.open(io.BytesIO(wav_bytes), "rb") as chunk_wav:
+                    if output is None:
+                        output = self.encoder(output_path, chunk_wav.getframerate())
+                        silence = bytes(2 * int(chunk_wav.getframerate() * LINE_PAUSE_MS / 1000))
+                    frames = chunk_wav.readframes(chunk_wav.getnframes())
+
+                if previous_index is not None and index != previous_index:
+                    output.write(silence)
+                output.write(frames)
+                output.flush()
+
+                if sentence_count == 0:
+                    print(f"  First audio after {time.perf_counter() - start:.2f}s")
+                sentence_count += 1
+                previous_index = index
+        finally:
+            if output is not None:
+                output.close()
+
+        status = f", {failed_count} failed and skipped" if failed_count else ""
+        print(f"  {sentence_count} sentences written{status}")
+        print(f"Audio saved to: {output_path}")
 
-            # Generate audio to temporary file
-            with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                temp_path = temp_file.name
+    def _voice_sample_rate(self, voice_path: str) -> int:
+        """Native sample rate of a voice model, read from its .onnx.json config"""
+        voice = self.voice_pool.peek(voice_path)
+        if voice is not None:
+            return voice.config.sample_rate
+        with open(f"{voice_path}.json", 'r', encoding='utf-8') as f:
+            return json.load(f)["audio"]["sample_rate"]
 
-            with wave.open(temp_path, "wb") as wav_file:
-                voice.synthesize_wav(text, wav_file)
+    def _convert_multi_voice(self, dialogue_lines: Iterable[DialogueLine],
+                            output_path: str, narrator_prefix: bool = False):
+        """Convert dialogue to single file using multiple voices per character
 
-            # Load and add to combined audio
-            audio_segment = AudioSegment.from_wav(temp_path)
+        Each line's PCM is appended straight to the output WAV as it is synthesized, after the
+        pause for its speaker transition, so only one line is held in memory at a time. Lines
+        go through the post-processing in postprocess_settings (see audio_postprocess.py).
+        """
+        # Line count is only known up front for a list (not while streaming from the parser)
+        line_count = f"{len(dialogue_lines)} " if isinstance(dialogue_lines, list) else ""
+        line_total = f"/{len(dialogue_lines)}" if isinstance(dialogue_lines, list) else ""
+        logger.debug(f"\n[CONVERT] Starting multi-voice conversion")
+        logger.debug(f"[CONVERT] Processing {line_count}lines with character_voice_map: {bool(self.character_voice_map)}")
+        print(f"Generating audio for {line_count}lines (multiple voices)...")
+
+        # Piper voices are 16-bit mono; unless a rate is requested, the output uses the highest
+        # native rate among the configured voices, known before the first line arrives
+        voice_rates = {voice_path: self._voice_sample_rate(voice_path) for voice_path in self.available_voice_paths}
+        output_rate = self.postprocess_settings.sample_rate or max(voice_rates.values())
+        other_rates = sorted(set(voice_rates.values()) - {output_rate})
+        if other_rates:
+            print(f"  Output at {output_rate} Hz; resampling lines from voices at "
+                  f"{', '.join(f'{rate} Hz' for rate in other_rates)}")
+        processor = ScenePostProcessor(self.postprocess_settings, output_rate)
+
+        with self.encoder(output_path, output_rate) as output:
+
+            def postprocess(item: Tuple[DialogueLine, str, bytes]) -> Tuple[DialogueLine, str, bytes, bytes]:
+                line, voice_path, wav_bytes = item
+                with wave.open(io.BytesIO(wav_bytes), "rb") as line_wav:
+                    line_rate = line_wav.getframerate()
+                    frames = line_wav.readframes(line_wav.getnframes())
+
+                # Resampled (once, straight to the output rate) along with the other processing
+                resample_before = processor.resample_seconds
+                frames = processor.process(voice_path, frames, line_rate)
+                if self.tracer and line_rate != output_rate:
+                    self.tracer.event("resample", processor.resample_seconds - resample_before,
+                                      line=line.line_number, speaker=line.speaker,
+                                      from_rate=line_rate, to_rate=output_rate)
+                # Lines arrive in script order, so the speaker transition is known here
+                return line, voice_path, processor.gap_before(line.speaker), frames
+
+            line_numbers = itertools.count(1)
+            show_progress = logger.isEnabledFor(logging.INFO)
+
+            def write(item: Tuple[DialogueLine, str, bytes, bytes]):
+                line, voice_path, gap, frames = item
+                start = time.perf_counter()
+                output.write(gap)
+                output.write(frames)
+                if self.tracer:
+                    self._trace_write(line, start, len(gap) + len(frames))
+
+                line_number = next(line_numbers)
+                if show_progress:
+                    voice_name = os.path.basename(voice_path)
+                    logger.info(f"  [{line_number}{line_total}] {line.speaker} -> VOICE: {voice_name}")
+
+            # Generate audio (or pull it from the synthesis cache), in script order
+            self._render_lines(dialogue_lines, "multi", narrator_prefix,
+                               [("postprocess", postprocess), ("write", write)])
+            output.write(processor.tail())
+
+        self.resampled_lines += processor.resampled_lines
+        self.resample_seconds += processor.resample_seconds
+        if processor.resampled_lines:
+            print(f"  {processor.summary()}")
+        print(f"Audio saved to: {output_path}")
 
-            # Make ACTION narrator speak 1.5x faster
-            # if line.speaker == "ACTION":
-            #     audio_segment = audio_segment.speedup(playback_speed=1.5)
+    def _separate_targets(self, dialogue_lines: List[DialogueLine], encoder: Optional[type] = None
+                          ) -> Tuple[List[Tuple[str, str]], List[Tuple[str, str]]]:
+        """Synthesis requests and (file name, fingerprint) targets for one-file-per-line output
 
-            combined_audio += audio_segment
+        Args:
+            dialogue_lines: List of dialogue lines
+            encoder: Output file encoder (default: the converter's output format)
+        """
+        encoder = encoder or self.encoder
+        settings = self.synthesis_settings
+        if encoder is not WavEncoder:
+            # A WAV and a FLAC of the same line are different files
+            settings = dict(settings, output_format=encoder.name)
+
+        # Get the appropriate voice for each character
+        requests = self._build_requests(dialogue_lines, "separate")
+        targets = [
+            (f"{i:04d}_{self.voice_index.lookup(line.speaker).label}{encoder.extension}",
+             line_fingerprint(text, voice_path, settings, self._model_hash(voice_path)))
+            for i, (line, (voice_path, text)) in enumerate(zip(dialogue_lines, requests), 1)
+        ]
+        return requests, targets
+
+    def plan_separate_files(self, dialogue_lines: List[DialogueLine], output_dir: str,
+                            force: bool = False) -> Tuple[List[Tuple[str, str]], List[PlannedFile]]:
+        """Work out which line files need synthesizing, using the scene manifest
+
+        Returns:
+            (synthesis requests for every line, manifest plan for every line)
+        """
+        requests, targets = self._separate_targets(dialogue_lines)
+        plan = SceneManifest(output_dir).plan(targets, force=force)
+        return requests, plan
 
-            # Add pause between lines (500ms)
-            combined_audio += AudioSegment.silent(duration=500)
+    def _plan_scene_pack(self, dialogue_lines: List[DialogueLine], pack_path: str,
+                         force: bool = False) -> Tuple[List[Tuple[str, str]], List[PlannedFile]]:
+        """Work out which lines need synthesizing, using the index of the scene's existing pack
 
-            # Clean up temp file
-            os.remove(temp_path)
+        Lines whose fingerprint is already in the pack are planned as "keep" (copied from it).
 
-            print(f"  [{i}/{len(dialogue_lines)}] {line.speaker} -> VOICE: {voice_name}")
+        Returns:
+            (synthesis requests for every line, plan for every line)
+        """
+        # Packs hold PCM; their index names the WAVs an export writes
+        requests, targets = self._separate_targets(dialogue_lines, encoder=WavEncoder)
+        packed = {}
+        if not force and os.path.exists(pack_path):
+            try:
+                with ScenePack(pack_path) as pack:
+                    packed = pack.by_fingerprint()
+            except (ValueError, OSError) as e:
+                print(f"Warning: Unreadable scene pack {pack_path} ({e}), re-rendering scene")
+        plan = [
+            PlannedFile(index, filename, fingerprint, "keep" if fingerprint in packed else "render")
+            for index, (filename, fingerprint) in enumerate(targets, 1)
+        ]
+        return requests, plan
+
+    def _synthesize_separate_batched(self, dialogue_lines: List[DialogueLine],
+                                     requests: List[Tuple[str, str]], plan: List[PlannedFile]
+                                     ) -> Iterator[Tuple[DialogueLine, str, PlannedFile, Optional[bytes]]]:
+        """Voice-grouped batches for separate mode, yielding (line, voice_path, planned, WAV bytes or None)
+
+        Only lines the manifest plan marks for rendering are synthesized.
+        """
+        scene = iter(zip(dialogue_lines, requests, plan))
+        while True:
+            batch = list(itertools.islice(scene, self.batch_size))
+            if not batch:
+                return
+            render = [(line, request) for line, request, planned in batch if planned.action == "render"]
+            audio = iter(self._synthesize_grouped([line for line, _ in render],
+                                                  [request for _, request in render]))
+            for line, (voice_path, _), planned in batch:
+                wav_bytes = next(audio) if planned.action == "render" else None
+                yield line, voice_path, planned, wav_bytes
+
+    def _render_planned(self, dialogue_lines: List[DialogueLine], requests: List[Tuple[str, str]],
+                        plan: List[PlannedFile], write: Callable):
+        """Synthesize the lines a plan marks "render" and pass every line to write, in script order
+
+        write receives (line, voice_path, planned, WAV bytes or None if the line isn't rendered).
+        """
+        rendered_audio = None
+        if self.engine:
+            rendered_audio = self.engine.map([request for request, planned in zip(requests, plan)
+                                              if planned.action == "render"])
+
+        def synthesize(item: Tuple[DialogueLine, Tuple[str, str], PlannedFile]):
+            line, (voice_path, text), planned = item
+            wav_bytes = None
+            if planned.action == "render":
+                if rendered_audio is not None:
+                    wav_bytes = next(rendered_audio)
+                else:
+                    wav_bytes = self._synthesize_line(line, voice_path, text)
+            return line, voice_path, planned, wav_bytes
 
-        # Export final combined audio
-        combined_audio.export(output_path, format="wav")
-        print(f"Audio saved to: {output_path}")
+        if self.batch_size and rendered_audio is None:
+            self._run_stages(self._synthesize_separate_batched(dialogue_lines, requests, plan), [("write", write)])
+        else:
+            self._run_stages(zip(dialogue_lines, requests, plan), [("synthesize", synthesize), ("write", write)])
 
-    def convert_to_separate_files(self, dialogue_lines: List[DialogueLine],
-                                  output_dir: str):
+    def convert_to_separate_files(self, dialogue_lines: List[DialogueLine], output_dir: str,
+                                  force: bool = False) -> Tuple[List[Tuple[str, str]], List[PlannedFile]]:
         """Convert each dialogue line to a separate WAV file
 
+        Only lines that were added, edited or re-voiced since the last run are synthesized;
+        shifted lines are renamed and orphaned files pruned (see scene_manifest.py).
+
         Args:
             dialogue_lines: List of dialogue lines
             output_dir: Directory to save individual audio files
+            force: If True, re-synthesize every line regardless of the scene manifest
+
+        Returns:
+            (synthesis requests for every line, the manifest plan that was carried out)
         """
         os.makedirs(output_dir, exist_ok=True)
-        print(f"\n[CONVERT] Starting separate files conversion to: {output_dir}")
-        print(f"[CONVERT] Processing {len(dialogue_lines)} lines with character_voice_map: {bool(self.character_voice_map)}")
-
-        for i, line in enumerate(dialogue_lines, 1):
-            filename = f"{i:04d}_{line.speaker.replace(' ', '_')}.wav"
+        logger.debug(f"\n[CONVERT] Starting separate files conversion to: {output_dir}")
+        logger.debug(f"[CONVERT] Processing {len(dialogue_lines)} lines with character_voice_map: {bool(self.character_voice_map)}")
+
+        manifest = SceneManifest(output_dir)
+        requests, plan = self.plan_separate_files(dialogue_lines, output_dir, force=force)
+        line_info = [
+            {"speaker": line.speaker, "voice": os.path.basename(voice_path)}
+            for line, (voice_path, _) in zip(dialogue_lines, requests)
+        ]
+
+        # Line indexes whose file is in place; the manifest only ever lists these, so an
+        # interrupted run re-renders just the lines it hadn't finished
+        finished = {planned.index for planned in plan if planned.action == "keep"}
+        last_save = time.perf_counter()
+
+        def save_manifest():
+            nonlocal last_save
+            done = [(planned, info) for planned, info in zip(plan, line_info) if planned.index in finished]
+            manifest.save([planned for planned, _ in done], [info for _, info in done])
+            last_save = time.perf_counter()
+
+        # Drop the entries of files about to be moved or overwritten before touching them
+        save_manifest()
+        manifest.apply_renames(plan)
+        finished.update(planned.index for planned in plan if planned.action == "rename")
+        save_manifest()
+
+        counts = {"keep": 0, "rename": 0, "render": 0}
+        show_progress = logger.isEnabledFor(logging.INFO)
+
+        def write(item: Tuple[DialogueLine, str, PlannedFile, Optional[bytes]]):
+            line, voice_path, planned, wav_bytes = item
+            i = planned.index
+            filename = planned.filename
             output_path = os.path.join(output_dir, filename)
-
-            # Get the appropriate voice for this character
-            voice = self._get_voice_for_character(line.speaker)
-
-            # Find the voice name for debug output
-            voice_name = "unknown"
-            for path, v in self.voices.items():
-                if v is voice:
-                    voice_name = os.path.basename(path)
-                    break
-
-            # Generate audio
-            with wave.open(output_path, "wb") as wav_file:
-                voice.synthesize_wav(line.text, wav_file)
+            voice_name = os.path.basename(voice_path)
+            counts[planned.action] += 1
+
+            if planned.action == "render":
+                start = time.perf_counter()
+                self.encoder.write_wav(output_path, wav_bytes)
+                if self.tracer:
+                    self._trace_write(line, start, len(wav_bytes))
+                finished.add(i)
+                if time.perf_counter() - last_save >= MANIFEST_SAVE_SECONDS:
+                    save_manifest()
+                status = ""
+            elif planned.action == "rename":
+                status = f" (unchanged, renamed from {planned.source})"
+            else:
+                status = " (unchanged)"
 
             # Speed up ACTION narrator by 1.5x
             # if line.speaker == "ACTION":
@@ -502,13 +1168,153 @@ class PiperTTSConverter:
             #         # pydub not available, skip speedup
             #         pass
 
-            print(f"  [{i}/{len(dialogue_lines)}] {line.speaker} -> VOICE: {voice_name} -> {filename}")
+            if show_progress:
+                logger.info(f"  [{i}/{len(dialogue_lines)}] {line.speaker} -> VOICE: {voice_name} -> {filename}{status}")
+
+        # Generate audio (or pull it from the synthesis cache) for new/changed lines, in script order
+        self._render_planned(dialogue_lines, requests, plan, write)
+
+        removed = manifest.prune(plan)
+        save_manifest()
+
+        print(f"\n{counts['render']} synthesized, {counts['rename']} renamed, {counts['keep']} unchanged, "
+              f"{len(removed)} orphaned file(s) pruned")
+        print(f"All files saved to: {output_dir}")
+        return requests, plan
+
+    def convert_to_scene_pack(self, dialogue_lines: List[DialogueLine],
+                              pack_path: str, force: bool = False):
+        """Convert each dialogue line into one packed scene file (see scene_pack.py)
+
+        Holds the same audio as convert_to_separate_files, in one PCM blob with a line index.
+        Lines already in the existing pack with the same fingerprint are copied from it
+        instead of being synthesized again.
+
+        Args:
+            dialogue_lines: List of dialogue lines
+            pack_path: Scene pack file to write (e.g. audio_output/Scene_00_The_Railyard.pack)
+            force: If True, re-synthesize every line regardless of the existing pack
+        """
+        logger.debug(f"\n[CONVERT] Starting scene pack conversion to: {pack_path}")
+
+        requests, plan = self._plan_scene_pack(dialogue_lines, pack_path, force=force)
+        previous = None
+        packed = {}
+        if any(planned.action == "keep" for planned in plan):
+            previous = ScenePack(pack_path)
+            packed = previous.by_fingerprint()
+
+        writer = ScenePackWriter(pack_path)
+        counts = {"keep": 0, "render": 0}
+        show_progress = logger.isEnabledFor(logging.INFO)
+
+        def write(item: Tuple[DialogueLine, str, PlannedFile, Optional[bytes]]):
+            line, voice_path, planned, wav_bytes = item
+            voice_name = os.path.basename(voice_path)
+            counts[planned.action] += 1
+
+            if planned.action == "render":
+                start = time.perf_counter()
+                writer.add_wav(planned.index, planned.filename, line.speaker, voice_name,
+                               planned.fingerprint, wav_bytes)
+                if self.tracer:
+                    self._trace_write(line, start, len(wav_bytes))
+                status = ""
+            else:
+                packed_line = packed[planned.fingerprint]
+                writer.add(planned.index, planned.filename, line.speaker, voice_name,
+                           planned.fingerprint, previous.pcm(packed_line), packed_line.sample_rate)
+                status = " (unchanged)"
+
+            if show_progress:
+                logger.info(f"  [{planned.index}/{len(dialogue_lines)}] {line.speaker} -> VOICE: {voice_name} "
+                            f"-> {planned.filename}{status}")
+
+        try:
+            # Generate audio (or pull it from the synthesis cache) for new/changed lines, in script order
+            self._render_planned(dialogue_lines, requests, plan, write)
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            # Unmap the old pack before the new one replaces it
+            if previous:
+                previous.close()
+        writer.close()
+
+        print(f"\n{counts['render']} synthesized, {counts['keep']} unchanged")
+        print(f"Scene pack saved to: {pack_path}")
+
+
+# Movie folders recognized in input paths, checked in this order
+MOVIE_FOLDERS = ("amazingtrash", "cuberoot", "hunted")
+
+
+def detect_movie(input_path: str) -> Optional[str]:
+    """Movie folder name mentioned in a (resolved) input path, or None"""
+    for movie_folder in MOVIE_FOLDERS:
+        if movie_folder in input_path:
+            return movie_folder
+    return None
+
+
+def movie_audio_dir(movie_folder: str) -> Path:
+    """A movie's production/audio directory (default output and voice config location)"""
+    return PROJECT_ROOT / movie_folder / "production" / "audio"
+
+
+def movie_voice_config(movie_folder: str) -> Path:
+    """Default character_voices.json for a movie
+
+    The first of VOICE_CONFIG_LOCATIONS that exists, as the character registry reads it
+    (the first location if there is none, for error messages).
+    """
+    movie_dir = PROJECT_ROOT / movie_folder
+    for location in VOICE_CONFIG_LOCATIONS:
+        if (movie_dir / location).exists():
+            return movie_dir / location
+    return movie_dir / VOICE_CONFIG_LOCATIONS[0]
+
 
-        print(f"\nAll files saved to: {output_dir}")
+def movie_acts_dir(movie_folder: str) -> Path:
+    """A movie's writing/acts directory (default input)"""
+    return PROJECT_ROOT / movie_folder / "writing" / "acts"
 
 
-def main():
+# Files to exclude (not screenplay content)
+EXCLUDED_FILES = {
+    "table_of_contents.txt",
+    "main.txt",
+    "old traps.txt",
+    "trap ideas.txt",
+    "readme.md",
+    "tts_readme.md",
+    "claude.md"
+}
+
+
+def find_screenplay_files(input_path: Path) -> List[Path]:
+    """Screenplay .txt files in a file or directory (searched recursively), in sorted order"""
+    if input_path.is_file():
+        return [input_path]
+    # Use rglob to find files at any depth
+    all_files = sorted(input_path.rglob("*.txt"))
+    # Filter out excluded files
+    return [f for f in all_files if f.name.lower() not in EXCLUDED_FILES]
+
+
+def non_negative_int(value: str) -> int:
+    """argparse type for counts where 0 means "automatic" (e.g. --jobs)"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {number}")
+    return number
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Command-line options of screenplay_to_tts.py (also accepted by the synthesis server)"""
     parser = argparse.ArgumentParser(
+        prog="screenplay_to_tts.py",
         description="Convert screenplay files to TTS audio using Piper"
     )
     parser.add_argument(
@@ -539,7 +1345,61 @@ def main():
     parser.add_argument(
         "--combine",
         action="store_true",
-        help="Combine all lines into one file with multiple voices (requires pydub)"
+        help="Combine all lines into one file with multiple voices"
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="wav",
+        help="Output file format: 'wav' (default), lossless 'flac' or compact 'opus' (.ogg); flac/opus need: pip install soundfile"
+    )
+    parser.add_argument(
+        "--pack",
+        action="store_true",
+        help="Separate mode: write each scene as one packed SCENE.pack file (PCM + line index, see scene_pack.py) instead of a folder of WAVs"
+    )
+    parser.add_argument(
+        "--trim-silence",
+        action="store_true",
+        help="Combine mode: trim leading/trailing silence from each line before inserting the pause"
+    )
+    parser.add_argument(
+        "--silence-threshold",
+        type=float,
+        default=-50.0,
+        metavar="DBFS",
+        help="Level below which --trim-silence treats audio as silence (default: -50 dBFS)"
+    )
+    parser.add_argument(
+        "--loudness",
+        type=float,
+        default=None,
+        metavar="DBFS",
+        help="Combine mode: match every voice to this RMS level, e.g. -20 (default: off, Piper's per-sentence peak normalization only)"
+    )
+    parser.add_argument(
+        "--gap-ms",
+        type=int,
+        default=LINE_PAUSE_MS,
+        help=f"Combine mode: pause between lines of the same speaker, and after the last line (default: {LINE_PAUSE_MS})"
+    )
+    parser.add_argument(
+        "--speaker-gap-ms",
+        type=int,
+        default=None,
+        help="Combine mode: pause when another character speaks (default: --gap-ms)"
+    )
+    parser.add_argument(
+        "--action-gap-ms",
+        type=int,
+        default=None,
+        help="Combine mode: pause between dialogue and ACTION lines, either way (default: --gap-ms)"
+    )
+    parser.add_argument(
+        "--sample-rate",
+        type=int,
+        default=None,
+        help="Combine mode: output sample rate; lines are resampled to it (default: highest native rate of the configured voices)"
     )
     parser.add_argument(
         "--narrator-prefix",
@@ -556,36 +1416,118 @@ def main():
         action="store_true",
         help="Keep line breaks in dialogue blocks (old behavior). Default: combine dialogue lines into continuous blocks"
     )
+    parser.add_argument(
+        "--preformat",
+        action="store_true",
+        help="Format each screenplay in memory (as format_screenplay_dialogue.py would) and parse the result, "
+             "instead of running the formatter first"
+    )
+    parser.add_argument(
+        "--write-formatted",
+        action="store_true",
+        help="With --preformat, also save the formatted text back to screenplay files it changed"
+    )
     parser.add_argument(
         "--movie",
         help="Movie folder name (e.g., 'cuberoot', 'amazingtrash', 'hunted'). Required unless detectable from input path."
     )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Synthesis cache directory (default: production/audio/tts_cache, shared across movies)"
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=float,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f"Synthesis cache size cap in MB; least-recently-used entries are evicted (default: {DEFAULT_CACHE_SIZE_MB})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the synthesis cache (always re-synthesize every line)"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-synthesize every line in separate mode, ignoring each scene's manifest.json"
+    )
+    parser.add_argument(
+        "--voice-memory-mb",
+        type=float,
+        default=DEFAULT_VOICE_MEMORY_MB,
+        help=f"Approximate memory budget for loaded voice models; least-recently-used models are unloaded (default: {DEFAULT_VOICE_MEMORY_MB})"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=non_negative_int,
+        default=1,
+        help="Number of synthesis worker processes (default: 1 = serial, 0 = one per CPU core)"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run parse, synthesis, post-processing and file writes as concurrent stages"
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=DEFAULT_QUEUE_SIZE,
+        help=f"Lines buffered between pipeline stages before upstream stages wait (default: {DEFAULT_QUEUE_SIZE})"
+    )
+    parser.add_argument(
+        "--chunked",
+        action="store_true",
+        help="Synthesize sentence by sentence: single mode streams to disk as it renders, and a failing sentence is skipped"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=0,
+        help="Synthesize lines in batches of this many, grouped by voice (e.g. 32; default: 0 = script order)"
+    )
+    parser.add_argument(
+        "-v", "--verbose",
+        action="count",
+        default=0,
+        help="Per-line output: -v shows a progress line per rendered line, -vv adds parser and voice lookup details"
+    )
+    parser.add_argument(
+        "--trace",
+        help="Append a JSONL trace of per-line timings (parse, voice lookup, synthesis, write) to this file"
+    )
+    return parser
 
-    args = parser.parse_args()
+
+def main(argv: Optional[List[str]] = None, cache: Optional[SynthesisCache] = None,
+         voice_pool: Optional[VoicePool] = None):
+    """Run a conversion
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+        cache: Synthesis cache to use instead of opening one from --cache-dir (e.g. the
+               synthesis server's shared cache); ignored with --no-cache
+        voice_pool: Voice pool to load voices from, keeping its own memory budget (e.g. the
+                    synthesis server's); --voice-memory-mb then only applies to --jobs workers
+    """
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+    configure_logging(args.verbose)
 
     # Detect which movie folder we're processing
     input_path_str = str(Path(args.input_path).resolve())
-    project_root = Path(__file__).parent.parent.parent  # Go up to untitled/
+    project_root = PROJECT_ROOT
 
     # Use explicit --movie parameter if provided, otherwise try auto-detection
-    movie_folder = args.movie
-    if not movie_folder:
-        if "amazingtrash" in input_path_str:
-            movie_folder = "amazingtrash"
-        elif "cuberoot" in input_path_str:
-            movie_folder = "cuberoot"
-        elif "hunted" in input_path_str:
-            movie_folder = "hunted"
+    movie_folder = args.movie or detect_movie(input_path_str)
 
     # Set default output directory and voice config based on movie folder
     if movie_folder:
-        movie_audio = project_root / movie_folder / "production" / "audio"
-
         if args.output_dir is None:
-            args.output_dir = str(movie_audio / "audio_output")
+            args.output_dir = str(movie_audio_dir(movie_folder) / "audio_output")
 
         if not args.voice_model and not args.voice_config:
-            movie_config = movie_audio / "character_voices.json"
+            movie_config = movie_voice_config(movie_folder)
             if movie_config.exists():
                 args.voice_config = str(movie_config)
                 print(f"Auto-detected {movie_folder} voice config: {movie_config}")
@@ -595,14 +1537,15 @@ def main():
         # Could not detect movie folder - require explicit --movie parameter
         parser.error("Could not detect movie folder from input path. Please specify --movie (e.g., --movie hunted)")
 
-    # Validate input path
+    # Validate input path ("-" reads a single screenplay from stdin)
+    read_stdin = args.input_path == "-"
     input_path = Path(args.input_path)
 
     # If input_path is ".", look in movie_folder/writing/acts from project root
     if str(input_path) == ".":
         # Use movie folder's writing/acts directory
         if movie_folder:
-            input_path = project_root / movie_folder / "writing" / "acts"
+            input_path = movie_acts_dir(movie_folder)
         else:
             # Fallback: try current directory
             current_dir = Path.cwd()
@@ -612,10 +1555,10 @@ def main():
                 input_path = project_root / "writing" / "acts"
 
     # If input_path doesn't exist, try prepending writing/acts/
-    if not input_path.exists():
+    if not read_stdin and not input_path.exists():
         # Try movie folder's writing/acts first
         if movie_folder:
-            movie_alt_path = project_root / movie_folder / "writing" / "acts" / input_path.name
+            movie_alt_path = movie_acts_dir(movie_folder) / input_path.name
             if movie_alt_path.exists():
                 input_path = movie_alt_path
             else:
@@ -632,27 +1575,15 @@ def main():
                 print(f"Also tried: {alt_path}")
                 sys.exit(1)
 
-    # Files to exclude (not screenplay content)
-    EXCLUDED_FILES = {
-        "table_of_contents.txt",
-        "main.txt",
-        "old traps.txt",
-        "trap ideas.txt",
-        "readme.md",
-        "tts_readme.md",
-        "claude.md"
-    }
-
     # Get list of screenplay files
-    if input_path.is_file():
+    if read_stdin:
+        # Output is named after "stdin" (e.g. audio_output/stdin.wav)
+        screenplay_files = [Path("stdin")]
+    elif input_path.is_file():
         screenplay_files = [input_path]
     else:
         # Directory mode: recursively find all .txt files
-        # Use rglob to find files at any depth
-        all_files = sorted(input_path.rglob("*.txt"))
-
-        # Filter out excluded files
-        screenplay_files = [f for f in all_files if f.name.lower() not in EXCLUDED_FILES]
+        screenplay_files = find_screenplay_files(input_path)
 
         # Show Act folders if found (for user feedback)
         act_folders = sorted([
@@ -670,52 +1601,217 @@ def main():
     print(f"Found {len(screenplay_files)} screenplay file(s)")
 
     # Initialize parser and TTS converter
-    parser_obj = ScreenplayParser()
+    # Speakers are checked against the movie's cast (voice config + character profiles)
+    characters = load_registry(movie_folder)
+    parser_obj = ScreenplayParser(characters=characters if len(characters) else None)
+
+    if args.no_cache:
+        cache = None
+    elif cache is None:
+        cache = SynthesisCache(args.cache_dir, max_size_mb=args.cache_size_mb)
+        print(f"Synthesis cache: {cache.cache_dir}")
 
     try:
         tts_converter = PiperTTSConverter(
             voice_model_path=args.voice_model,
             voice_config_path=args.voice_config,
-            use_cuda=args.cuda
+            use_cuda=args.cuda,
+            cache=cache,
+            voice_pool=voice_pool,
+            voice_memory_mb=args.voice_memory_mb,
+            chunk_sentences=args.chunked,
+            output_format=args.format
         )
     except Exception as e:
         print(f"Error initializing TTS: {e}")
         sys.exit(1)
 
+    engine = None
+    if args.jobs != 1:
+        if cache:
+            # Hash voice models once up front instead of in every worker
+            for voice_path in tts_converter.available_voice_paths:
+                cache.model_hash(os.path.realpath(voice_path))
+        engine = ParallelSynthesisEngine(
+            args.jobs,
+            PiperTTSConverter,
+            dict(
+                voice_model_path=args.voice_model,
+                voice_config_path=args.voice_config,
+                use_cuda=args.cuda,
+                cache=cache,
+                voice_memory_mb=args.voice_memory_mb,
+                chunk_sentences=args.chunked,
+                output_format=args.format
+            ),
+            cache=cache
+        )
+        tts_converter.engine = engine
+
+    if args.batch_size > 0:
+        if engine:
+            print("Note: --batch-size has no effect with --jobs (workers already run lines in parallel)")
+        tts_converter.batch_size = args.batch_size
+
+    if args.pack and (args.mode == "single" or args.combine):
+        print("Note: --pack only applies to separate mode (single and combined output is one WAV per file already)")
+    elif args.pack and args.format != "wav":
+        print("Note: --format has no effect with --pack (packs hold raw PCM; export them to WAV)")
+
+    tts_converter.postprocess_settings = PostProcessSettings(
+        trim_silence=args.trim_silence,
+        silence_threshold_dbfs=args.silence_threshold,
+        loudness_dbfs=args.loudness,
+        gap_ms=args.gap_ms,
+        speaker_gap_ms=args.speaker_gap_ms,
+        action_gap_ms=args.action_gap_ms,
+        sample_rate=args.sample_rate,
+    )
+    if tts_converter.postprocess_settings != PostProcessSettings() and not (
+            args.combine and tts_converter.character_voice_map):
+        print("Note: --trim-silence, --loudness, gap and --sample-rate options only apply to --combine with a voice config")
+
+    if args.pipeline:
+        tts_converter.pipeline = RenderPipeline(queue_size=max(1, args.queue_size))
+
+    tracer = None
+    if args.trace:
+        tracer = LineTracer(args.trace)
+        tts_converter.tracer = tracer
+        if engine:
+            engine.tracer = tracer
+
+    # Which converter path each file takes ('separate', 'multi' or 'single')
+    if args.mode == "single" or args.combine:
+        output_kind = "multi" if args.combine and tts_converter.character_voice_map else "single"
+    else:
+        output_kind = "separate"
+
+    # Combined output can be synthesized while the parser is still reading the script;
+    # separate/single mode and the parallel engine need each whole scene
+    stream_lines = output_kind == "multi" and not engine
+
+    def parse_screenplay(screenplay_file: Path) -> Iterator[DialogueLine]:
+        """Lazily parse one screenplay (from stdin when the input path is "-")"""
+        if args.preformat:
+            screenplay_lines = preformat_screenplay(screenplay_file)
+            dialogue_lines = parser_obj.iter_lines(screenplay_lines, line_by_line=args.line_by_line)
+        elif read_stdin:
+            dialogue_lines = parser_obj.iter_lines(sys.stdin, line_by_line=args.line_by_line)
+        else:
+            dialogue_lines = parser_obj.iter_file(str(screenplay_file), line_by_line=args.line_by_line)
+        if tracer:
+            return tracer.trace_parse(dialogue_lines, scene=screenplay_file.stem)
+        return dialogue_lines
+
+    def preformat_screenplay(screenplay_file: Path) -> List[str]:
+        """Read a screenplay once and format it in memory, optionally saving the result"""
+        if read_stdin:
+            data = sys.stdin.buffer.read()
+        else:
+            with open(screenplay_file, 'rb') as f:
+                data = f.read()
+        content = decode_screenplay(data)
+        formatted_lines = format_screenplay_lines(content.split('\n'), characters.words)
+        if args.write_formatted and not read_stdin:
+            formatted = '\n'.join(formatted_lines)
+            if formatted != content:
+                write_atomic(screenplay_file, encode_screenplay(formatted))
+                print(f"  Saved formatted screenplay: {screenplay_file}")
+        return formatted_lines
+
+    if args.write_formatted and not args.preformat:
+        print("Note: --write-formatted only applies with --preformat")
+
     # Process each file
     os.makedirs(args.output_dir, exist_ok=True)
 
-    for screenplay_file in screenplay_files:
+    next_dialogue_lines = None
+    for file_index, screenplay_file in enumerate(screenplay_files):
         print(f"\n{'='*60}")
         print(f"Processing: {screenplay_file.name}")
         print(f"{'='*60}")
 
-        # Parse screenplay
-        dialogue_lines = parser_obj.parse_file(str(screenplay_file), line_by_line=args.line_by_line)
+        # Parse screenplay (already parsed if it was prefetched)
+        if next_dialogue_lines is not None:
+            dialogue_lines = next_dialogue_lines
+        elif stream_lines:
+            dialogue_lines = parse_screenplay(screenplay_file)
+        else:
+            dialogue_lines = list(parse_screenplay(screenplay_file))
+        next_dialogue_lines = None
+
+        if engine and file_index + 1 < len(screenplay_files):
+            # Queue the next file's lines so workers stay busy across file boundaries
+            next_dialogue_lines = list(parse_screenplay(screenplay_files[file_index + 1]))
+            tts_converter.prefetch(
+                next_dialogue_lines,
+                output_kind,
+                narrator_prefix=args.narrator_prefix,
+                output_dir=os.path.join(args.output_dir, screenplay_files[file_index + 1].stem),
+                force=args.force,
+                pack=args.pack
+            )
 
-        if not dialogue_lines:
-            print(f"  No dialogue found, skipping...")
-            continue
+        if stream_lines:
+            # Peek at the first line to skip empty scripts without parsing the rest up front
+            first_line = next(dialogue_lines, None)
+            if first_line is None:
+                print(f"  No dialogue found, skipping...")
+                continue
+            dialogue_lines = itertools.chain([first_line], dialogue_lines)
+        else:
+            if not dialogue_lines:
+                print(f"  No dialogue found, skipping...")
+                continue
 
-        print(f"Extracted {len(dialogue_lines)} dialogue/action lines")
+            print(f"Extracted {len(dialogue_lines)} dialogue/action lines")
 
         # Generate output filename
         base_name = screenplay_file.stem
+        if tracer:
+            tracer.scene = base_name
 
         if args.mode == "single" or args.combine:
-            output_file = os.path.join(args.output_dir, f"{base_name}.wav")
+            output_file = os.path.join(args.output_dir, f"{base_name}{tts_converter.encoder.extension}")
             tts_converter.convert_to_speech(
                 dialogue_lines,
                 output_file,
                 narrator_prefix=args.narrator_prefix,
                 multi_voice=args.combine
             )
+        elif args.pack:
+            pack_path = os.path.join(args.output_dir, f"{base_name}{PACK_EXTENSION}")
+            tts_converter.convert_to_scene_pack(dialogue_lines, pack_path, force=args.force)
         else:  # separate
             output_subdir = os.path.join(args.output_dir, base_name)
-            tts_converter.convert_to_separate_files(dialogue_lines, output_subdir)
+            tts_converter.convert_to_separate_files(dialogue_lines, output_subdir, force=args.force)
+
+    if engine:
+        engine.close()
 
     print(f"\n{'='*60}")
     print("Conversion complete!")
+    if engine:
+        engine.report()
+    else:
+        print(f"Voice models: {tts_converter.voice_pool.summary()}")
+        print(f"Phoneme cache: {tts_converter.phoneme_cache.summary()}")
+    if tts_converter.pipeline:
+        tts_converter.pipeline.report()
+    if tts_converter.resampled_lines:
+        print(f"Rate conversion: {tts_converter.resampled_lines} line(s) in {tts_converter.resample_seconds:.2f}s")
+    if parser_obj.unknown_speakers:
+        print(f"Speakers not in the {movie_folder} character registry (default voice): "
+              f"{', '.join(sorted(parser_obj.unknown_speakers))}")
+    if cache:
+        if engine:
+            # Workers wrote to the cache directly
+            cache.refresh_size()
+        print(f"Synthesis cache: {cache.summary()}")
+    if tracer:
+        tracer.close()
+        print(f"Trace: {tracer.events} events written to {tracer.path}")
     print(f"{'='*60}")
 
 
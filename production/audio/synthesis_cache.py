@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Synthesis Cache for Piper TTS
+Content-addressed on-disk cache of synthesized WAV audio, so unchanged lines are never re-synthesized
+
+Cache keys are a SHA-256 hash of:
+- the normalized line text (whitespace collapsed)
+- the resolved voice model path
+- a hash of the voice model file itself
+- the synthesis settings (piper version, synthesis config)
+
+Entries are plain WAV files stored under <cache_dir>/<first two key chars>/<key>.wav.
+The cache is capped in size; when it grows past the cap, the least-recently-used
+entries (by file modification time, refreshed on every hit) are evicted.
+
+One cache object can be shared by threads (e.g. the synthesis server's request threads);
+each process of a pool gets its own copy.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Shared across all movies, next to the shared voices/ directory
+DEFAULT_CACHE_DIR = Path(__file__).parent / "tts_cache"
+DEFAULT_CACHE_SIZE_MB = 2048
+
+# Evict down to this fraction of the cap so eviction doesn't run on every write
+EVICT_TARGET_RATIO = 0.9
+
+MODEL_HASHES_FILE = "model_hashes.json"
+
+
+def normalize_text(text: str) -> str:
+    """Normalize line text for cache keys (collapse and strip whitespace)"""
+    return ' '.join(text.split())
+
+
+def hash_file(path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SynthesisCache:
+    """On-disk LRU cache of synthesized audio keyed by text, voice model and settings"""
+
+    def __init__(self, cache_dir: Optional[str] = None,
+                 max_size_mb: float = DEFAULT_CACHE_SIZE_MB):
+        """Initialize the synthesis cache
+
+        Args:
+            cache_dir: Directory to store cached audio (default: production/audio/tts_cache)
+            max_size_mb: Size cap in megabytes; least-recently-used entries are evicted past it
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
+        self.max_bytes = int(max_size_mb * 1024 * 1024)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        # Guards the counters, the size total and the model hash table
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Model hashes persist across runs, keyed by path and validated by size/mtime,
+        # so multi-hundred-MB .onnx files are only hashed once
+        self._model_hashes: Dict[str, Tuple[int, int, str]] = self._load_model_hashes()
+
+        self.refresh_size()
+
+    def __getstate__(self):
+        # Sent to worker processes along with the converter settings
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.wav"
+
+    def _iter_entries(self):
+        """Yield (path, size, mtime) for every cached entry"""
+        for subdir in self.cache_dir.iterdir():
+            if not subdir.is_dir():
+                continue
+            for entry in subdir.glob("*.wav"):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # Evicted by another process in the meantime
+                    continue
+                yield entry, stat.st_size, stat.st_mtime
+
+    def _load_model_hashes(self) -> Dict[str, Tuple[int, int, str]]:
+        hashes_path = self.cache_dir / MODEL_HASHES_FILE
+        if not hashes_path.exists():
+            return {}
+        try:
+            with open(hashes_path, 'r') as f:
+                return {path: tuple(value) for path, value in json.load(f).items()}
+        except (ValueError, OSError):
+            return {}
+
+    def _save_model_hashes(self):
+        self._write_atomic(self.cache_dir / MODEL_HASHES_FILE,
+                           json.dumps(self._model_hashes, indent=2).encode('utf-8'))
+
+    def _write_atomic(self, path: Path, data: bytes):
+        """Write data to path through a temp file + rename so readers never see partial files"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=str(path.parent), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def model_hash(self, model_path: str) -> str:
+        """Get the content hash of a voice model file (memoized by size and mtime)"""
+        stat = os.stat(model_path)
+        with self._lock:
+            cached = self._model_hashes.get(model_path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+
+        print(f"  Hashing voice model: {os.path.basename(model_path)}")
+        model_digest = hash_file(model_path)
+        with self._lock:
+            self._model_hashes[model_path] = (stat.st_size, stat.st_mtime_ns, model_digest)
+            self._save_model_hashes()
+        return model_digest
+
+    def make_key(self, text: str, model_path: str, settings: Dict) -> str:
+        """Build the cache key for a line of text rendered with a voice model
+
+        Args:
+            text: Text to synthesize
+            model_path: Path to the Piper .onnx voice model
+            settings: Synthesis settings that affect the output audio
+        """
+        resolved_path = os.path.realpath(model_path)
+        key_data = {
+            "text": normalize_text(text),
+            "model_path": resolved_path,
+            "model_hash": self.model_hash(resolved_path),
+            "settings": settings,
+        }
+        key_json = json.dumps(key_data, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key_json.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached WAV bytes for a key, or None on a miss"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            self.count_lookups(misses=1)
+            return None
+
+        # Refresh mtime so this entry is most-recently-used
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        self.count_lookups(hits=1)
+        return data
+
+    def count_lookups(self, hits: int = 0, misses: int = 0):
+        """Add hits and misses (also those counted by worker processes' copies of the cache)"""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def put(self, key: str, data: bytes):
+        """Store WAV bytes under a key, evicting old entries if over the size cap"""
+        entry_path = self._entry_path(key)
+        existed = entry_path.exists()
+        self._write_atomic(entry_path, data)
+        with self._lock:
+            if not existed:
+                self.total_bytes += len(data)
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Evict least-recently-used entries until the cache is under its target size
+
+        Called with the lock held.
+        """
+        entries = sorted(self._iter_entries(), key=lambda entry: entry[2])
+        self.total_bytes = sum(size for _, size, _ in entries)
+        target_bytes = int(self.max_bytes * EVICT_TARGET_RATIO)
+
+        for entry_path, size, _ in entries:
+            if self.total_bytes <= target_bytes:
+                break
+            try:
+                entry_path.unlink()
+            except FileNotFoundError:
+                pass
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def refresh_size(self):
+        """Recount the cache size from disk (after other processes have written to it)"""
+        total_bytes = sum(size for _, size, _ in self._iter_entries())
+        with self._lock:
+            self.total_bytes = total_bytes
+
+    def summary(self) -> str:
+        """One-line summary of cache activity for end-of-run reporting"""
+        with self._lock:
+            hits, misses, evictions, total_bytes = self.hits, self.misses, self.evictions, self.total_bytes
+        lookups = hits + misses
+        hit_rate = (100.0 * hits / lookups) if lookups else 0.0
+        return (f"{hits} hits, {misses} misses ({hit_rate:.1f}% hit rate), "
+                f"{evictions} evicted, "
+                f"{total_bytes / (1024 * 1024):.1f} MB / {self.max_bytes / (1024 * 1024):.1f} MB")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Parallel Synthesis Engine for Piper TTS
+Spreads line synthesis across a pool of worker processes (Piper's ONNX inference is CPU-bound)
+
+Each worker builds its own converter once at startup, so every PiperVoice model is loaded
+once per worker rather than once per line. Lines are handed out to whichever worker is free,
+and results are always returned in request order, so the files written are identical to
+the serial path. Per-worker throughput (lines/sec) is collected for the end-of-run report.
+"""
+
+import multiprocessing
+import os
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Converter built by _init_worker in each worker process
+_worker_converter = None
+
+
+def _init_worker(converter_factory: Callable, converter_kwargs: Dict):
+    """Pool initializer: load voice models once per worker process"""
+    global _worker_converter
+    _worker_converter = converter_factory(**converter_kwargs)
+
+
+def _synthesize_in_worker(request: Tuple[str, str]) -> Tuple[int, float, Optional[bool], bytes]:
+    """Synthesize one (voice_path, text) request in a worker process
+
+    Returns:
+        (worker pid, seconds spent, cache hit flag or None without a cache, WAV bytes)
+    """
+    voice_path, text = request
+    cache = _worker_converter.cache
+    hits_before = cache.hits if cache else 0
+
+    start = time.perf_counter()
+    wav_bytes = _worker_converter.synthesize_text(voice_path, text)
+    elapsed = time.perf_counter() - start
+
+    cache_hit = (cache.hits > hits_before) if cache else None
+    return os.getpid(), elapsed, cache_hit, wav_bytes
+
+
+class ParallelSynthesisEngine:
+    """Process pool that synthesizes (voice_path, text) requests and yields results in order"""
+
+    def __init__(self, jobs: int, converter_factory: Callable, converter_kwargs: Dict,
+                 cache=None):
+        """Start the worker pool
+
+        Args:
+            jobs: Number of worker processes (0 = one per CPU core)
+            converter_factory: Callable building a converter in each worker (e.g. PiperTTSConverter)
+            converter_kwargs: Keyword arguments for converter_factory
+            cache: Synthesis cache of the main process; worker hit/miss counts are merged into it
+        """
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache = cache
+        print(f"Starting {self.jobs} synthesis worker(s)...")
+        self.pool = multiprocessing.Pool(
+            self.jobs,
+            initializer=_init_worker,
+            initargs=(converter_factory, converter_kwargs)
+        )
+
+        # JSONL trace for per-line synthesis timings (set by the caller, None = off)
+        self.tracer = None
+
+        # Requests queued ahead of time by prefetch(), keyed by the request tuple
+        self._pending: Dict[Tuple, List] = {}
+
+        # pid -> [lines, busy seconds]
+        self.worker_stats: Dict[int, List[float]] = {}
+        self.start_time = time.perf_counter()
+
+    def _submit(self, requests: List[Tuple[str, str]]) -> List:
+        return [self.pool.apply_async(_synthesize_in_worker, (request,)) for request in requests]
+
+    def prefetch(self, requests: List[Tuple[str, str]]):
+        """Start synthesizing requests now; a later map() with the same requests picks them up"""
+        key = tuple(requests)
+        if key not in self._pending:
+            self._pending[key] = self._submit(requests)
+
+    def map(self, requests: List[Tuple[str, str]], skip_errors: bool = False) -> Iterator[Optional[bytes]]:
+        """Synthesize requests across the pool, yielding WAV bytes in request order
+
+        Args:
+            requests: (voice_path, text) pairs
+            skip_errors: Report a failed request and yield None for it instead of raising
+        """
+        async_results = self._pending.pop(tuple(requests), None)
+        if async_results is None:
+            async_results = self._submit(requests)
+
+        for (voice_path, text), async_result in zip(requests, async_results):
+            try:
+                pid, elapsed, cache_hit, wav_bytes = async_result.get()
+            except Exception as e:
+                if not skip_errors:
+                    raise
+                print(f"Warning: Skipping sentence that failed to synthesize ({e}): {text[:50]}...")
+                yield None
+                continue
+
+            if self.tracer:
+                self.tracer.event("synthesize", elapsed, voice=os.path.basename(voice_path),
+                                  chars=len(text), cache_hit=cache_hit, worker=pid)
+
+            stats = self.worker_stats.setdefault(pid, [0, 0.0])
+            stats[0] += 1
+            stats[1] += elapsed
+
+            if self.cache and cache_hit is not None:
+                self.cache.count_lookups(hits=int(cache_hit), misses=int(not cache_hit))
+
+            yield wav_bytes
+
+    def report(self):
+        """Print per-worker throughput"""
+        wall_time = time.perf_counter() - self.start_time
+        total_lines = sum(int(lines) for lines, _ in self.worker_stats.values())
+
+        print(f"Synthesis workers ({self.jobs}):")
+        for worker, (pid, (lines, busy)) in enumerate(sorted(self.worker_stats.items()), 1):
+            rate = lines / busy if busy > 0 else 0.0
+            print(f"  Worker {worker} (pid {pid}): {int(lines)} lines, "
+                  f"{busy:.1f}s busy, {rate:.2f} lines/sec")
+        if wall_time > 0:
+            print(f"  Total: {total_lines} lines in {wall_time:.1f}s ({total_lines / wall_time:.2f} lines/sec)")
+
+    def close(self):
+        """Shut down the worker pool"""
+        self.pool.close()
+        self.pool.join()
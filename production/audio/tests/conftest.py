@@ -0,0 +1,9 @@
+"""Shared pytest setup: the audio scripts are imported as top-level modules, like they import each other"""
+
+import sys
+from pathlib import Path
+
+AUDIO_DIR = Path(__file__).resolve().parent.parent
+
+if str(AUDIO_DIR) not in sys.path:
+    sys.path.insert(0, str(AUDIO_DIR))
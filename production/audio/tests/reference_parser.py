@@ -0,0 +1,215 @@
+"""
+Reference Screenplay Parser
+The regex-by-regex ScreenplayParser from before the single-pass classifier, kept unchanged
+so the current parser can be checked against it
+"""
+
+import logging
+import re
+from typing import Iterable, Iterator
+
+from render_trace import logger
+from screenplay_to_tts import ScreenplayParser, DialogueLine
+
+
+class RegexScreenplayParser(ScreenplayParser):
+    """ScreenplayParser as it was before the single-pass classifier (one regex per check)
+
+    Kept as the reference for test_screenplay_parser.py: both must produce exactly the same lines.
+    """
+
+    # Patterns to identify different screenplay elements
+    # Character headers: ALL CAPS, alphabetic only (no commas/periods), centered with indentation
+    CHARACTER_PATTERN = re.compile(r'^\s*([A-Z][A-Z\s]+?)(?:\s*\([^)]*\))?\s*$')
+    # V.O./O.S. character headers at left margin (not indented)
+    VO_CHARACTER_PATTERN = re.compile(r'^([A-Z][A-Z\s]+?)\s*\((V\.O\.|O\.S\.)\)\s*$')
+    DIALOGUE_PATTERN = re.compile(r'^["\']')
+    SCENE_HEADER_PATTERN = re.compile(r'^(INT\.|EXT\.|SCENE|LOCATION:|FADE)')
+    # Action lines: Start with capital, has lowercase, ends with period OR has comma (character actions)
+    ACTION_PATTERN = re.compile(r'^[A-Z][a-z].*[.,]')
+
+    def iter_lines(self, content: Iterable[str], line_by_line: bool = False) -> Iterator[DialogueLine]:
+        """Parse screenplay text lines (e.g. an open file or sys.stdin), yielding dialogue/action lines
+
+        Each DialogueLine is yielded as soon as its block is complete, so synthesis can start
+        while the rest of the script is still being read. See parse_file for arguments.
+        """
+        # Checked once, so disabled debug logging costs nothing per line
+        debug = logger.isEnabledFor(logging.DEBUG)
+
+        # Finished lines waiting to be yielded
+        lines = []
+        script_started = False
+
+        # For grouping consecutive dialogue lines
+        pending_dialogue_lines = []
+        pending_dialogue_start_line = None
+
+        def flush_pending_dialogue():
+            """Combine accumulated dialogue lines into single DialogueLine"""
+            nonlocal pending_dialogue_lines, pending_dialogue_start_line
+            if pending_dialogue_lines and self.current_speaker:
+                # Combine lines with spaces, removing excess whitespace
+                combined_text = ' '.join(pending_dialogue_lines)
+                # Normalize whitespace: collapse multiple spaces into one
+                combined_text = ' '.join(combined_text.split())
+                if debug:
+                    logger.debug(f"[DEBUG] Line {pending_dialogue_start_line}: Combined dialogue for '{self.current_speaker}': {combined_text[:50]}...")
+                lines.append(DialogueLine(self.current_speaker, combined_text, pending_dialogue_start_line))
+                pending_dialogue_lines = []
+                pending_dialogue_start_line = None
+
+        for i, line in enumerate(content, 1):
+            # Hand out lines finished while processing the previous input line
+            if lines:
+                yield from lines
+                lines.clear()
+
+            stripped = line.strip()
+
+            # Check if we've reached the script marker (FULL SCRIPT or SCREENPLAY)
+            # Handle markdown headers like "## SCREENPLAY" or plain "SCREENPLAY"
+            if "FULL SCRIPT" in stripped.upper() or "SCREENPLAY" in stripped.upper():
+                script_started = True
+                if debug:
+                    logger.debug(f"[DEBUG] Found script marker at line {i}: {stripped[:50]}")
+                continue
+
+            # Skip everything before script marker
+            if not script_started:
+                continue
+
+            # Stop parsing at end-of-screenplay markers
+            if stripped.upper().startswith("## PRODUCTION") or \
+               stripped.upper().startswith("# PRODUCTION") or \
+               stripped.upper() == "PRODUCTION NOTES" or \
+               stripped.upper().startswith("## NOTES") or \
+               stripped.upper().startswith("## END"):
+                if debug:
+                    logger.debug(f"[DEBUG] Found end marker at line {i}: {stripped[:50]}, stopping parse")
+                break
+
+            # Skip empty lines and separators
+            if not stripped or stripped.startswith('===') or stripped.startswith('---'):
+                continue
+
+            # Check for V.O./O.S. character (left-aligned, like "LIAM (V.O.)")
+            vo_match = self.VO_CHARACTER_PATTERN.match(stripped)
+            if vo_match:
+                # Flush any pending dialogue before switching speakers
+                if not line_by_line:
+                    flush_pending_dialogue()
+
+                self.current_speaker = vo_match.group(1).strip()
+                self.in_vo_mode = True  # Next lines are V.O. dialogue (not indented)
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Found V.O. character: '{self.current_speaker}'")
+                continue
+
+            # Check for regular character name (centered/indented)
+            # Character headers have NO punctuation (commas, periods) - those are action lines
+            char_match = self.CHARACTER_PATTERN.match(stripped)
+            # Remove V.O./O.S. annotations before checking for punctuation
+            stripped_for_punct_check = re.sub(r'\s*\((V\.O\.|O\.S\.)\)\s*$', '', stripped)
+            if char_match and ',' not in stripped_for_punct_check and '.' not in stripped_for_punct_check:
+                # Flush any pending dialogue before switching speakers
+                if not line_by_line:
+                    flush_pending_dialogue()
+
+                self.current_speaker = char_match.group(1).strip()
+                self.in_vo_mode = False  # Regular dialogue is indented
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Found character: '{self.current_speaker}'")
+                continue
+
+            # Check for scene headers (INT./EXT./FADE/etc) - these are ACTION, not NARRATOR
+            if self.SCENE_HEADER_PATTERN.match(stripped):
+                # Flush any pending dialogue before action line
+                if not line_by_line:
+                    flush_pending_dialogue()
+
+                if debug:
+                    logger.debug(f"[DEBUG] Line {i}: Scene header (ACTION): {stripped[:50]}...")
+                lines.append(DialogueLine("ACTION", stripped, i))
+                self.current_speaker = None  # Reset after scene header
+                continue
+
+            # Check for parentheticals (character actions in dialogue)
+            if stripped.startswith('(') and stripped.endswith(')'):
+                continue  # Skip stage directions
+
+            # Check if line is indented (dialogue in screenplay format)
+            is_indented = line.startswith(' ') or line.startswith('\t')
+
+            # Check for dialogue (lines starting with quotes)
+            if self.DIALOGUE_PATTERN.match(stripped):
+                speaker = self.current_speaker or "ACTION"
+                # Remove quotes
+                text = stripped.strip('"\'')
+
+                if line_by_line:
+                    # Old behavior: separate line for each
+                    if debug:
+                        logger.debug(f"[DEBUG] Line {i}: Quoted dialogue for '{speaker}': {text[:50]}...")
+                    lines.append(DialogueLine(speaker, text, i))
+                else:
+                    # New behavior: accumulate
+                    if not pending_dialogue_lines:
+                        pending_dialogue_start_line = i
+                    pending_dialogue_lines.append(text)
+                continue
+
+            # If line is indented and we have a current speaker, it's dialogue continuation
+            if is_indented and self.current_speaker and len(stripped) > 0:
+                if line_by_line:
+                    # Old behavior: separate line for each
+                    if debug:
+                        logger.debug(f"[DEBUG] Line {i}: Dialogue for '{self.current_speaker}': {stripped[:50]}...")
+                    lines.append(DialogueLine(self.current_speaker, stripped, i))
+                else:
+                    # New behavior: accumulate
+                    if not pending_dialogue_lines:
+                        pending_dialogue_start_line = i
+                    pending_dialogue_lines.append(stripped)
+                continue
+
+            # V.O. dialogue: non-indented lines after a V.O. character header
+            # These look like action but are actually dialogue (e.g., "After Zaroff, I knew...")
+            if self.in_vo_mode and self.current_speaker and not is_indented and len(stripped) > 0:
+                # Check if this looks like a new character or scene header
+                if not self.VO_CHARACTER_PATTERN.match(stripped) and not self.CHARACTER_PATTERN.match(stripped):
+                    if line_by_line:
+                        if debug:
+                            logger.debug(f"[DEBUG] Line {i}: V.O. dialogue for '{self.current_speaker}': {stripped[:50]}...")
+                        lines.append(DialogueLine(self.current_speaker, stripped, i))
+                    else:
+                        if not pending_dialogue_lines:
+                            pending_dialogue_start_line = i
+                        pending_dialogue_lines.append(stripped)
+                    continue
+                else:
+                    # It's a new character, exit V.O. mode
+                    self.in_vo_mode = False
+
+            # Check for action lines (scene descriptions) - non-indented only
+            # Action lines: start with capital, contain lowercase OR all caps with punctuation
+            # Examples: "Marcus turns, annoyed." or "MARCUS turns, annoyed." or "Josh, suddenly lucid, sharp."
+            if not is_indented and stripped and stripped[0].isupper():
+                # Check if it matches action pattern OR has punctuation (likely an action line)
+                if self.ACTION_PATTERN.match(stripped) or (',' in stripped or '.' in stripped):
+                    # Flush any pending dialogue before action line
+                    if not line_by_line:
+                        flush_pending_dialogue()
+
+                    if debug:
+                        logger.debug(f"[DEBUG] Line {i}: Action description: {stripped[:50]}...")
+                    lines.append(DialogueLine("ACTION", stripped, i))
+                    self.current_speaker = None  # Reset after action line
+                    self.in_vo_mode = False  # Exit V.O. mode on action line
+                    continue
+
+        # Flush any remaining dialogue at end of file
+        if not line_by_line:
+            flush_pending_dialogue()
+
+        yield from lines
@@ -0,0 +1,37 @@
+"""Output encoders: dependency checks happen before any output file is created"""
+
+import pytest
+
+import audio_encoders
+from audio_encoders import ENCODERS, OpusEncoder, get_encoder
+
+pytest.importorskip("soundfile")
+
+
+@pytest.fixture
+def no_audioop(monkeypatch):
+    # Python 3.13+ without audioop-lts
+    monkeypatch.setattr(audio_encoders, "_import_audioop", lambda: None)
+
+
+def test_opus_format_rejected_without_audioop(no_audioop):
+    with pytest.raises(RuntimeError, match="audioop-lts"):
+        get_encoder("opus")
+    # The other formats don't need it
+    assert get_encoder("flac") is ENCODERS["flac"]
+
+
+def test_opus_file_not_created_without_audioop(no_audioop, tmp_path):
+    output_path = tmp_path / "line.ogg"
+    with pytest.raises(RuntimeError, match="audioop-lts"):
+        OpusEncoder(str(output_path), 22050)
+    assert not output_path.exists()
+
+
+def test_opus_resamples_streamed_audio(tmp_path):
+    output_path = tmp_path / "line.ogg"
+    with OpusEncoder(str(output_path), 22050) as encoder:
+        for _ in range(10):
+            encoder.write(b"\x00\x10" * 2205)
+
+    assert audio_encoders.audio_duration(str(output_path)) == pytest.approx(1.0, abs=0.05)
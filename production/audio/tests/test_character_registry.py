@@ -0,0 +1,68 @@
+"""Character registries built from voice configs, character profiles and extras lists"""
+
+import json
+
+import pytest
+
+import character_registry
+from character_registry import load_registry
+
+
+@pytest.fixture
+def project(tmp_path, monkeypatch):
+    """Empty project root with one movie folder, and a fresh in-memory registry cache"""
+    monkeypatch.setattr(character_registry, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(character_registry, "_registries", {})
+    (tmp_path / "movie" / "production").mkdir(parents=True)
+    (tmp_path / "movie" / "writing" / "Characters").mkdir(parents=True)
+    return tmp_path / "movie"
+
+
+def write_json(path, data):
+    path.write_text(json.dumps(data), encoding='utf-8')
+
+
+def test_registry_sources(project):
+    write_json(project / "production" / "character_voices.json", {
+        "ADAM": {"voice": "adam.onnx"},
+        "NIGHT POLICE OFFICERS": {"voice": "alan.onnx"},
+        "ACTION": {"voice": "lessac.onnx"},
+        "NARRATOR": {"voice": "libritts.onnx"},
+        "_default": {"voice": "lessac.onnx"},
+    })
+    (project / "writing" / "Characters" / "Gal.txt").write_text("profile", encoding='utf-8')
+    (project / "writing" / "Characters" / "README.md").write_text("readme", encoding='utf-8')
+    write_json(project / "writing" / "Characters" / "extras.json", ["BARRY", "FEMALE OFFICER"])
+
+    registry = load_registry("movie", None)
+
+    assert registry.names == {"ADAM", "NIGHT POLICE OFFICERS", "GAL", "BARRY", "FEMALE OFFICER"}
+    # Action lines are matched on their first word: only single-word names
+    assert registry.words == {"ADAM", "GAL", "BARRY"}
+    assert "ACTION" not in registry and "NARRATOR" not in registry
+
+
+def test_registry_rebuilt_when_extras_change(project, tmp_path):
+    registry_file = tmp_path / "character_registry.json"
+    extras_path = project / "writing" / "Characters" / "extras.json"
+    write_json(extras_path, ["BARRY"])
+    assert load_registry("movie", registry_file).names == {"BARRY"}
+
+    write_json(extras_path, ["BARRY", "BARTENDER"])
+    assert load_registry("movie", registry_file).names == {"BARRY", "BARTENDER"}
+
+    # A new process reads the on-disk cache
+    character_registry._registries.clear()
+    assert load_registry("movie", registry_file).names == {"BARRY", "BARTENDER"}
+
+
+@pytest.mark.parametrize("movie, names", [
+    ("cuberoot", {"MARCUS", "BARRY"}),
+    ("amazingtrash", {"ADAM", "VICTIM", "OFFICER"}),
+    ("hunted", {"LIAM", "GIRLY", "BARTENDER", "OFFICER", "DETECTIVE"}),
+])
+def test_movie_registries_keep_recased_names(movie, names):
+    # Every name the formatter's old hard-coded lists recased in these movies' scenes
+    registry = load_registry(movie, None)
+    assert names <= registry.words
+    assert not {"ACTION", "NARRATOR"} & registry.names
@@ -0,0 +1,294 @@
+"""download_voice.py against a local stand-in for the voice repository (no network access)"""
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import download_voice
+from download_voice import Downloader, DownloadTask, MANIFEST_NAME, PART_SUFFIX, VOICES, relative_path
+
+
+def file_contents(path: str, size: int) -> bytes:
+    """Deterministic stand-in contents for a served file"""
+    seed = hashlib.sha256(path.encode('utf-8')).digest()
+    return (seed * (size // len(seed) + 1))[:size]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves StandInServer.files with Range support (HTTP/1.0: one request per connection)"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        stand_in = self.server.stand_in
+        path = self.path.lstrip('/')
+        data = stand_in.files.get(path)
+        range_header = self.headers.get("Range")
+        if data is None:
+            stand_in.record(path, range_header, 404)
+            self.send_error(404)
+            return
+
+        with stand_in.lock:
+            stand_in.active += 1
+            stand_in.max_active = max(stand_in.max_active, stand_in.active)
+        try:
+            time.sleep(stand_in.delay)
+            total = str(len(data)) if stand_in.report_size else "*"
+            status, body = 200, data
+            if range_header and not stand_in.ignore_range:
+                start, _, end = range_header[len("bytes="):].partition('-')
+                start = int(start)
+                end = min(int(end), len(data) - 1) if end else len(data) - 1
+                if start >= len(data):
+                    stand_in.record(path, range_header, 416)
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{len(data)}")
+                    self.end_headers()
+                    return
+                status, body = 206, data[start:end + 1]
+
+            stand_in.record(path, range_header, status)
+            self.send_response(status)
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{total}")
+            if stand_in.report_size:
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        finally:
+            with stand_in.lock:
+                stand_in.active -= 1
+
+
+class StandInServer:
+    """Voice repository stand-in on localhost, recording every request it answers"""
+
+    def __init__(self, files):
+        self.files = dict(files)
+        self.ignore_range = False  # Answer ranged requests with the whole file (200)
+        self.report_size = True  # Send Content-Length and Content-Range totals
+        self.delay = 0.0  # Seconds before answering each request
+        self.requests = []  # (path, Range header or None, status)
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.httpd.stand_in = self
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/"
+
+    def record(self, path, range_header, status):
+        with self.lock:
+            self.requests.append((path, range_header, status))
+
+    def requests_for(self, path):
+        return [(range_header, status) for p, range_header, status in self.requests if p == path]
+
+    def add_manifest(self):
+        """Serve a voices.json listing the size and MD5 of every served voice file"""
+        manifest = {"all": {"files": {
+            path: {"size_bytes": len(data), "md5_digest": hashlib.md5(data).hexdigest()}
+            for path, data in self.files.items()
+        }}}
+        self.files[MANIFEST_NAME] = json.dumps(manifest).encode('utf-8')
+
+
+def voice_repository():
+    """Every file in VOICES, with small stand-in contents"""
+    files = {}
+    for i, voice_data in enumerate(VOICES.values()):
+        files[relative_path(voice_data["onnx"])] = file_contents(voice_data["onnx"], 50_000 + 1_000 * i)
+        files[relative_path(voice_data["config"])] = file_contents(voice_data["config"], 2_000 + i)
+    return files
+
+
+@pytest.fixture
+def server():
+    stand_in = StandInServer(voice_repository())
+    stand_in.thread.start()
+    yield stand_in
+    stand_in.httpd.shutdown()
+    stand_in.httpd.server_close()
+
+
+MODEL = relative_path(VOICES["en_US-ryan-high"]["onnx"])
+
+
+def model_task(server, tmp_path, with_manifest=True) -> DownloadTask:
+    """Task for en_US-ryan-high.onnx, with its manifest size and MD5 unless with_manifest is False"""
+    data = server.files[MODEL]
+    task = DownloadTask("en_US-ryan-high", server.base_url + MODEL, tmp_path / "en_US-ryan-high.onnx")
+    if with_manifest:
+        task.size, task.md5 = len(data), hashlib.md5(data).hexdigest()
+    return task
+
+
+def test_downloads_files_in_parallel(server, tmp_path):
+    server.delay = 0.3
+    voices = ["en_US-ryan-high", "en_US-amy-medium"]
+    downloader = Downloader(server.base_url, jobs=4)
+    tasks = download_voice.build_tasks(voices, tmp_path, downloader, {})
+
+    assert downloader.run(tasks) == []
+    assert server.max_active == 4
+    for task in tasks:
+        assert task.path.read_bytes() == server.files[task.url[len(server.base_url):]]
+
+
+def test_resumes_partial_download_with_range(server, tmp_path):
+    task = model_task(server, tmp_path)
+    data = server.files[MODEL]
+    part_path = tmp_path / (task.path.name + PART_SUFFIX)
+    part_path.write_bytes(data[:20_000])
+
+    downloader = Downloader(server.base_url)
+    downloader.download(task)
+
+    assert server.requests_for(MODEL) == [("bytes=20000-", 206)]
+    assert downloader.downloaded_bytes == len(data) - 20_000
+    assert task.path.read_bytes() == data
+    assert not part_path.exists()
+
+
+def test_resumes_truncated_model(server, tmp_path):
+    task = model_task(server, tmp_path)
+    data = server.files[MODEL]
+    task.path.write_bytes(data[:30_000])
+
+    Downloader(server.base_url).download(task)
+
+    assert server.requests_for(MODEL) == [("bytes=30000-", 206)]
+    assert task.path.read_bytes() == data
+
+
+def test_restarts_when_server_ignores_range(server, tmp_path):
+    server.ignore_range = True
+    task = model_task(server, tmp_path)
+    data = server.files[MODEL]
+    (tmp_path / (task.path.name + PART_SUFFIX)).write_bytes(data[:20_000])
+
+    Downloader(server.base_url).download(task)
+
+    assert server.requests_for(MODEL) == [("bytes=20000-", 200)]
+    assert task.path.read_bytes() == data
+
+
+def test_restarts_after_range_not_satisfiable(server, tmp_path):
+    # A stale part file longer than the file on the server
+    task = model_task(server, tmp_path, with_manifest=False)
+    data = server.files[MODEL]
+    (tmp_path / (task.path.name + PART_SUFFIX)).write_bytes(data + b"stale")
+
+    Downloader(server.base_url).download(task)
+
+    assert server.requests_for(MODEL) == [(f"bytes={len(data) + 5}-", 416), (None, 200)]
+    assert task.path.read_bytes() == data
+
+
+@pytest.mark.parametrize("damage", ["too_long", "corrupt"])
+def test_redownloads_on_size_or_md5_mismatch(server, tmp_path, damage):
+    task = model_task(server, tmp_path)
+    data = server.files[MODEL]
+    if damage == "too_long":
+        task.path.write_bytes(data + b"extra")
+    else:
+        task.path.write_bytes(bytes([data[0] ^ 0xFF]) + data[1:])
+
+    Downloader(server.base_url).download(task)
+
+    assert server.requests_for(MODEL) == [(None, 200)]
+    assert task.path.read_bytes() == data
+
+
+def test_skips_verified_model(server, tmp_path):
+    task = model_task(server, tmp_path)
+    task.path.write_bytes(server.files[MODEL])
+
+    assert "already downloaded" in Downloader(server.base_url).download(task)
+    assert server.requests_for(MODEL) == []
+
+
+def test_checks_unlisted_model_against_server_size(server, tmp_path):
+    task = model_task(server, tmp_path, with_manifest=False)
+    data = server.files[MODEL]
+    task.path.write_bytes(data[:30_000])
+
+    Downloader(server.base_url).download(task)
+
+    assert server.requests_for(MODEL) == [("bytes=0-0", 206), ("bytes=30000-", 206)]
+    assert task.path.read_bytes() == data
+
+
+def test_skips_unlisted_model_matching_server_size(server, tmp_path):
+    task = model_task(server, tmp_path, with_manifest=False)
+    task.path.write_bytes(server.files[MODEL])
+
+    assert "already downloaded" in Downloader(server.base_url).download(task)
+    assert server.requests_for(MODEL) == [("bytes=0-0", 206)]
+
+
+def test_redownloads_unlisted_model_of_unknown_size(server, tmp_path):
+    server.report_size = False
+    task = model_task(server, tmp_path, with_manifest=False)
+    data = server.files[MODEL]
+    task.path.write_bytes(data)
+
+    assert "already downloaded" not in Downloader(server.base_url).download(task)
+    assert server.requests_for(MODEL) == [("bytes=0-0", 206), (None, 200)]
+    assert task.path.read_bytes() == data
+
+
+def run_main(monkeypatch, *argv):
+    monkeypatch.setattr("sys.argv", ["download_voice.py", *argv])
+
+    def no_prompt(*args):
+        raise AssertionError("download_voice.py prompted for input")
+
+    monkeypatch.setattr("builtins.input", no_prompt)
+    download_voice.main()
+
+
+def test_main_downloads_named_voices_without_prompting(server, tmp_path, monkeypatch):
+    server.add_manifest()
+    run_main(monkeypatch, "--voices", "en_US-ryan-high,en_GB-alan-medium", "en_US-amy-medium",
+             "--output-dir", str(tmp_path), "--base-url", server.base_url)
+
+    expected = {f"{voice}{suffix}" for voice in ("en_US-ryan-high", "en_GB-alan-medium", "en_US-amy-medium")
+                for suffix in (".onnx", ".onnx.json")}
+    assert {path.name for path in tmp_path.iterdir()} == expected
+    assert (tmp_path / "en_GB-alan-medium.onnx").read_bytes() == \
+        server.files[relative_path(VOICES["en_GB-alan-medium"]["onnx"])]
+
+
+def test_main_downloads_all_voices_without_prompting(server, tmp_path, monkeypatch):
+    server.add_manifest()
+    run_main(monkeypatch, "--all", "--jobs", "8", "--output-dir", str(tmp_path), "--base-url", server.base_url)
+
+    assert len(list(tmp_path.iterdir())) == 2 * len(VOICES)
+    for voice_data in VOICES.values():
+        for url in (voice_data["onnx"], voice_data["config"]):
+            path = tmp_path / url.rsplit('/', 1)[-1]
+            assert path.read_bytes() == server.files[relative_path(url)]
+
+    # A second run verifies everything against the manifest and downloads nothing
+    server.requests.clear()
+    run_main(monkeypatch, "--all", "--output-dir", str(tmp_path), "--base-url", server.base_url)
+    assert server.requests == [(MANIFEST_NAME, None, 200)]
+
+
+def test_main_rejects_unknown_voice(server, tmp_path, monkeypatch):
+    with pytest.raises(SystemExit) as exit_info:
+        run_main(monkeypatch, "--voices", "en_US-nobody-low", "--output-dir", str(tmp_path),
+                 "--base-url", server.base_url)
+    assert exit_info.value.code == 1
+    assert server.requests == []
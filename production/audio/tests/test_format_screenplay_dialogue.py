@@ -0,0 +1,77 @@
+"""Golden-file test: format_screenplay_dialogue against the previous formatter on every .txt in the repository"""
+
+import pytest
+
+import format_screenplay_dialogue as formatter
+import reference_formatter
+from character_registry import registry_for_path
+from screenplay_to_tts import PROJECT_ROOT
+
+TEXT_FILES = sorted(path for path in PROJECT_ROOT.rglob("*.txt")
+                    if not any(part.startswith('.') for part in path.relative_to(PROJECT_ROOT).parts))
+
+
+def test_repository_has_text_files():
+    assert TEXT_FILES
+
+
+@pytest.mark.parametrize("text_file", TEXT_FILES, ids=[str(path.relative_to(PROJECT_ROOT)) for path in TEXT_FILES])
+def test_formatter_matches_reference(text_file):
+    content = text_file.read_text(encoding='utf-8')
+    registry = registry_for_path(text_file)
+    character_names = registry.words if registry else frozenset()
+
+    # As the file is on disk, then once formatted (formatting must be stable the same way)
+    for attempt in ("as is", "formatted"):
+        expected = reference_formatter.format_screenplay_dialogue(content, sorted(character_names))
+        assert formatter.format_screenplay_dialogue(content, character_names) == expected, attempt
+        content = expected
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "\n\n",
+    "MARCUS\n(moving toward window)\nWe need to leave now.\n\nMARCUS turns, annoyed.",
+    "LIAM (V.O.)\nAfter Zaroff, I knew.\n\tTabbed dialogue\n  LIAM (CONT'D)\n(to Hank)\nRun.",
+    "INT. HOUSE - NIGHT\nCUT TO:\nFADE OUT.\nSCENE 4\n" + "word " * 60,
+    "ALEX\n()\n" + "  indented " * 30 + "\n\nALEX, quietly.",
+])
+def test_formatter_matches_reference_on_edge_cases(content):
+    character_names = frozenset({"MARCUS", "ALEX", "LIAM", "HANK"})
+    expected = reference_formatter.format_screenplay_dialogue(content, sorted(character_names))
+    assert formatter.format_screenplay_dialogue(content, character_names) == expected
+
+
+def run_main(monkeypatch, *argv):
+    monkeypatch.setattr("sys.argv", ["format_screenplay_dialogue.py", *argv])
+    try:
+        formatter.main()
+    except SystemExit as e:
+        return e.code
+    return 0
+
+
+def test_check_lists_files_by_path_and_writes_nothing(tmp_path, monkeypatch, capsys):
+    unformatted = "MARCUS\n(moving toward window)\nWe need to leave now.\n"
+    scenes = tmp_path / "scenes"
+    scenes.mkdir()
+    # The largest file sorts first, so it would be listed last in completion order
+    (scenes / "a.txt").write_text(unformatted * 5000, encoding='utf-8')
+    (scenes / "b.txt").write_text(unformatted, encoding='utf-8')
+    (scenes / "c.txt").write_text(unformatted, encoding='utf-8')
+    (scenes / "d.txt").write_text(formatter.format_screenplay_dialogue(unformatted, frozenset()), encoding='utf-8')
+    state_file = tmp_path / "format_hashes.json"
+
+    code = run_main(monkeypatch, str(scenes / "c.txt"), str(scenes),
+                    "--check", "--diff", "--jobs", "2", "--state-file", str(state_file))
+
+    assert code == 1
+    listed = [line.split(": ", 1)[1] for line in capsys.readouterr().out.splitlines()
+              if line.strip().startswith("Would reformat")]
+    assert listed == [str(scenes / name) for name in ("a.txt", "b.txt", "c.txt")]
+    assert not state_file.exists()
+    assert (scenes / "b.txt").read_text(encoding='utf-8') == unformatted
+
+    # Formatting for real stores the hashes
+    assert run_main(monkeypatch, str(scenes), "--state-file", str(state_file)) == 0
+    assert state_file.exists()
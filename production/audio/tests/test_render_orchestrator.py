@@ -0,0 +1,40 @@
+"""Render orchestrator targets, resolved the way screenplay_to_tts.py resolves a movie"""
+
+import pytest
+
+import screenplay_to_tts
+from character_registry import VOICE_CONFIG_LOCATIONS
+from render_orchestrator import resolve_targets
+from screenplay_to_tts import MOVIE_FOLDERS, movie_acts_dir, movie_voice_config
+
+
+def test_nightly_render_targets_resolve():
+    # The README's nightly render, without any --voice-config
+    targets = resolve_targets(list(MOVIE_FOLDERS), {}, None)
+
+    assert [movie for movie, _, _, _ in targets] == list(MOVIE_FOLDERS)
+    for movie, input_path, voice_config, _ in targets:
+        assert input_path == movie_acts_dir(movie)
+        assert voice_config == str(movie_voice_config(movie))
+        assert voice_config.endswith("character_voices.json")
+
+
+def test_voice_config_locations_in_order(tmp_path, monkeypatch):
+    monkeypatch.setattr(screenplay_to_tts, "PROJECT_ROOT", tmp_path)
+    first, second = (tmp_path / "movie" / location for location in VOICE_CONFIG_LOCATIONS)
+
+    # Nothing there: the preferred location, for the error message
+    assert movie_voice_config("movie") == first
+
+    second.parent.mkdir(parents=True)
+    second.write_text("{}", encoding='utf-8')
+    assert movie_voice_config("movie") == second
+
+    first.parent.mkdir(parents=True, exist_ok=True)
+    first.write_text("{}", encoding='utf-8')
+    assert movie_voice_config("movie") == first
+
+
+def test_unknown_voice_config_is_reported(tmp_path):
+    with pytest.raises(ValueError, match="pass --voice-config"):
+        resolve_targets(["hunted"], {"hunted": str(tmp_path / "missing.json")}, None)
@@ -0,0 +1,47 @@
+"""Scene manifests: line fingerprints and keep/rename/render plans across runs"""
+
+from scene_manifest import SceneManifest, line_fingerprint
+
+SETTINGS = {"piper_version": "1.3.0"}
+
+
+def test_fingerprint_follows_model_contents():
+    fingerprint = line_fingerprint("Run.", "voices/a.onnx", SETTINGS, "hash-1")
+
+    assert line_fingerprint("  Run.", "voices/a.onnx", SETTINGS, "hash-1") == fingerprint
+    # A retrained model of the same size has a different content hash
+    assert line_fingerprint("Run.", "voices/a.onnx", SETTINGS, "hash-2") != fingerprint
+    assert line_fingerprint("Walk.", "voices/a.onnx", SETTINGS, "hash-1") != fingerprint
+
+
+def render_scene(manifest, targets, finished=None):
+    """Write every planned line file and save the manifest with the first `finished` lines"""
+    plan = manifest.plan(targets)
+    manifest.apply_renames(plan)
+    for planned in plan:
+        if planned.action == "render":
+            (manifest.output_dir / planned.filename).write_bytes(planned.fingerprint.encode())
+    done = plan[:finished]
+    manifest.save(done, [{"speaker": "ADAM"} for _ in done])
+    return plan
+
+
+def test_plan_keeps_renames_and_renders(tmp_path):
+    manifest = SceneManifest(str(tmp_path))
+    render_scene(manifest, [("0001_ADAM.wav", "a"), ("0002_ADAM.wav", "b")])
+
+    plan = manifest.plan([("0001_ADAM.wav", "a"), ("0002_ADAM.wav", "new"), ("0003_ADAM.wav", "b")])
+
+    assert [planned.action for planned in plan] == ["keep", "render", "rename"]
+    assert plan[2].source == "0002_ADAM.wav"
+
+
+def test_unlisted_files_are_rendered_again(tmp_path):
+    # An interrupted run saved only the lines it finished
+    manifest = SceneManifest(str(tmp_path))
+    targets = [("0001_ADAM.wav", "a"), ("0002_ADAM.wav", "b"), ("0003_ADAM.wav", "c")]
+    render_scene(manifest, targets, finished=2)
+
+    plan = manifest.plan(targets)
+
+    assert [planned.action for planned in plan] == ["keep", "keep", "render"]
@@ -0,0 +1,30 @@
+"""ScreenplayParser against the previous regex-by-regex parser on every screenplay in the movie folders"""
+
+import pytest
+
+from reference_parser import RegexScreenplayParser
+from screenplay_to_tts import ScreenplayParser, PROJECT_ROOT, MOVIE_FOLDERS
+
+SCREENPLAY_FILES = sorted(path for movie in MOVIE_FOLDERS for path in (PROJECT_ROOT / movie).rglob("*.txt"))
+
+
+def test_movie_folders_have_screenplays():
+    assert SCREENPLAY_FILES
+
+
+@pytest.mark.parametrize("line_by_line", [False, True], ids=["combined", "line_by_line"])
+@pytest.mark.parametrize("screenplay_file", SCREENPLAY_FILES,
+                         ids=[str(path.relative_to(PROJECT_ROOT)) for path in SCREENPLAY_FILES])
+def test_parser_matches_reference(screenplay_file, line_by_line):
+    parsed = ScreenplayParser().parse_file(str(screenplay_file), line_by_line=line_by_line)
+    expected = RegexScreenplayParser().parse_file(str(screenplay_file), line_by_line=line_by_line)
+    assert parsed == expected
+
+
+@pytest.mark.parametrize("line_by_line", [False, True], ids=["combined", "line_by_line"])
+def test_parser_matches_reference_across_files(line_by_line):
+    # One parser per run, as main() uses it: state left by one file carries into the next
+    parser, reference = ScreenplayParser(), RegexScreenplayParser()
+    for screenplay_file in SCREENPLAY_FILES:
+        parsed = parser.parse_file(str(screenplay_file), line_by_line=line_by_line)
+        assert parsed == reference.parse_file(str(screenplay_file), line_by_line=line_by_line), screenplay_file
@@ -0,0 +1,18 @@
+"""screenplay_to_tts.py command line"""
+
+import pytest
+
+from screenplay_to_tts import build_arg_parser
+
+
+@pytest.mark.parametrize("jobs, expected", [("0", 0), ("1", 1), ("8", 8)])
+def test_jobs_accepts_zero_and_up(jobs, expected):
+    assert build_arg_parser().parse_args(["--movie", "hunted", "--jobs", jobs]).jobs == expected
+
+
+@pytest.mark.parametrize("jobs", ["-2", "two"])
+def test_jobs_rejects_negative_and_non_numbers(jobs, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        build_arg_parser().parse_args(["--movie", "hunted", "--jobs", jobs])
+    assert exit_info.value.code == 2
+    assert "--jobs" in capsys.readouterr().err
@@ -0,0 +1,77 @@
+"""Synthesis cache shared by threads (like the server's request threads) and sent to worker processes"""
+
+import pickle
+import threading
+
+from synthesis_cache import SynthesisCache
+
+THREADS = 8
+LINES = 50
+
+
+def run_threads(target):
+    errors = []
+
+    def guarded(n):
+        try:
+            target(n)
+        except Exception as e:  # Surfaced by the assertion below
+            errors.append(e)
+
+    threads = [threading.Thread(target=guarded, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
+
+def test_counters_and_size_stay_exact_across_threads(tmp_path):
+    cache = SynthesisCache(str(tmp_path / "cache"))
+
+    def lookups(n):
+        for i in range(LINES):
+            key = f"{n:02d}{i:062d}"
+            assert cache.get(key) is None
+            cache.put(key, b"x" * 100)
+            assert cache.get(key) == b"x" * 100
+
+    run_threads(lookups)
+
+    assert (cache.hits, cache.misses) == (THREADS * LINES, THREADS * LINES)
+    assert cache.total_bytes == THREADS * LINES * 100
+
+
+def test_model_hashes_from_many_threads(tmp_path):
+    cache = SynthesisCache(str(tmp_path / "cache"))
+    models = []
+    for n in range(THREADS * 4):
+        model = tmp_path / f"voice{n}.onnx"
+        model.write_bytes(b"model %d" % n)
+        models.append(str(model))
+
+    # Every thread hashes (and saves) every model, in a different order
+    run_threads(lambda n: [cache.model_hash(model) for model in models[n:] + models[:n]])
+
+    reloaded = SynthesisCache(str(tmp_path / "cache"))
+    assert [reloaded.model_hash(model) for model in models] == [cache.model_hash(model) for model in models]
+
+
+def test_eviction_from_many_threads(tmp_path):
+    cache = SynthesisCache(str(tmp_path / "cache"), max_size_mb=20_000 / (1024 * 1024))
+
+    run_threads(lambda n: [cache.put(f"{n:02d}{i:062d}", b"x" * 1_000) for i in range(LINES)])
+
+    cache.refresh_size()
+    assert cache.total_bytes <= 20_000
+    assert cache.evictions > 0
+
+
+def test_pickles_for_worker_processes(tmp_path):
+    cache = SynthesisCache(str(tmp_path / "cache"))
+    cache.put("ab" + "0" * 62, b"audio")
+    copy = pickle.loads(pickle.dumps(cache))
+
+    assert copy.get("ab" + "0" * 62) == b"audio"
+    copy.count_lookups(hits=2, misses=1)
+    assert (copy.hits, copy.misses) == (3, 1)
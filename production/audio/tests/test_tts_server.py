@@ -0,0 +1,43 @@
+"""Synthesis server: voice config lookup for /line requests"""
+
+import pytest
+
+import tts_server
+from screenplay_to_tts import MOVIE_FOLDERS, movie_voice_config
+from tts_server import RequestError, SynthesisServer
+
+
+class RecordingConverter:
+    """Stands in for PiperTTSConverter, so no voice model is needed to resolve configs"""
+
+    def __init__(self, voice_config_path, **settings):
+        self.voice_config_path = voice_config_path
+        self.phoneme_cache = settings.get("phoneme_cache")
+
+
+@pytest.fixture
+def server(monkeypatch):
+    monkeypatch.setattr(tts_server, "PiperTTSConverter", RecordingConverter)
+    return SynthesisServer(cache=None)
+
+
+@pytest.mark.parametrize("movie", MOVIE_FOLDERS)
+def test_default_voice_config_found_for_every_movie(server, movie):
+    converter = server.converter_for(movie)
+
+    assert converter.voice_config_path == str(movie_voice_config(movie))
+    assert server.converter_for(movie) is converter
+
+
+def test_default_movie_used_when_request_names_none(monkeypatch):
+    monkeypatch.setattr(tts_server, "PiperTTSConverter", RecordingConverter)
+    server = SynthesisServer(cache=None, default_movie="amazingtrash")
+
+    assert server.converter_for().voice_config_path == str(movie_voice_config("amazingtrash"))
+
+
+def test_missing_voice_config_is_a_request_error(server, tmp_path):
+    with pytest.raises(RequestError, match="Voice config not found"):
+        server.converter_for(voice_config=str(tmp_path / "missing.json"))
+    with pytest.raises(RequestError, match="needs a movie"):
+        server.converter_for()
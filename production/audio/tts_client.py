@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Piper TTS Synthesis Client
+Sends renders to a running tts_server.py instead of loading voices in a new process
+
+Takes the same arguments as screenplay_to_tts.py; relative paths are resolved here so the
+server finds the same files. With --say, synthesizes a single line instead.
+
+Usage:
+    python production/audio/tts_client.py "Act 1 - Setup" --movie amazingtrash
+    python production/audio/tts_client.py --say "Where is everybody?" --speaker ADAM --movie amazingtrash --out line.wav
+"""
+
+import argparse
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+DEFAULT_SERVER = "http://127.0.0.1:8765"
+
+# screenplay_to_tts.py options that take a value, and those whose value is a path
+VALUE_OPTIONS = {"--voice-model", "--voice-config", "--output-dir", "--mode", "--movie",
+                 "--cache-dir", "--cache-size-mb", "--voice-memory-mb", "--jobs",
+                 "--queue-size", "--batch-size", "--trace", "--format", "--silence-threshold", "--loudness",
+                 "--gap-ms", "--speaker-gap-ms", "--action-gap-ms", "--sample-rate"}
+PATH_OPTIONS = {"--voice-model", "--voice-config", "--output-dir", "--cache-dir", "--trace"}
+
+
+def absolute_render_args(argv: List[str]) -> List[str]:
+    """Make the path arguments of a screenplay_to_tts.py command line absolute"""
+    resolved = []
+    expects_value = None
+    for arg in argv:
+        if expects_value:
+            resolved.append(os.path.abspath(arg) if expects_value in PATH_OPTIONS else arg)
+            expects_value = None
+        elif arg.startswith("--") and "=" in arg:
+            option, value = arg.split("=", 1)
+            if option in PATH_OPTIONS:
+                value = os.path.abspath(value)
+            resolved.append(f"{option}={value}")
+        elif arg in VALUE_OPTIONS:
+            resolved.append(arg)
+            expects_value = arg
+        elif not arg.startswith("-") and os.path.exists(arg):
+            # The screenplay file or directory
+            resolved.append(os.path.abspath(arg))
+        else:
+            resolved.append(arg)
+    return resolved
+
+
+def post(server: str, endpoint: str, request: Dict) -> bytes:
+    """POST a JSON request to the server and return the response body"""
+    http_request = urllib.request.Request(
+        server.rstrip("/") + endpoint,
+        data=json.dumps(request).encode('utf-8'),
+        headers={"Content-Type": "application/json"},
+    )
+    # Renders can take minutes; no timeout
+    with urllib.request.urlopen(http_request) as response:
+        return response.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render through a running tts_server.py (other arguments are passed to screenplay_to_tts.py)"
+    )
+    parser.add_argument(
+        "--server",
+        default=os.environ.get("TTS_SERVER", DEFAULT_SERVER),
+        help=f"Server URL (default: $TTS_SERVER or {DEFAULT_SERVER})"
+    )
+    parser.add_argument(
+        "--say",
+        metavar="TEXT",
+        help="Synthesize a single line instead of rendering a screenplay"
+    )
+    parser.add_argument(
+        "--speaker",
+        default="ACTION",
+        help="Speaker for --say (default: ACTION, the narrator voice)"
+    )
+    parser.add_argument(
+        "--out",
+        default="line.wav",
+        help="Output WAV file for --say (default: line.wav)"
+    )
+
+    args, render_args = parser.parse_known_args()
+
+    try:
+        if args.say:
+            # --movie / --voice-config pick the voice config, as for renders
+            options = argparse.ArgumentParser(add_help=False)
+            options.add_argument("--movie")
+            options.add_argument("--voice-config")
+            voice_args, _ = options.parse_known_args(render_args)
+            request = {"text": args.say, "speaker": args.speaker, "movie": voice_args.movie}
+            if voice_args.voice_config:
+                request["voice_config"] = os.path.abspath(voice_args.voice_config)
+
+            wav_bytes = post(args.server, "/line", request)
+            with open(args.out, 'wb') as f:
+                f.write(wav_bytes)
+            print(f"✓ Saved {args.out} ({len(wav_bytes) / 1024:.1f} KB)")
+        else:
+            if not render_args:
+                parser.error("Pass screenplay_to_tts.py arguments, or --say TEXT")
+            result = json.loads(post(args.server, "/render", {"argv": absolute_render_args(render_args)}))
+            print(f"✓ Render finished on the server in {result['seconds']:.1f}s (output is on the server's console)")
+    except urllib.error.HTTPError as e:
+        try:
+            message = json.loads(e.read()).get("error", e.reason)
+        except ValueError:
+            message = e.reason
+        print(f"Error: server returned {e.code}: {message}")
+        sys.exit(1)
+    except urllib.error.URLError as e:
+        print(f"Error: could not reach {args.server} ({e.reason})")
+        print("Start it with: python production/audio/tts_server.py")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
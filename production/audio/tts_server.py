@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Piper TTS Synthesis Server
+Long-running local HTTP server that keeps voice models loaded between requests
+
+Every screenplay_to_tts.py run pays Python startup, the piper import and model loading
+before producing a sample. The server pays that once: voices stay in the process-wide voice
+pool, and all requests share one synthesis cache. Identical requests that arrive while one
+is already running wait for its result instead of synthesizing again.
+
+Endpoints (JSON in, JSON or WAV out):
+    GET  /health   Server status, loaded voices and cache statistics
+    POST /line     {"text": "...", "speaker": "ADAM", "movie": "amazingtrash"}  -> audio/wav
+                   Optional: "voice_config", "narrator_prefix"
+    POST /render   {"argv": ["Act 1 - Setup", "--movie", "amazingtrash", ...]}  -> JSON summary
+                   argv takes the same flags as screenplay_to_tts.py (paths must be absolute)
+
+POST bodies must be sent as application/json. Browser pages are refused unless their origin
+is allowed with --allow-origin, and /render only writes inside the movie folders.
+
+Usage:
+    python production/audio/tts_server.py
+    python production/audio/tts_server.py --port 8765 --voice-memory-mb 4096
+    python production/audio/tts_server.py --allow-origin http://localhost:8080
+
+Use tts_client.py to send renders from the command line; the animation tools can POST to
+/line directly.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Hashable, List, Optional
+
+from screenplay_to_tts import (PiperTTSConverter, main as render_main, build_arg_parser,
+                               movie_voice_config, PROJECT_ROOT, MOVIE_FOLDERS)
+from synthesis_cache import SynthesisCache, DEFAULT_CACHE_SIZE_MB, normalize_text
+from voice_pool import get_shared_pool, DEFAULT_VOICE_MEMORY_MB
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Largest request body accepted (a line or an argv list is tiny)
+MAX_REQUEST_BYTES = 1024 * 1024
+
+
+class RequestError(Exception):
+    """A request the server cannot handle (reported as HTTP 400)"""
+
+
+def in_movie_folder(path: str) -> bool:
+    """Whether a path (after resolving symlinks and '..') lies inside one of the movie folders"""
+    resolved = os.path.realpath(path)
+    for movie_folder in MOVIE_FOLDERS:
+        root = os.path.realpath(PROJECT_ROOT / movie_folder)
+        if os.path.commonpath([resolved, root]) == root:
+            return True
+    return False
+
+
+class RequestCoalescer:
+    """Runs identical concurrent requests once; callers arriving meanwhile share the result"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.coalesced = 0
+
+    def run(self, key: Hashable, fn: Callable):
+        """Return fn(), or the result of an identical request (same key) already running"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.coalesced += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+class SynthesisServer:
+    """Warm converters, shared cache and request coalescing behind the HTTP handler"""
+
+    def __init__(self, cache: Optional[SynthesisCache], use_cuda: bool = False,
+                 voice_memory_mb: float = DEFAULT_VOICE_MEMORY_MB,
+                 default_movie: Optional[str] = None):
+        """Initialize the server state
+
+        Args:
+            cache: Synthesis cache shared by every request (None disables caching)
+            use_cuda: Load voices with GPU acceleration
+            voice_memory_mb: Memory budget of the shared voice pool
+            default_movie: Movie used by /line requests that don't name one
+        """
+        self.cache = cache
+        self.use_cuda = use_cuda
+        self.voice_memory_mb = voice_memory_mb
+        self.default_movie = default_movie
+        self.voice_pool = get_shared_pool(use_cuda, max_memory_mb=voice_memory_mb)
+        self.coalescer = RequestCoalescer()
+        # Phonemes are shared by every movie's voices of the same language (set by the first converter)
+        self.phoneme_cache = None
+
+        # Voice config path -> converter (configs are read once per server)
+        self._converters: Dict[str, PiperTTSConverter] = {}
+        self._converters_lock = threading.Lock()
+        # /render runs main(), which sets process-wide logging; one render at a time
+        self._render_lock = threading.Lock()
+
+        # Request counters (updated from the HTTP server's worker threads)
+        self._stats_lock = threading.Lock()
+        self.lines = 0
+        self.renders = 0
+        self.start_time = time.time()
+
+    def converter_for(self, movie: Optional[str] = None,
+                      voice_config: Optional[str] = None) -> PiperTTSConverter:
+        """Converter for a movie's (or an explicit) character_voices.json"""
+        if not voice_config:
+            movie = movie or self.default_movie
+            if not movie:
+                raise RequestError("Request needs a movie or voice_config")
+            voice_config = str(movie_voice_config(movie))
+        if not os.path.exists(voice_config):
+            raise RequestError(f"Voice config not found: {voice_config}")
+
+        config_key = os.path.realpath(voice_config)
+        with self._converters_lock:
+            converter = self._converters.get(config_key)
+            if converter is None:
+                converter = PiperTTSConverter(voice_config_path=voice_config, use_cuda=self.use_cuda,
+                                              cache=self.cache, voice_pool=self.voice_pool,
+                                              phoneme_cache=self.phoneme_cache)
+                self.phoneme_cache = converter.phoneme_cache
+                self._converters[config_key] = converter
+        return converter
+
+    def synthesize_line(self, request: Dict) -> bytes:
+        """WAV bytes for one line of dialogue"""
+        text = request.get("text", "")
+        if not text.strip():
+            raise RequestError("Request needs non-empty text")
+        speaker = request.get("speaker", "ACTION")
+        converter = self.converter_for(request.get("movie"), request.get("voice_config"))
+
+        voice_path = converter.voice_index.lookup(speaker).voice_path
+        if request.get("narrator_prefix") and speaker != "ACTION":
+            text = f"{speaker} says: {text}"
+
+        with self._stats_lock:
+            self.lines += 1
+        key = ("line", os.path.realpath(voice_path), normalize_text(text))
+        return self.coalescer.run(key, lambda: converter.synthesize_text(voice_path, text))
+
+    def render(self, request: Dict) -> Dict:
+        """Run screenplay_to_tts.py's main() with the request's arguments"""
+        argv = request.get("argv")
+        if not isinstance(argv, list) or not all(isinstance(arg, str) for arg in argv):
+            raise RequestError("Request needs argv: a list of screenplay_to_tts.py arguments")
+        if "-" in argv:
+            raise RequestError("Reading a screenplay from stdin is not supported through the server")
+        self._check_render_paths(argv)
+
+        with self._stats_lock:
+            self.renders += 1
+        return self.coalescer.run(("render", tuple(argv)), lambda: self._render(argv))
+
+    def _check_render_paths(self, argv: List[str]):
+        """Refuse renders that would write files outside the movie folders"""
+        try:
+            args = build_arg_parser().parse_args(argv)
+        except SystemExit:
+            raise RequestError("Invalid screenplay_to_tts.py arguments, see server output")
+
+        written = {"--output-dir": args.output_dir, "--trace": args.trace, "--cache-dir": args.cache_dir}
+        if args.write_formatted:
+            # --preformat --write-formatted saves the screenplays it reads
+            written["--write-formatted"] = args.input_path
+        for option, path in written.items():
+            if path and not in_movie_folder(path):
+                raise RequestError(f"{option} must be inside a movie folder "
+                                   f"({', '.join(MOVIE_FOLDERS)}): {path}")
+
+    def _render(self, argv) -> Dict:
+        start = time.perf_counter()
+        with self._render_lock:
+            try:
+                # The server's pool, so its --voice-memory-mb budget stays in effect
+                render_main(argv, cache=self.cache, voice_pool=self.voice_pool)
+            except SystemExit as e:
+                # argparse errors and main()'s own exits
+                if e.code not in (None, 0):
+                    raise RequestError(f"Render failed (exit code {e.code}), see server output")
+        return {"status": "ok", "seconds": round(time.perf_counter() - start, 3)}
+
+    def health(self) -> Dict:
+        status = {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.start_time, 1),
+            "lines": self.lines,
+            "renders": self.renders,
+            "coalesced": self.coalescer.coalesced,
+            "voices_loaded": [os.path.basename(path) for path in self.voice_pool.loaded_paths()],
+            "voice_pool": self.voice_pool.summary(),
+        }
+        if self.phoneme_cache:
+            status["phoneme_cache"] = self.phoneme_cache.summary()
+        if self.cache:
+            status["cache"] = self.cache.summary()
+        return status
+
+
+class SynthesisRequestHandler(BaseHTTPRequestHandler):
+    """HTTP front end for a SynthesisServer (set as the class attribute `server_state`)"""
+
+    server_state: SynthesisServer = None
+    # Browser origins allowed to call the server (requests without an Origin header, like
+    # tts_client.py's, are always allowed)
+    allowed_origins: frozenset = frozenset()
+
+    def _origin_allowed(self) -> bool:
+        origin = self.headers.get("Origin")
+        return origin is None or origin in self.allowed_origins
+
+    def _send_cors_headers(self):
+        origin = self.headers.get("Origin")
+        if origin in self.allowed_origins:
+            # The animation tools call the server from a browser page
+            self.send_header("Access-Control-Allow-Origin", origin)
+            self.send_header("Vary", "Origin")
+
+    def _send(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self._send_cors_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, data: Dict):
+        self._send(status, json.dumps(data).encode('utf-8'), "application/json")
+
+    def _read_json(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0))
+        if length > MAX_REQUEST_BYTES:
+            raise RequestError("Request body too large")
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            raise RequestError("Request body is not valid JSON")
+        if not isinstance(request, dict):
+            raise RequestError("Request body must be a JSON object")
+        return request
+
+    def do_OPTIONS(self):
+        # CORS preflight for JSON POSTs from an allowed browser page
+        if not self._origin_allowed():
+            self._send_json(403, {"error": "Origin not allowed"})
+            return
+        self.send_response(204)
+        self._send_cors_headers()
+        self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if not self._origin_allowed():
+            self._send_json(403, {"error": "Origin not allowed"})
+        elif self.path == "/health":
+            self._send_json(200, self.server_state.health())
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+
+    def do_POST(self):
+        if not self._origin_allowed():
+            self._send_json(403, {"error": "Origin not allowed"})
+            return
+        content_type = self.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_type != "application/json":
+            # Browsers send form and text/plain POSTs cross-origin without asking first
+            self._send_json(415, {"error": "Content-Type must be application/json"})
+            return
+        try:
+            if self.path == "/line":
+                wav_bytes = self.server_state.synthesize_line(self._read_json())
+                self._send(200, wav_bytes, "audio/wav")
+            elif self.path == "/render":
+                self._send_json(200, self.server_state.render(self._read_json()))
+            else:
+                self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+        except RequestError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            print(f"Error handling {self.path}: {e}")
+            self._send_json(500, {"error": str(e)})
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Serve Piper TTS synthesis over local HTTP with voices kept loaded"
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Address to listen on (default: {DEFAULT_HOST}, local only)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})"
+    )
+    parser.add_argument(
+        "--allow-origin",
+        action="append",
+        default=[],
+        metavar="ORIGIN",
+        help="Browser origin allowed to call the server, e.g. http://localhost:8080 (repeatable; "
+             "default: none, so browser pages are refused)"
+    )
+    parser.add_argument(
+        "--movie",
+        help="Default movie for /line requests that don't name one (e.g. 'amazingtrash')"
+    )
+    parser.add_argument(
+        "--preload",
+        action="store_true",
+        help="Load the default movie's voices at startup instead of on first use"
+    )
+    parser.add_argument(
+        "--cuda",
+        action="store_true",
+        help="Use CUDA for GPU acceleration (requires onnxruntime-gpu)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Synthesis cache directory (default: production/audio/tts_cache, shared across movies)"
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=float,
+        default=DEFAULT_CACHE_SIZE_MB,
+        help=f"Synthesis cache size cap in MB (default: {DEFAULT_CACHE_SIZE_MB})"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the synthesis cache"
+    )
+    parser.add_argument(
+        "--voice-memory-mb",
+        type=float,
+        default=DEFAULT_VOICE_MEMORY_MB,
+        help=f"Approximate memory budget for loaded voice models (default: {DEFAULT_VOICE_MEMORY_MB})"
+    )
+
+    args = parser.parse_args()
+
+    cache = None
+    if not args.no_cache:
+        cache = SynthesisCache(args.cache_dir, max_size_mb=args.cache_size_mb)
+        print(f"Synthesis cache: {cache.cache_dir}")
+
+    state = SynthesisServer(cache, use_cuda=args.cuda, voice_memory_mb=args.voice_memory_mb,
+                            default_movie=args.movie)
+    if args.preload:
+        if not args.movie:
+            parser.error("--preload needs --movie")
+        converter = state.converter_for(args.movie)
+        for voice_path in converter.available_voice_paths:
+            state.voice_pool.get(voice_path)
+
+    SynthesisRequestHandler.server_state = state
+    SynthesisRequestHandler.allowed_origins = frozenset(origin.rstrip("/") for origin in args.allow_origin)
+    httpd = ThreadingHTTPServer((args.host, args.port), SynthesisRequestHandler)
+    print(f"Synthesis server listening on http://{args.host}:{args.port} (Ctrl+C to stop)")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        httpd.server_close()
+        print(f"Served {state.lines} line(s), {state.renders} render(s), "
+              f"{state.coalescer.coalesced} coalesced")
+        if cache:
+            print(f"Synthesis cache: {cache.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Character Voice Index for Piper TTS
+Precompiled, immutable speaker name -> voice lookup built once from character_voices.json
+
+Every speaker name in the config is indexed together with its common screenplay variants
+("ALEX (V.O.)", "ALEX (O.S.)", "ALEX (CONT'D)", ...), so the per-line lookup is a single
+dictionary access returning the voice model path (the handle the voice pool loads models
+by), the config's model name and the label used in output file names. Speakers missing
+from the config fall back to the default voice.
+"""
+
+import os
+import re
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, Optional
+
+# Screenplay extensions indexed alongside every configured name
+SPEAKER_SUFFIXES = ("(V.O.)", "(O.S.)", "(O.C.)", "(CONT'D)", "(CONT’D)",
+                    "(V.O.) (CONT'D)", "(O.S.) (CONT'D)")
+
+TRAILING_PARENTHETICAL_PATTERN = re.compile(r'\s*\([^)]*\)\s*$')
+
+
+def normalize_speaker(name: str) -> str:
+    """Canonical speaker name: trailing (V.O.)/(CONT'D)-style annotations removed, whitespace collapsed"""
+    previous = None
+    while previous != name:
+        previous = name
+        name = TRAILING_PARENTHETICAL_PATTERN.sub('', name)
+    return ' '.join(name.split()).upper()
+
+
+def speaker_label(name: str) -> str:
+    """Label for a speaker in output file names (e.g. 0001_NIGHT_POLICE_OFFICERS.wav)"""
+    return name.replace(' ', '_')
+
+
+@dataclass(frozen=True)
+class CharacterVoice:
+    """Resolved voice for one speaker name"""
+    speaker: str  # Speaker name as looked up
+    voice_path: str  # Path to the .onnx model (loaded lazily through the voice pool)
+    voice_name: str  # Model file name, for logs and manifests
+    model: Optional[str]  # "model" field from character_voices.json, if any
+    label: str  # Speaker label used in output file names
+    configured: bool  # False if the speaker fell back to the default voice
+
+
+class CharacterVoiceIndex:
+    """Immutable speaker -> CharacterVoice index with O(1) lookups"""
+
+    def __init__(self, voice_paths: Dict[str, str], models: Dict[str, Optional[str]],
+                 available_voice_paths: Iterable[str], default_voice_path: str):
+        """Build the index
+
+        Args:
+            voice_paths: Speaker name -> resolved voice model path, from the config
+            models: Speaker name -> model name from the config (None if unset)
+            available_voice_paths: Voice model paths that exist on disk
+            default_voice_path: Voice for speakers not in the config (or whose model is missing)
+        """
+        self.default_voice_path = default_voice_path
+        available = set(available_voice_paths)
+
+        entries = {}
+        for name, voice_path in voice_paths.items():
+            if name == "_default":
+                continue
+            if voice_path not in available:
+                voice_path = default_voice_path
+            canonical = normalize_speaker(name)
+            # Exact config names win over variants generated from other names
+            for key in [name, canonical] + [f"{canonical} {suffix}" for suffix in SPEAKER_SUFFIXES]:
+                if key in entries and key != name:
+                    continue
+                entries[key] = self._entry(key, voice_path, models.get(name), configured=True)
+
+        self._entries = MappingProxyType(entries)
+        # Speakers not in the config, resolved on first sight
+        self._fallbacks: Dict[str, CharacterVoice] = {}
+
+    @staticmethod
+    def _entry(speaker: str, voice_path: str, model: Optional[str], configured: bool) -> CharacterVoice:
+        return CharacterVoice(
+            speaker=speaker,
+            voice_path=voice_path,
+            voice_name=os.path.basename(voice_path),
+            model=model,
+            label=speaker_label(speaker),
+            configured=configured,
+        )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, speaker: str) -> bool:
+        return speaker in self._entries
+
+    def lookup(self, speaker: str) -> CharacterVoice:
+        """Voice for a speaker name as it appears in the screenplay"""
+        entry = self._entries.get(speaker)
+        if entry is not None:
+            return entry
+
+        entry = self._fallbacks.get(speaker)
+        if entry is None:
+            # Unusual spelling of a configured name, or not in the config at all
+            canonical = self._entries.get(normalize_speaker(speaker))
+            if canonical is not None:
+                entry = self._entry(speaker, canonical.voice_path, canonical.model, configured=True)
+            else:
+                entry = self._entry(speaker, self.default_voice_path, None, configured=False)
+            self._fallbacks[speaker] = entry
+        return entry
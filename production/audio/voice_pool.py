@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Voice Pool for Piper TTS
+Loads PiperVoice models on demand and shares them across converters (and movies)
+
+cuberoot, amazingtrash and hunted all point at the same production/audio/voices/*.onnx files,
+so models are keyed by their resolved path and loaded at most once per process. Each ONNX
+session costs hundreds of MB, so the pool keeps an approximate memory budget and unloads the
+least-recently-used models when a new one would exceed it.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from piper import PiperVoice
+
+DEFAULT_VOICE_MEMORY_MB = 2048
+
+# An ONNX session takes roughly this multiple of the .onnx file size in memory
+SESSION_MEMORY_FACTOR = 2.0
+
+
+def estimate_voice_memory(voice_path: str) -> int:
+    """Approximate memory (bytes) a loaded voice model will use"""
+    return int(os.path.getsize(voice_path) * SESSION_MEMORY_FACTOR)
+
+
+class VoicePool:
+    """LRU pool of loaded Piper voice models with a memory budget"""
+
+    def __init__(self, use_cuda: bool = False, max_memory_mb: float = DEFAULT_VOICE_MEMORY_MB):
+        """Initialize an empty voice pool
+
+        Args:
+            use_cuda: Load models with GPU acceleration (requires onnxruntime-gpu)
+            max_memory_mb: Approximate memory budget for loaded models, in megabytes
+        """
+        self.use_cuda = use_cuda
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+
+        # Resolved path -> (voice, estimated bytes), least-recently-used first
+        self._voices: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.loads = 0
+        self.evictions = 0
+
+    @property
+    def memory_bytes(self) -> int:
+        """Estimated memory used by currently loaded models"""
+        return sum(size for _, size in self._voices.values())
+
+    def loaded_paths(self) -> List[str]:
+        """Resolved paths of currently loaded models, least-recently-used first"""
+        return list(self._voices)
+
+    def is_loaded(self, voice_path: str) -> bool:
+        return os.path.realpath(voice_path) in self._voices
+
+    def peek(self, voice_path: str) -> Optional[PiperVoice]:
+        """Return a voice if it is already loaded, without loading it or touching LRU order"""
+        entry = self._voices.get(os.path.realpath(voice_path))
+        return entry[0] if entry else None
+
+    def get(self, voice_path: str) -> PiperVoice:
+        """Return the voice for a model path, loading it (and unloading LRU models) if needed"""
+        resolved_path = os.path.realpath(voice_path)
+        with self._lock:
+            entry = self._voices.get(resolved_path)
+            if entry:
+                self._voices.move_to_end(resolved_path)
+                return entry[0]
+
+            if not os.path.exists(resolved_path):
+                raise FileNotFoundError(f"Voice model not found: {voice_path}")
+
+            size = estimate_voice_memory(resolved_path)
+            self._evict_for(size)
+
+            print(f"  Loading: {os.path.basename(resolved_path)}")
+            voice = self._load_voice(resolved_path)
+            self._voices[resolved_path] = (voice, size)
+            self.loads += 1
+            return voice
+
+    def _load_voice(self, resolved_path: str) -> PiperVoice:
+        """Load one voice model from disk"""
+        return PiperVoice.load(resolved_path, use_cuda=self.use_cuda)
+
+    def _evict_for(self, incoming_bytes: int):
+        """Unload least-recently-used models until incoming_bytes fits in the budget"""
+        while self._voices and self.memory_bytes + incoming_bytes > self.max_memory_bytes:
+            evicted_path, _ = self._voices.popitem(last=False)
+            self.evictions += 1
+            print(f"  Unloading: {os.path.basename(evicted_path)} (voice memory budget)")
+
+    def summary(self) -> str:
+        """One-line summary of pool activity for end-of-run reporting"""
+        return (f"{self.loads} loaded, {self.evictions} unloaded, {len(self._voices)} resident "
+                f"(~{self.memory_bytes / (1024 * 1024):.0f} MB / {self.max_memory_bytes / (1024 * 1024):.0f} MB)")
+
+
+# One pool per device, shared by every converter in the process
+_shared_pools: Dict[bool, VoicePool] = {}
+
+
+def get_shared_pool(use_cuda: bool = False, max_memory_mb: Optional[float] = None) -> VoicePool:
+    """Get the process-wide voice pool, optionally updating its memory budget"""
+    pool = _shared_pools.get(use_cuda)
+    if pool is None:
+        pool = VoicePool(use_cuda, max_memory_mb if max_memory_mb is not None else DEFAULT_VOICE_MEMORY_MB)
+        _shared_pools[use_cuda] = pool
+    elif max_memory_mb is not None:
+        pool.max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+    return pool